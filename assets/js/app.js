@@ -1,31 +1,52 @@
 // AI Learning Hub JavaScript
+
+// Activities kept for the activity feed; older entries are dropped. Study
+// history itself lives in data.studyDays, which is never truncated.
+const MAX_ACTIVITIES = 200;
+
+// Layout version of the saved progress data; migrateData() upgrades older
+// saves step by step. Mirrored by DOCUMENT_VERSION and MIGRATIONS in
+// progress_store.py, which migrates server-side copies and bulk exports.
+const PROGRESS_SCHEMA_VERSION = 3;
+
 class AILearningHub {
     constructor() {
+        // Set when the page was pre-rendered by render_snapshot.py
+        this.snapshot = this.readSnapshot();
         this.data = this.loadData();
+        this.sync = new ProgressSync(() => this.syncProgress());
+        this.search = new SiteSearch(document.getElementById('searchInput'), document.getElementById('searchResults'));
         this.initializeEventListeners();
         this.initializeCharts();
         this.updateDashboard();
         this.generateCalendar();
         this.checkReminders();
+        // The snapshot only covers the first paint; later updates always render
+        this.snapshot = null;
+        this.syncProgress();
+        this.registerServiceWorker();
+    }
+
+    // sw.js is generated by build_assets.py and caches every page of the
+    // build for instant, offline navigation; without it this is a no-op
+    registerServiceWorker() {
+        if (!('serviceWorker' in navigator) || !location.protocol.startsWith('http')) return;
+        navigator.serviceWorker.register('sw.js').catch(() => {});
     }
 
     // Data Management
     loadData() {
+        // One record per module of the catalog (assets/js/modules.js);
+        // modules without prerequisites start unlocked
+        const modules = {};
+        MODULE_CATALOG.order.forEach(moduleId => {
+            const locked = MODULE_CATALOG.modules[moduleId].prerequisites.length > 0;
+            modules[moduleId] = { status: locked ? 'locked' : 'not-started', progress: 0, timeSpent: 0, startDate: null, completedDate: null };
+        });
+
         const defaultData = {
-            modules: {
-                'ai-fundamentals': { status: 'not-started', progress: 0, timeSpent: 0, startDate: null, completedDate: null },
-                'mathematics': { status: 'not-started', progress: 0, timeSpent: 0, startDate: null, completedDate: null },
-                'programming': { status: 'not-started', progress: 0, timeSpent: 0, startDate: null, completedDate: null },
-                'data-handling': { status: 'not-started', progress: 0, timeSpent: 0, startDate: null, completedDate: null },
-                'ml-basics': { status: 'locked', progress: 0, timeSpent: 0, startDate: null, completedDate: null },
-                'supervised-learning': { status: 'locked', progress: 0, timeSpent: 0, startDate: null, completedDate: null },
-                'unsupervised-learning': { status: 'locked', progress: 0, timeSpent: 0, startDate: null, completedDate: null },
-                'ml-projects': { status: 'locked', progress: 0, timeSpent: 0, startDate: null, completedDate: null },
-                'neural-networks': { status: 'locked', progress: 0, timeSpent: 0, startDate: null, completedDate: null },
-                'cnn': { status: 'locked', progress: 0, timeSpent: 0, startDate: null, completedDate: null },
-                'nlp': { status: 'locked', progress: 0, timeSpent: 0, startDate: null, completedDate: null },
-                'advanced-dl': { status: 'locked', progress: 0, timeSpent: 0, startDate: null, completedDate: null }
-            },
+            schemaVersion: PROGRESS_SCHEMA_VERSION,
+            modules,
             goals: [
                 {
                     id: 'goal-1',
@@ -41,6 +62,8 @@ class AILearningHub {
             lastStudyDate: null,
             totalHours: 0,
             achievements: [],
+            // Number of module activities per local day, keyed 'YYYY-MM-DD'
+            studyDays: {},
             reminders: {
                 enabled: true,
                 time: '19:00',
@@ -57,11 +80,102 @@ class AILearningHub {
         };
 
         const saved = localStorage.getItem('aiLearningData');
-        return saved ? { ...defaultData, ...JSON.parse(saved) } : defaultData;
+        if (!saved) {
+            // A kiosk snapshot carries the learner's progress with it
+            return this.snapshot ? this.mergeDefaults(defaultData, this.migrateData(this.snapshot.progress)) : defaultData;
+        }
+
+        // Nested records are merged too, so modules added to the catalog and
+        // fields added to a record since the data was saved get their defaults
+        return this.mergeDefaults(defaultData, this.migrateData(JSON.parse(saved)));
+    }
+
+    // Saved values win; objects are merged key by key, arrays are replaced
+    mergeDefaults(defaults, saved) {
+        const isObject = value => value !== null && typeof value === 'object' && !Array.isArray(value);
+        const merged = { ...defaults };
+        Object.entries(saved).forEach(([key, value]) => {
+            merged[key] = isObject(value) && isObject(defaults[key]) ? this.mergeDefaults(defaults[key], value) : value;
+        });
+        return merged;
+    }
+
+    // Upgrade data saved by an older version of the dashboard, one schema
+    // version at a time; data from a newer version is left alone
+    migrateData(data) {
+        const migrations = {
+            // 1 -> 2: the study index, rebuilt from the activity log
+            1: () => {
+                if (!data.studyDays) data.studyDays = this.buildStudyIndex(data.activities || []);
+            },
+            // 2 -> 3: goals and activities need unique ids to be synced (module
+            // records get their missing fields from mergeDefaults())
+            2: () => {
+                [['goals', 'goal'], ['activities', 'activity']].forEach(([field, name]) => {
+                    const ids = new Set();
+                    (data[field] || []).forEach((record, index) => {
+                        if (!record.id) record.id = `${name}-legacy-${index}`;
+                        else if (ids.has(record.id)) record.id = `${record.id}-${index}`;
+                        ids.add(record.id);
+                    });
+                });
+            }
+        };
+        let version = data.schemaVersion || 1;
+        for (; version < PROGRESS_SCHEMA_VERSION; version++) {
+            migrations[version]();
+        }
+        data.schemaVersion = Math.max(version, data.schemaVersion || 1);
+        return data;
+    }
+
+    buildStudyIndex(activities) {
+        const studyDays = {};
+        activities.forEach(activity => {
+            if (activity.type.includes('module')) {
+                const day = this.dayKey(new Date(activity.date));
+                studyDays[day] = (studyDays[day] || 0) + 1;
+            }
+        });
+        return studyDays;
+    }
+
+    readSnapshot() {
+        const element = document.getElementById('snapshotData');
+        if (!element) return null;
+        try {
+            return JSON.parse(element.textContent);
+        } catch (error) {
+            return null;
+        }
+    }
+
+    // True while hydrating a snapshot rendered today from the same data,
+    // i.e. when the pre-rendered markup for these fields is still correct
+    isSnapshotCurrent(...fields) {
+        if (!this.snapshot || this.snapshot.day !== this.dayKey(new Date())) return false;
+        return fields.every(field =>
+            JSON.stringify(this.data[field]) === JSON.stringify(this.snapshot.progress[field]));
+    }
+
+    dayKey(date) {
+        const month = String(date.getMonth() + 1).padStart(2, '0');
+        const day = String(date.getDate()).padStart(2, '0');
+        return `${date.getFullYear()}-${month}-${day}`;
     }
 
     saveData() {
         localStorage.setItem('aiLearningData', JSON.stringify(this.data));
+        this.sync.schedule(() => this.syncProgress());
+    }
+
+    // Send local changes to the server and apply changes made on other devices
+    async syncProgress() {
+        if (await this.sync.sync(this.data)) {
+            localStorage.setItem('aiLearningData', JSON.stringify(this.data));
+            this.updateDashboard();
+            this.generateCalendar();
+        }
     }
 
     // Event Listeners
@@ -77,6 +191,9 @@ class AILearningHub {
         
         // Reminder settings
         this.initializeReminderSettings();
+
+        // Sync code
+        this.initializeSyncSettings();
         
         // Responsive navigation
         this.initializeResponsiveNav();
@@ -139,6 +256,7 @@ class AILearningHub {
 
     // Dashboard Updates
     updateDashboard() {
+        this.renderedDay = this.dayKey(new Date());
         this.updateProgress();
         this.updateStats();
         this.updateModuleStates();
@@ -173,13 +291,8 @@ class AILearningHub {
     }
 
     updatePhaseProgress() {
-        const phases = {
-            1: ['ai-fundamentals', 'mathematics', 'programming', 'data-handling'],
-            2: ['ml-basics', 'supervised-learning', 'unsupervised-learning', 'ml-projects'],
-            3: ['neural-networks', 'cnn', 'nlp', 'advanced-dl']
-        };
-
-        Object.entries(phases).forEach(([phase, modules]) => {
+        MODULE_CATALOG.phases.forEach((modules, index) => {
+            const phase = index + 1;
             const completed = modules.filter(m => this.data.modules[m].status === 'completed').length;
             const total = modules.length;
             const percentage = Math.round((completed / total) * 100);
@@ -208,32 +321,39 @@ class AILearningHub {
         // Update next topic
         const nextModule = this.getNextModule();
         document.getElementById('nextTopic').textContent = nextModule ? this.getModuleName(nextModule) : 'All Complete!';
+        if (nextModule) this.prefetchModule(nextModule);
+    }
+
+    // Let the browser fetch the page of the module the learner is most
+    // likely to open next while the dashboard is idle
+    prefetchModule(moduleId) {
+        const href = `notebooks/${this.getNotebookFileName(moduleId)}`;
+        if (document.querySelector(`link[rel="prefetch"][href="${href}"]`)) return;
+        const link = document.createElement('link');
+        link.rel = 'prefetch';
+        link.href = href;
+        document.head.appendChild(link);
     }
 
     calculateStreak() {
-        const today = new Date();
-        const lastStudy = this.data.lastStudyDate ? new Date(this.data.lastStudyDate) : null;
-        
-        if (!lastStudy) {
-            this.data.streak = 0;
-            return;
+        // Count consecutive study days back from today; a streak that
+        // ended yesterday is still alive until today is over
+        const day = new Date();
+        if (!this.hasStudyOnDate(day)) {
+            day.setDate(day.getDate() - 1);
         }
 
-        const diffTime = Math.abs(today - lastStudy);
-        const diffDays = Math.floor(diffTime / (1000 * 60 * 60 * 24));
-
-        if (diffDays <= 1) {
-            // Streak continues
-            if (diffDays === 1) {
-                this.data.streak += 1;
-            }
-        } else {
-            // Streak broken
-            this.data.streak = 0;
+        let streak = 0;
+        while (this.hasStudyOnDate(day)) {
+            streak += 1;
+            day.setDate(day.getDate() - 1);
         }
+        this.data.streak = streak;
     }
 
     updateModuleStates() {
+        if (this.isSnapshotCurrent('modules')) return;
+
         document.querySelectorAll('.module-card').forEach(card => {
             const moduleId = card.dataset.module;
             const module = this.data.modules[moduleId];
@@ -251,16 +371,17 @@ class AILearningHub {
                 if (module.status === 'locked') {
                     actions.innerHTML = '<button class="btn btn-disabled" disabled>Complete Prerequisites</button>';
                 } else {
-                    const moduleName = this.getModuleName(moduleId);
                     const notebookFile = this.getNotebookFileName(moduleId);
+                    // Jupyter and Colab links only for modules with a notebook in the catalog
+                    const notebook = (MODULE_CATALOG.modules[moduleId] || {}).notebook;
                     actions.innerHTML = `
-                        <a href="notebooks/${notebookFile}" class="btn btn-primary">Start Learning</a>
-                        <a href="http://localhost:8888/notebooks/notebooks/${moduleId.replace('-', '_')}.ipynb" class="btn btn-secondary" target="_blank" title="Open in Jupyter Lab">
+                        <a href="notebooks/${notebookFile}" class="btn btn-primary">Start Learning</a>` + (notebook ? `
+                        <a href="http://localhost:8888/notebooks/notebooks/${notebook}" class="btn btn-secondary" target="_blank" title="Open in Jupyter Lab">
                             <i class="fas fa-rocket"></i> Jupyter
                         </a>
-                        <a href="https://colab.research.google.com/github/murali-marimekala/AIExplorationHub/blob/main/notebooks/${moduleId.replace('-', '_')}.ipynb" class="btn btn-tertiary" target="_blank" title="Open in Google Colab">
+                        <a href="https://colab.research.google.com/github/murali-marimekala/AIExplorationHub/blob/main/notebooks/${notebook}" class="btn btn-tertiary" target="_blank" title="Open in Google Colab">
                             <i class="fab fa-google"></i> Colab
-                        </a>
+                        </a>` : '') + `
                     `;
                 }
             }
@@ -270,40 +391,24 @@ class AILearningHub {
         this.unlockModules();
     }
 
+    // A module opens once every module it requires is completed; the
+    // catalog order is topological, so one pass settles every module
     unlockModules() {
-        const moduleOrder = [
-            ['ai-fundamentals', 'mathematics', 'programming', 'data-handling'],
-            ['ml-basics', 'supervised-learning', 'unsupervised-learning', 'ml-projects'],
-            ['neural-networks', 'cnn', 'nlp', 'advanced-dl']
-        ];
-
-        moduleOrder.forEach((phase, phaseIndex) => {
-            if (phaseIndex === 0) {
-                // First phase is always unlocked
-                phase.forEach(moduleId => {
-                    if (this.data.modules[moduleId].status === 'locked') {
-                        this.data.modules[moduleId].status = 'not-started';
-                    }
-                });
-            } else {
-                // Check if previous phase is completed
-                const previousPhase = moduleOrder[phaseIndex - 1];
-                const previousCompleted = previousPhase.every(moduleId => 
-                    this.data.modules[moduleId].status === 'completed'
-                );
-
-                if (previousCompleted) {
-                    phase.forEach(moduleId => {
-                        if (this.data.modules[moduleId].status === 'locked') {
-                            this.data.modules[moduleId].status = 'not-started';
-                        }
-                    });
-                }
+        const completed = new Set(MODULE_CATALOG.order.filter(moduleId =>
+            this.data.modules[moduleId].status === 'completed'
+        ));
+        MODULE_CATALOG.order.forEach(moduleId => {
+            const module = this.data.modules[moduleId];
+            if (module.status === 'locked' &&
+                MODULE_CATALOG.modules[moduleId].prerequisites.every(required => completed.has(required))) {
+                module.status = 'not-started';
             }
         });
     }
 
     updateActivities() {
+        if (this.isSnapshotCurrent('activities')) return;
+
         const activityList = document.getElementById('activityList');
         if (activityList) {
             activityList.innerHTML = this.data.activities
@@ -320,6 +425,8 @@ class AILearningHub {
     }
 
     updateGoals() {
+        if (this.isSnapshotCurrent('goals')) return;
+
         const goalsList = document.getElementById('goalsList');
         if (goalsList) {
             const activeGoals = this.data.goals.filter(goal => !goal.completed);
@@ -419,7 +526,7 @@ class AILearningHub {
         }
 
         const goal = {
-            id: `goal-${Date.now()}`,
+            id: this.uniqueId('goal'),
             title,
             description: `Custom goal: ${title}`,
             priority,
@@ -473,6 +580,40 @@ class AILearningHub {
         }
     }
 
+    // Sync code: shows this browser's code and restores progress from another
+    initializeSyncSettings() {
+        const card = document.getElementById('syncCard');
+        if (!card) return;
+        if (!this.sync.enabled) {
+            card.hidden = true;
+            return;
+        }
+        this.updateSyncCode();
+
+        document.getElementById('syncForm').addEventListener('submit', (e) => {
+            e.preventDefault();
+            const input = document.getElementById('syncCodeInput');
+            const code = input.value.trim();
+            if (!this.sync.isValidId(code)) {
+                this.showNotification('Please enter a valid sync code', 'error');
+                return;
+            }
+            input.value = '';
+            this.sync.useLearnerId(code);
+            this.updateSyncCode();
+            this.syncProgress();
+            this.showNotification('Sync code updated; restoring your progress', 'success');
+        });
+    }
+
+    updateSyncCode() {
+        const link = new URL(location.href);
+        link.hash = '';
+        link.searchParams.set('sync', this.sync.learnerId);
+        document.getElementById('syncCode').textContent = this.sync.learnerId;
+        document.getElementById('syncLink').href = link.href;
+    }
+
     checkReminders() {
         if (!this.data.reminders.enabled) return;
 
@@ -488,6 +629,8 @@ class AILearningHub {
 
     // Calendar
     generateCalendar() {
+        if (this.isSnapshotCurrent('studyDays')) return;
+
         const calendar = document.getElementById('studyCalendar');
         if (!calendar) return;
 
@@ -539,15 +682,31 @@ class AILearningHub {
 
     hasStudyOnDate(date) {
         // Check if any module was worked on this date
-        const dateStr = date.toDateString();
-        return this.data.activities.some(activity => 
-            new Date(activity.date).toDateString() === dateStr && 
-            activity.type.includes('module')
-        );
+        return Boolean(this.data.studyDays[this.dayKey(date)]);
     }
 
     // Charts
     initializeCharts() {
+        // Keep the snapshot's SVG charts while they match the data
+        if (this.isSnapshotCurrent('modules')) return;
+
+        document.querySelectorAll('.chart-snapshot').forEach(svg => {
+            document.getElementById(svg.dataset.chart).hidden = false;
+            svg.remove();
+        });
+
+        // Snapshots leave Chart.js out; load it only when charts must be drawn
+        if (typeof Chart === 'undefined' && this.snapshot && this.snapshot.chartScript) {
+            const script = document.createElement('script');
+            script.src = this.snapshot.chartScript;
+            script.onload = () => this.drawCharts();
+            document.head.appendChild(script);
+            return;
+        }
+        this.drawCharts();
+    }
+
+    drawCharts() {
         this.initializeWeeklyChart();
         this.initializeModuleChart();
         this.initializeTimeChart();
@@ -637,47 +796,20 @@ class AILearningHub {
 
     // Utility Functions
     getNextModule() {
-        const modules = Object.keys(this.data.modules);
-        return modules.find(moduleId => 
-            this.data.modules[moduleId].status === 'not-started' || 
+        return MODULE_CATALOG.order.find(moduleId =>
+            this.data.modules[moduleId].status === 'not-started' ||
             this.data.modules[moduleId].status === 'in-progress'
         );
     }
 
     getModuleName(moduleId) {
-        const names = {
-            'ai-fundamentals': 'AI Fundamentals',
-            'mathematics': 'Mathematics for AI',
-            'programming': 'Python for AI',
-            'data-handling': 'Data Handling',
-            'ml-basics': 'ML Fundamentals',
-            'supervised-learning': 'Supervised Learning',
-            'unsupervised-learning': 'Unsupervised Learning',
-            'ml-projects': 'ML Projects',
-            'neural-networks': 'Neural Networks',
-            'cnn': 'Computer Vision',
-            'nlp': 'Natural Language Processing',
-            'advanced-dl': 'Advanced Deep Learning'
-        };
-        return names[moduleId] || moduleId;
+        const module = MODULE_CATALOG.modules[moduleId];
+        return module ? module.title : moduleId;
     }
 
     getNotebookFileName(moduleId) {
-        const fileNames = {
-            'ai-fundamentals': '01-ai-fundamentals.html',
-            'mathematics': 'mathematics-for-ai.html',
-            'programming': 'python-for-ai.html',
-            'data-handling': 'data-handling.html',
-            'ml-basics': 'ml-fundamentals.html',
-            'supervised-learning': 'supervised-learning.html',
-            'unsupervised-learning': 'unsupervised-learning.html',
-            'ml-projects': 'ml-projects.html',
-            'neural-networks': 'neural-networks.html',
-            'cnn': 'computer-vision.html',
-            'nlp': 'natural-language-processing.html',
-            'advanced-dl': 'advanced-deep-learning.html'
-        };
-        return fileNames[moduleId] || `${moduleId}.html`;
+        const module = MODULE_CATALOG.modules[moduleId];
+        return module ? module.page : `${moduleId}.html`;
     }
 
     formatStatus(status) {
@@ -710,7 +842,8 @@ class AILearningHub {
             'module-complete': 'check-circle',
             'goal': 'target',
             'goal-complete': 'trophy',
-            'achievement': 'star'
+            'achievement': 'star',
+            'quiz': 'question-circle'
         };
         return icons[type] || 'circle';
     }
@@ -741,17 +874,29 @@ class AILearningHub {
         }
     }
 
+    // Record ids are sync keys, so two records created in the same
+    // millisecond must still differ
+    uniqueId(prefix) {
+        return `${prefix}-${Date.now()}-${Math.random().toString(36).slice(2, 8)}`;
+    }
+
     addActivity(text, type = 'system') {
+        const now = new Date();
         this.data.activities.push({
-            id: `activity-${Date.now()}`,
+            id: this.uniqueId('activity'),
             text,
-            date: new Date().toISOString(),
+            date: now.toISOString(),
             type
         });
 
-        // Keep only last 20 activities
-        if (this.data.activities.length > 20) {
-            this.data.activities = this.data.activities.slice(-20);
+        if (type.includes('module')) {
+            const day = this.dayKey(now);
+            this.data.studyDays[day] = (this.data.studyDays[day] || 0) + 1;
+        }
+
+        // Keep only the most recent activities
+        if (this.data.activities.length > MAX_ACTIVITIES) {
+            this.data.activities.splice(0, this.data.activities.length - MAX_ACTIVITIES);
         }
     }
 
@@ -773,6 +918,398 @@ class AILearningHub {
     }
 }
 
+// Server-side copy of the progress data (served by serve.py --progress-db).
+// Progress is split into one record per module, study day, goal and
+// activity, and only records that changed since the last sync are sent.
+// Without the server (e.g. when index.html is opened from disk) syncing is
+// silently disabled.
+// The learner id doubles as a sync code: opening the dashboard with
+// ?sync=<code>, or entering the code under Goals, restores that learner's
+// server copy after browser storage was cleared or on another device.
+class ProgressSync {
+    constructor(onRetry) {
+        this.onRetry = onRetry;
+        this.revision = Number(localStorage.getItem('aiSyncRevision')) || 0;
+        this.synced = JSON.parse(localStorage.getItem('aiSyncedRecords') || '{}');
+        this.setLearnerId(this.getLearnerId());
+        this.enabled = location.protocol.startsWith('http');
+        this.timer = null;
+        this.delay = 2000;
+        // Failed syncs are retried after retryDelay, doubling up to maxRetryDelay
+        this.failures = 0;
+        this.retryDelay = 5000;
+        this.maxRetryDelay = 5 * 60 * 1000;
+        window.addEventListener('online', () => {
+            if (this.failures) this.schedule(this.onRetry);
+        });
+    }
+
+    getLearnerId() {
+        const url = new URL(location.href);
+        const fromUrl = url.searchParams.get('sync') || '';
+        if (this.isValidId(fromUrl)) {
+            // Keep the code out of the address bar once it is stored
+            url.searchParams.delete('sync');
+            history.replaceState(null, '', url.href);
+            if (fromUrl !== localStorage.getItem('aiLearnerId')) this.useLearnerId(fromUrl);
+            return fromUrl;
+        }
+
+        let id = localStorage.getItem('aiLearnerId');
+        if (!id) {
+            id = this.newLearnerId();
+            localStorage.setItem('aiLearnerId', id);
+        }
+        return id;
+    }
+
+    // Same rule as LEARNER_ID in progress_store.py
+    isValidId(id) {
+        return /^[A-Za-z0-9_-]{1,64}$/.test(id);
+    }
+
+    // Easy to read out and type: xxxx-xxxx-xxxx without look-alike characters
+    newLearnerId() {
+        const alphabet = 'abcdefghjkmnpqrstuvwxyz23456789';
+        const values = new Uint32Array(12);
+        if (window.crypto && crypto.getRandomValues) {
+            crypto.getRandomValues(values);
+        } else {
+            values.forEach((_, i) => { values[i] = Math.floor(Math.random() * 2 ** 32); });
+        }
+        const chars = Array.from(values, value => alphabet[value % alphabet.length]).join('');
+        return chars.match(/.{4}/g).join('-');
+    }
+
+    setLearnerId(id) {
+        this.learnerId = id;
+        this.endpoint = `/api/progress/${id}`;
+    }
+
+    // Switch to another sync code; the next sync adopts its server copy
+    useLearnerId(id) {
+        localStorage.setItem('aiLearnerId', id);
+        localStorage.removeItem('aiSyncRevision');
+        localStorage.removeItem('aiSyncedRecords');
+        this.setLearnerId(id);
+        this.revision = 0;
+        this.synced = {};
+    }
+
+    // Coalesce bursts of saves into one request; after failures, wait out the backoff
+    schedule(callback) {
+        if (!this.enabled) return;
+        clearTimeout(this.timer);
+        const backoff = this.failures
+            ? Math.min(this.maxRetryDelay, this.retryDelay * 2 ** (this.failures - 1))
+            : 0;
+        this.timer = setTimeout(callback, Math.max(this.delay, backoff));
+    }
+
+    // Same record keys as flatten() in progress_store.py
+    flatten(data) {
+        const records = {};
+        Object.entries(data).forEach(([field, value]) => {
+            if (field === 'modules' || field === 'studyDays') {
+                Object.entries(value).forEach(([id, record]) => { records[`${field}/${id}`] = record; });
+            } else if (field === 'goals' || field === 'activities') {
+                value.forEach(item => { records[`${field}/${item.id}`] = item; });
+            } else {
+                records[field] = value;
+            }
+        });
+        return records;
+    }
+
+    // Write one record back into the data object; null removes it
+    applyRecord(data, key, value) {
+        const [field, id] = key.split(/\/(.*)/s);
+        if (id === undefined) {
+            if (value === null) delete data[field]; else data[field] = value;
+        } else if (field === 'modules' || field === 'studyDays') {
+            const records = data[field] || (data[field] = {});
+            if (value === null) delete records[id]; else records[id] = value;
+        } else {
+            const list = data[field] || (data[field] = []);
+            const index = list.findIndex(item => item.id === id);
+            if (value === null) {
+                if (index !== -1) list.splice(index, 1);
+            } else if (index !== -1) {
+                list[index] = value;
+            } else {
+                list.push(value);
+            }
+        }
+    }
+
+    // FNV-1a; only used to notice which records changed since the last sync
+    digest(text) {
+        let hash = 0x811c9dc5;
+        for (let i = 0; i < text.length; i++) {
+            hash ^= text.charCodeAt(i);
+            hash = Math.imul(hash, 0x01000193);
+        }
+        return (hash >>> 0).toString(36);
+    }
+
+    async request(method, path, body) {
+        const response = await fetch(this.endpoint + path, {
+            method,
+            headers: body ? { 'Content-Type': 'application/json' } : {},
+            body: body ? JSON.stringify(body) : undefined
+        });
+        if (!response.ok) throw new Error(`progress sync failed: ${response.status}`);
+        return response.json();
+    }
+
+    // Returns true when changes from the server were applied to data
+    async sync(data) {
+        if (!this.enabled) return false;
+        clearTimeout(this.timer);
+        let changed = false;
+        try {
+            // A browser without sync state (first visit, cleared storage)
+            // adopts the server copy instead of overwriting it with defaults
+            if (this.revision === 0 && Object.keys(this.synced).length === 0) {
+                const remote = await this.request('GET', '');
+                if (remote.revision > 0) {
+                    const remoteRecords = this.flatten(remote.progress);
+                    Object.keys(this.flatten(data)).forEach(key => {
+                        if (!(key in remoteRecords)) this.applyRecord(data, key, null);
+                    });
+                    Object.entries(remoteRecords).forEach(([key, value]) => {
+                        this.applyRecord(data, key, value);
+                        this.synced[key] = this.digest(JSON.stringify(value));
+                    });
+                    this.revision = remote.revision;
+                    changed = true;
+                }
+            }
+
+            const ts = Date.now() / 1000;
+            const records = this.flatten(data);
+            const changes = [];
+            Object.entries(records).forEach(([key, value]) => {
+                if (this.synced[key] !== this.digest(JSON.stringify(value))) changes.push({ key, value, ts });
+            });
+            Object.keys(this.synced).forEach(key => {
+                if (!(key in records)) changes.push({ key, value: null, ts });
+            });
+
+            const result = await this.request('POST', '/sync', { since: this.revision, changes });
+            changes.forEach(({ key, value }) => {
+                if (value === null) delete this.synced[key];
+                else this.synced[key] = this.digest(JSON.stringify(value));
+            });
+            // The server answers with every record changed since our last
+            // revision, including newer values from other devices
+            Object.entries(result.changes).forEach(([key, value]) => {
+                const digest = value === null ? undefined : this.digest(JSON.stringify(value));
+                if (this.synced[key] === digest && (value === null) === !(key in records)) return;
+                this.applyRecord(data, key, value);
+                if (digest === undefined) delete this.synced[key]; else this.synced[key] = digest;
+                changed = true;
+            });
+            this.revision = result.revision;
+            localStorage.setItem('aiSyncRevision', String(this.revision));
+            localStorage.setItem('aiSyncedRecords', JSON.stringify(this.synced));
+            this.failures = 0;
+        } catch (error) {
+            // No sync API (plain static server) or offline: keep working
+            // locally and try again later, backing off after each failure
+            this.failures += 1;
+            this.schedule(this.onRetry);
+        }
+        return changed;
+    }
+}
+
+// Client-side full-text search over assets/search-index.json, built by
+// build_search_index.py. Postings already hold each document's BM25 weight,
+// so a query only adds up a few arrays. stem() and tokenize() must match
+// the Python builder exactly.
+class SiteSearch {
+    constructor(input, results) {
+        this.input = input;
+        this.results = results;
+        this.url = 'assets/search-index.json';
+        this.index = null;
+        this.sortedTerms = [];
+        this.loading = null;
+        this.limit = 8;
+        this.stopWords = new Set(`a about after all also an and any are as at be been but by can do does each for
+            from has have how if in into is it its just more most no not of on or our out so
+            some such than that the their them then there these they this to up use used
+            using was we what when where which while who will with you your`.split(/\s+/));
+        this.suffixes = [
+            ['sses', 'ss'], ['ies', 'y'], ['ments', ''], ['ment', ''], ['ness', ''],
+            ['ings', ''], ['ing', ''], ['edly', ''], ['ed', ''], ['ly', ''], ['ers', 'er'], ['s', '']
+        ];
+        this.undoubleAfter = new Set(['ing', 'ings', 'ed', 'edly']);
+
+        if (this.input && this.results) this.attach();
+    }
+
+    attach() {
+        this.input.addEventListener('focus', () => this.load());
+        this.input.addEventListener('input', () => this.show(this.input.value));
+        this.input.addEventListener('keydown', (e) => {
+            if (e.key === 'Escape') {
+                this.input.value = '';
+                this.hide();
+            } else if (e.key === 'Enter') {
+                const first = this.results.querySelector('a');
+                if (first) first.click();
+            }
+        });
+        document.addEventListener('click', (e) => {
+            if (!this.input.parentElement.contains(e.target)) this.hide();
+        });
+    }
+
+    // The index is only downloaded once somebody starts searching
+    load() {
+        if (!this.loading) {
+            this.loading = fetch(this.url)
+                .then(response => {
+                    if (!response.ok) throw new Error(`search index: ${response.status}`);
+                    return response.json();
+                })
+                .then(index => {
+                    this.index = index;
+                    this.sortedTerms = Object.keys(index.terms).sort();
+                })
+                .catch(() => {
+                    this.input.disabled = true;
+                    this.input.placeholder = 'Search unavailable';
+                });
+        }
+        return this.loading;
+    }
+
+    stem(word) {
+        if (word.length <= 3 || /^\d+$/.test(word)) return word;
+        for (const [suffix, replacement] of this.suffixes) {
+            if (!word.endsWith(suffix) || word.length - suffix.length < 3) continue;
+            if (suffix === 's' && 'siu'.includes(word[word.length - 2])) return word;
+            let stemmed = word.slice(0, -suffix.length) + replacement;
+            const last = stemmed[stemmed.length - 1];
+            if (this.undoubleAfter.has(suffix) && last === stemmed[stemmed.length - 2] && !'lsz'.includes(last)) {
+                stemmed = stemmed.slice(0, -1);
+            }
+            return stemmed;
+        }
+        return word;
+    }
+
+    words(text) {
+        const folded = text.toLowerCase().normalize('NFKD').replace(/[\u0300-\u036f]/g, '');
+        return (folded.match(/[a-z0-9]+/g) || []).filter(word => word.length > 1 && !this.stopWords.has(word));
+    }
+
+    tokenize(text) {
+        return this.words(text).map(word => this.stem(word));
+    }
+
+    // Terms starting with prefix, found by binary search in the sorted term list
+    expand(prefix, limit = 30) {
+        let low = 0;
+        let high = this.sortedTerms.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (this.sortedTerms[mid] < prefix) low = mid + 1; else high = mid;
+        }
+        const terms = [];
+        for (let i = low; i < this.sortedTerms.length && terms.length < limit; i++) {
+            if (!this.sortedTerms[i].startsWith(prefix)) break;
+            terms.push(this.sortedTerms[i]);
+        }
+        return terms;
+    }
+
+    // Documents ranked by BM25; the last word also matches as a prefix while
+    // it is still being typed
+    search(query) {
+        if (!this.index) return [];
+        const words = this.words(query);
+        const typing = !/\s$/.test(query);
+        const scores = new Map();
+
+        words.forEach((word, i) => {
+            const term = this.stem(word);
+            const candidates = typing && i === words.length - 1
+                ? [term, ...this.expand(word).filter(t => t !== term)]
+                : [term];
+            // Each query word counts once per document, through its best match
+            const best = new Map();
+            candidates.forEach(candidate => {
+                const postings = this.index.terms[candidate];
+                if (!postings) return;
+                // Prefix matches rank below exact ones
+                const factor = candidate === term ? 1 : 0.5;
+                for (let j = 0; j < postings.length; j += 2) {
+                    const weight = postings[j + 1] * factor;
+                    if (weight > (best.get(postings[j]) || 0)) best.set(postings[j], weight);
+                }
+            });
+            best.forEach((weight, doc) => scores.set(doc, (scores.get(doc) || 0) + weight));
+        });
+
+        return [...scores.entries()]
+            .sort((a, b) => b[1] - a[1])
+            .slice(0, this.limit)
+            .map(([doc, score]) => {
+                const [kind, url, title, snippet] = this.index.docs[doc];
+                return { kind, url, title, snippet, score: score / this.index.scale };
+            });
+    }
+
+    // Notebooks open in Jupyter Lab, like the Jupyter buttons on module cards
+    link(result) {
+        return result.kind === 'notebook' ? `http://localhost:8888/notebooks/${result.url}` : result.url;
+    }
+
+    async show(query) {
+        if (!query.trim()) {
+            this.hide();
+            return;
+        }
+        await this.load();
+        if (query !== this.input.value) return;
+
+        const results = this.search(query);
+        this.results.replaceChildren();
+        if (results.length === 0) {
+            const empty = document.createElement('div');
+            empty.className = 'search-empty';
+            empty.textContent = 'No matches';
+            this.results.appendChild(empty);
+        }
+        const icons = { module: 'fas fa-layer-group', page: 'fas fa-file-alt', notebook: 'fas fa-book' };
+        results.forEach(result => {
+            const item = document.createElement('a');
+            item.className = 'search-result';
+            item.href = this.link(result);
+            if (result.kind === 'notebook') item.target = '_blank';
+            const title = document.createElement('span');
+            title.className = 'search-result-title';
+            const icon = document.createElement('i');
+            icon.className = icons[result.kind] || icons.page;
+            title.append(icon, ` ${result.title}`);
+            const snippet = document.createElement('span');
+            snippet.className = 'search-result-snippet';
+            snippet.textContent = result.snippet;
+            item.append(title, snippet);
+            this.results.appendChild(item);
+        });
+        this.results.hidden = false;
+    }
+
+    hide() {
+        this.results.hidden = true;
+    }
+}
+
 // Global functions for HTML event handlers
 function completeGoal(goalId) {
     window.aiHub.completeGoal(goalId);
@@ -797,9 +1334,11 @@ document.addEventListener('DOMContentLoaded', () => {
     }, 300000); // Save every 5 minutes
 });
 
-// Handle page visibility for streak tracking
+// Handle page visibility for streak tracking: the dashboard only changes
+// by itself when the day does (streak, calendar, relative dates)
 document.addEventListener('visibilitychange', () => {
-    if (document.visibilityState === 'visible') {
+    if (document.visibilityState === 'visible' && window.aiHub.renderedDay !== window.aiHub.dayKey(new Date())) {
         window.aiHub.updateDashboard();
+        window.aiHub.generateCalendar();
     }
 });
@@ -0,0 +1,2 @@
+// Generated by module_catalog.py from modules.json; edit modules.json instead
+const MODULE_CATALOG = {"order":["ai-fundamentals","mathematics","programming","data-handling","ml-basics","supervised-learning","unsupervised-learning","ml-projects","neural-networks","cnn","nlp","advanced-dl"],"phases":[["ai-fundamentals","mathematics","programming","data-handling"],["ml-basics","supervised-learning","unsupervised-learning","ml-projects"],["neural-networks","cnn","nlp","advanced-dl"]],"modules":{"ai-fundamentals":{"title":"AI Fundamentals","icon":"fas fa-lightbulb","page":"01-ai-fundamentals.html","notebook":"01_AI_Fundamentals.ipynb","phase":1,"prerequisites":[]},"mathematics":{"title":"Mathematics for AI","icon":"fas fa-calculator","page":"mathematics-for-ai.html","phase":1,"prerequisites":[]},"programming":{"title":"Python for AI","icon":"fab fa-python","page":"python-for-ai.html","phase":1,"prerequisites":[]},"data-handling":{"title":"Data Handling","icon":"fas fa-database","page":"data-handling.html","phase":1,"prerequisites":[]},"ml-basics":{"title":"ML Fundamentals","icon":"fas fa-cogs","page":"ml-fundamentals.html","phase":2,"prerequisites":["ai-fundamentals","mathematics","programming","data-handling"]},"supervised-learning":{"title":"Supervised Learning","icon":"fas fa-chart-line","page":"supervised-learning.html","phase":2,"prerequisites":["ai-fundamentals","mathematics","programming","data-handling"]},"unsupervised-learning":{"title":"Unsupervised Learning","icon":"fas fa-search","page":"unsupervised-learning.html","phase":2,"prerequisites":["ai-fundamentals","mathematics","programming","data-handling"]},"ml-projects":{"title":"ML Projects","icon":"fas fa-project-diagram","page":"ml-projects.html","phase":2,"prerequisites":["ai-fundamentals","mathematics","programming","data-handling"]},"neural-networks":{"title":"Neural Networks","icon":"fas fa-brain","page":"neural-networks.html","phase":3,"prerequisites":["ml-basics","supervised-learning","unsupervised-learning","ml-projects"]},"cnn":{"title":"Computer Vision","icon":"fas fa-eye","page":"computer-vision.html","phase":3,"prerequisites":["ml-basics","supervised-learning","unsupervised-learning","ml-projects"]},"nlp":{"title":"Natural Language Processing","icon":"fas fa-comments","page":"natural-language-processing.html","phase":3,"prerequisites":["ml-basics","supervised-learning","unsupervised-learning","ml-projects"]},"advanced-dl":{"title":"Advanced Deep Learning","icon":"fas fa-rocket","page":"advanced-deep-learning.html","phase":3,"prerequisites":["ml-basics","supervised-learning","unsupervised-learning","ml-projects"]}}};
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Serving Benchmark
+Replays a classroom of learners against the dashboard server
+
+Starts serve.py the way start_servers() does (with the progress sync API on
+a throwaway database) on a free port, then runs --sessions learner sessions,
+--concurrency at a time. Each session behaves like a browser:
+
+    1. opens the dashboard: index.html, every local asset it references and
+       the learner's progress document from the sync API
+    2. visits --pages module pages under notebooks/, each with its assets,
+       and syncs a progress change after each one
+    3. goes back to the dashboard, and sometimes searches (search index)
+
+Like a browser, a session keeps its connection alive, asks for br/gzip,
+skips hashed (immutable) assets it already has and revalidates everything
+else with If-None-Match, so repeat visits exercise the 304 path.
+
+Reported are p50/p95/p99 latency (time to the last byte), throughput and
+bytes transferred, overall and per request kind. The result is saved as a
+JSON baseline; the next run is compared against it and slower latencies or
+lower throughput beyond --threshold are flagged.
+
+Usage: python bench_server.py [--directory dist] [--sessions 200] [--concurrency 30]
+       python bench_server.py --url http://127.0.0.1:8000   (an already running server)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from urllib.parse import urljoin, urlsplit
+
+from setup import wait_until_ready
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = 'bench_baseline.json'
+
+# A classroom: 30 learners at once, each opening the hub several times
+DEFAULT_SESSIONS = 200
+DEFAULT_CONCURRENCY = 30
+
+# Module pages visited per session
+DEFAULT_PAGES = 3
+
+# Share of sessions that use the search box (loads the search index)
+SEARCH_PROBABILITY = 0.3
+
+# Seconds a single request may take before it counts as an error
+REQUEST_TIMEOUT = 30
+
+# A metric regresses when it is this much worse (relative and absolute)
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_MIN_DELTA_MS = 2.0
+
+PERCENTILES = [50, 95, 99]
+
+# Local subresources referenced by a page (absolute URLs are left to their CDNs)
+ASSET_REFERENCE = re.compile(r'<(?:link|script|img)\b[^>]*?\b(?:href|src)="([^"#?:]+)"', re.IGNORECASE)
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}\.\w+$')
+
+SEARCH_INDEX = '/assets/search-index.json'
+
+class HubClient:
+    """One learner's browser: a keep-alive connection plus an HTTP cache"""
+
+    def __init__(self, host, port, stats):
+        self.host = host
+        self.port = port
+        self.stats = stats
+        self.reader = self.writer = None
+        self.etags = {}
+        self.immutable = set()
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.writer = None
+
+    async def request(self, kind, method, path, body=b''):
+        """Send one request and read the whole response; returns (status, body)"""
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}',
+                 'Accept-Encoding: br, gzip', 'Connection: keep-alive']
+        if path in self.etags:
+            lines.append(f'If-None-Match: {self.etags[path]}')
+        if body:
+            lines += ['Content-Type: application/json', f'Content-Length: {len(body)}']
+        data = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+        start = time.perf_counter()
+        try:
+            if self.writer is None:
+                await self.connect()
+            status, headers, content, size = await asyncio.wait_for(self.exchange(data), REQUEST_TIMEOUT)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+            self.stats.error(kind, path, f"{type(e).__name__}: {e}")
+            await self.close()
+            return None, b''
+        self.stats.record(kind, time.perf_counter() - start, status, size)
+
+        if 'etag' in headers:
+            self.etags[path] = headers['etag']
+        if 'immutable' in headers.get('cache-control', ''):
+            self.immutable.add(path)
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        if status >= 400:
+            self.stats.error(kind, path, f"HTTP {status}")
+        return status, content
+
+    async def exchange(self, data):
+        self.writer.write(data)
+        await self.writer.drain()
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length', 0))
+        content = await self.reader.readexactly(length) if length else b''
+        return status, headers, content, len(head) + length
+
+    async def open_page(self, kind, path, pages):
+        """Load a page and its assets, the way a browser with a warm cache would"""
+        status, content = await self.request(kind, 'GET', path)
+        if status == 200:
+            pages.setdefault(path, page_assets(path, content))
+        for asset in pages.get(path, []):
+            if asset not in self.immutable:
+                await self.request('asset', 'GET', asset)
+
+class Stats:
+    """Latencies, statuses and bytes of every request, per kind"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+        self.bytes = 0
+        self.errors = []
+
+    def record(self, kind, latency, status, size):
+        self.latencies.setdefault(kind, []).append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.bytes += size
+
+    def error(self, kind, path, message):
+        self.errors.append({'kind': kind, 'path': path, 'error': message})
+
+def page_assets(path, content):
+    """Local stylesheets, scripts and images a page references, as absolute paths"""
+    html = content.decode('utf-8', errors='replace')
+    base = path if path.endswith('.html') else path.rstrip('/') + '/'
+    assets = []
+    for reference in ASSET_REFERENCE.findall(html):
+        asset = urlsplit(urljoin(base, reference)).path
+        if asset not in assets:
+            assets.append(asset)
+    return assets
+
+def find_module_pages(directory):
+    """URL paths of the module pages under notebooks/"""
+    notebooks = os.path.join(directory, 'notebooks')
+    try:
+        names = sorted(os.listdir(notebooks))
+    except OSError:
+        return []
+    return [f"/notebooks/{name}" for name in names if name.endswith('.html')]
+
+async def learner_session(number, host, port, module_pages, options, pages, stats, rng):
+    client = HubClient(host, port, stats)
+    learner = f"bench-{number}"
+    try:
+        await client.open_page('page', '/', pages)
+        if options.api:
+            await client.request('api', 'GET', f"/api/progress/{learner}")
+
+        for visit, module in enumerate(rng.sample(module_pages, min(options.pages, len(module_pages)))):
+            await client.open_page('page', module, pages)
+            if options.api:
+                change = {'key': f"modules/{os.path.basename(module).split('_')[0]}",
+                          'value': {'status': 'in-progress', 'progress': 50}}
+                body = json.dumps({'since': visit, 'changes': [change]}).encode('utf-8')
+                await client.request('api', 'POST', f"/api/progress/{learner}/sync", body)
+
+        await client.open_page('page', '/', pages)
+        if rng.random() < SEARCH_PROBABILITY:
+            await client.request('asset', 'GET', SEARCH_INDEX)
+    finally:
+        await client.close()
+
+async def run_sessions(host, port, module_pages, options):
+    stats = Stats()
+    pages = {}
+    rng = random.Random(options.seed)
+    semaphore = asyncio.Semaphore(options.concurrency)
+
+    async def bounded(number):
+        async with semaphore:
+            await learner_session(number, host, port, module_pages, options, pages, stats,
+                                  random.Random(rng.random()))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded(number) for number in range(options.sessions)))
+    return stats, time.perf_counter() - start
+
+def percentile(values, p):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return None
+    rank = max(1, -(-p * len(values) // 100))
+    return values[int(rank) - 1]
+
+def summarize(stats, elapsed):
+    """Flat metrics (milliseconds, requests/s, MB/s) plus per-kind details"""
+    every = sorted(latency for latencies in stats.latencies.values() for latency in latencies)
+    metrics = {}
+    kinds = {}
+    for kind, latencies in sorted(stats.latencies.items()) + [('all', every)]:
+        latencies = sorted(latencies)
+        kinds[kind] = {'requests': len(latencies)}
+        for p in PERCENTILES:
+            value = round(percentile(latencies, p) * 1000, 2) if latencies else None
+            kinds[kind][f"p{p}_ms"] = value
+            if value is not None:
+                metrics[f"{kind}.p{p}_ms"] = value
+    metrics['throughput_rps'] = round(len(every) / elapsed, 1) if elapsed else 0
+    metrics['throughput_mbps'] = round(stats.bytes / 1e6 / elapsed, 2) if elapsed else 0
+    return {
+        'requests': len(every),
+        'bytes': stats.bytes,
+        'elapsed_s': round(elapsed, 3),
+        'statuses': {str(status): count for status, count in sorted(stats.statuses.items())},
+        'errors': len(stats.errors),
+        'kinds': kinds,
+        'metrics': metrics
+    }
+
+def compare(current, previous, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA_MS):
+    """Metrics that got worse (regressions) or better, as (name, old, new) tuples
+
+    Latencies are worse when higher, throughput when lower.
+    """
+    regressions, improvements = [], []
+    for name, new in current['metrics'].items():
+        old = previous.get('metrics', {}).get(name)
+        if old is None or not old:
+            continue
+        if name.startswith('throughput'):
+            worse, better = new < old * (1 - threshold), new > old * (1 + threshold)
+        else:
+            worse = new - old >= min_delta and new > old * (1 + threshold)
+            better = old - new >= min_delta and new < old * (1 - threshold)
+        if worse:
+            regressions.append((name, old, new))
+        elif better:
+            improvements.append((name, old, new))
+    return regressions, improvements
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(directory, port, api):
+    """serve.py as start_servers() runs it, on a free port and a throwaway progress database"""
+    command = [sys.executable, os.path.join(ROOT, 'serve.py'), str(port), '--bind', '127.0.0.1',
+               '--quiet', '--directory', directory]
+    database = None
+    if api:
+        database = tempfile.TemporaryDirectory(prefix='hub-bench-')
+        command += ['--progress-db', os.path.join(database.name, 'progress.db')]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    try:
+        wait_until_ready("Web dashboard", process, f'http://127.0.0.1:{port}/')
+    except RuntimeError:
+        process.terminate()
+        raise
+    return process, database
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        print(f"⚠️  Ignoring unreadable baseline {path}")
+        return None
+
+def save_baseline(report, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, path)
+
+def print_summary(summary):
+    print(f"\n{'kind':<8} {'requests':>9} " + ' '.join(f"{f'p{p}':>9}" for p in PERCENTILES))
+    for kind, values in summary['kinds'].items():
+        print(f"{kind:<8} {values['requests']:>9} " + ' '.join(
+            f"{values[f'p{p}_ms']:>7.1f}ms" if values[f'p{p}_ms'] is not None else f"{'-':>9}"
+            for p in PERCENTILES))
+    statuses = ', '.join(f"{status}: {count}" for status, count in summary['statuses'].items())
+    print(f"\n🚀 {summary['metrics']['throughput_rps']:.0f} requests/s, "
+          f"{summary['metrics']['throughput_mbps']:.1f} MB/s "
+          f"({summary['bytes'] / 1e6:.1f} MB in {summary['elapsed_s']:.1f}s; {statuses})")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard server with simulated learner sessions")
+    parser.add_argument('--directory', '-d', default=ROOT,
+                        help="site to serve, e.g. dist (default: the repository root)")
+    parser.add_argument('--url',
+                        help="benchmark a server that is already running instead of starting one")
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS,
+                        help=f"learner sessions to replay (default: {DEFAULT_SESSIONS})")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"sessions running at the same time (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--pages', type=int, default=DEFAULT_PAGES,
+                        help=f"module pages visited per session (default: {DEFAULT_PAGES})")
+    parser.add_argument('--no-api', dest='api', action='store_false',
+                        help="leave out progress sync requests")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="random seed for the page mix (default: 0)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help=f"JSON file with the previous run; updated after each run (default: {DEFAULT_BASELINE})")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"relative change reported as a regression (default: {DEFAULT_THRESHOLD:.0%}%)")
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help=f"smallest latency increase in ms reported as a regression (default: {DEFAULT_MIN_DELTA_MS})")
+    parser.add_argument('--no-save', action='store_true',
+                        help="compare against the baseline without replacing it")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="exit with status 1 when a regression is found (for CI)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    args.sessions = max(1, args.sessions)
+    args.concurrency = max(1, args.concurrency)
+    directory = os.path.abspath(args.directory)
+
+    module_pages = find_module_pages(directory)
+    if not module_pages:
+        print(f"❌ No module pages found under {os.path.join(directory, 'notebooks')}")
+        sys.exit(1)
+
+    process = database = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname or '127.0.0.1', url.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        print(f"🌐 Starting serve.py for {directory} on port {port}...")
+        try:
+            process, database = start_server(directory, port, args.api)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+    print(f"⏱️  Replaying {args.sessions} learner sessions, {args.concurrency} at a time "
+          f"({len(module_pages)} module pages, {args.pages} per session)...")
+    try:
+        stats, elapsed = asyncio.run(run_sessions(host, port, module_pages, args))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+        if database:
+            database.cleanup()
+
+    summary = summarize(stats, elapsed)
+    print_summary(summary)
+    for error in stats.errors[:10]:
+        print(f"❌ {error['kind']} {error['path']}: {error['error']}")
+    if len(stats.errors) > 10:
+        print(f"❌ ... and {len(stats.errors) - 10} more errors")
+
+    report = {
+        'generated_at': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'target': args.url or os.path.relpath(directory),
+        'sessions': args.sessions,
+        'concurrency': args.concurrency,
+        'pages': args.pages,
+        'api': args.api,
+        'seed': args.seed,
+        **summary
+    }
+
+    regressions = []
+    previous = load_baseline(args.baseline)
+    if previous:
+        workload = ('sessions', 'concurrency', 'pages', 'api', 'target')
+        if any(previous.get(key) != report[key] for key in workload):
+            print(f"\n⚠️  {args.baseline} was recorded with a different workload; comparison may mislead")
+        regressions, improvements = compare(report, previous, args.threshold, args.min_delta)
+        print(f"\n📊 Compared with {args.baseline}:")
+        for name, old, new in regressions:
+            print(f"⚠️  {name}: {old:g} → {new:g}")
+        for name, old, new in improvements:
+            print(f"🚀 {name}: {old:g} → {new:g}")
+        if not regressions and not improvements:
+            print("✅ No significant change")
+
+    if args.no_save:
+        print(f"\n📄 Baseline {args.baseline} left unchanged")
+    else:
+        save_baseline(report, args.baseline)
+        print(f"\n📄 Baseline saved to {args.baseline}")
+
+    if stats.errors or (regressions and args.fail_on_regression):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Asset Build Pipeline
+Produces an optimized copy of the site in dist/
+
+- compiles the build's assets/js/modules.js from modules.json
+  (module_catalog.py); the source tree is never written to
+- minifies assets/js/*.js and assets/css/*.css
+- renames them with a content hash (app.3f2a9c1b7d.js) so they can be
+  cached for a year, and rewrites the references in index.html and in
+  every page under notebooks/
+- writes precompressed .gz (and .br when the brotli package is
+  installed) siblings that serve.py hands out directly
+- with --vendor, downloads Font Awesome, Google Fonts and Chart.js into
+  dist/assets/vendor/ so pages make no third-party requests; the icon
+  stylesheet is cut down to the icons the site actually uses
+- writes precache-manifest.json (every page and asset with its content
+  hash) and a service worker, sw.js, that serves them cache-first and
+  only downloads files whose hash changed, so moving between the
+  dashboard and module pages is instant and works offline
+
+Usage: python build_assets.py [--vendor] [--output DIR]
+Serve the result with: python serve.py 8000 --directory dist
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+import posixpath
+import subprocess
+import urllib.request
+from urllib.parse import urljoin, urlsplit
+
+from module_catalog import SCRIPT, write_script
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = 'dist'
+
+# Cache for downloaded third-party files, so repeated builds work offline
+VENDOR_CACHE = os.path.join(ROOT, '.cache', 'vendor')
+
+# Site content copied into the build
+SITE_FILES = ['index.html']
+SITE_DIRS = ['assets', 'notebooks']
+
+# File types published from SITE_DIRS; helper modules, caches and build
+# bookkeeping stay behind
+SITE_TYPES = ('.html', '.css', '.js', '.json', '.ipynb', '.svg', '.png', '.jpg', '.jpeg',
+              '.gif', '.ico', '.webp')
+
+COMPRESSIBLE = ('.html', '.css', '.js', '.json', '.svg', '.txt', '.ipynb')
+
+SERVICE_WORKER = 'sw.js'
+PRECACHE_MANIFEST = 'precache-manifest.json'
+
+# Files the service worker caches for offline use
+PRECACHED = ('.html', '.css', '.js', '.json', '.svg', '.png', '.jpg', '.gif', '.ico',
+             '.woff2', '.woff', '.ttf')
+
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}(?=\.\w+$)')
+REFERENCE = re.compile(r'(\b(?:href|src)=")([^"]+)(")')
+
+FONT_AWESOME_CSS = 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css'
+GOOGLE_FONTS_PREFIX = 'https://fonts.googleapis.com/css2?'
+CHART_JS = 'https://cdnjs.cloudflare.com/ajax/libs/Chart.js/3.9.1/chart.min.js'
+
+# Google Fonts only returns woff2 to browsers it recognizes
+BROWSER_USER_AGENT = ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/120.0 Safari/537.36')
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:10]
+
+def hashed_name(path, data):
+    """app.js -> app.<hash>.js, replacing any hash already in the name"""
+    base, ext = os.path.splitext(HASHED_NAME.sub('', path))
+    return f"{base}.{content_hash(data)}{ext}"
+
+# Minification
+
+CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace from CSS
+
+    Strings are left untouched. Whitespace before ':' is kept because it
+    is significant in selectors (`.a :hover` is not `.a:hover`).
+    """
+    out = []
+    pos = 0
+    for match in CSS_TOKENS.finditer(css):
+        out.append(_minify_css_chunk(css[pos:match.start()]))
+        if match.group(1):
+            out.append(match.group(1))
+        pos = match.end()
+    out.append(_minify_css_chunk(css[pos:]))
+    return ''.join(out).strip()
+
+def _minify_css_chunk(chunk):
+    chunk = re.sub(r'\s+', ' ', chunk)
+    chunk = re.sub(r' ?([{};,>]) ?', r'\1', chunk)
+    chunk = re.sub(r': ', ':', chunk)
+    return chunk.replace(';}', '}')
+
+# Characters and keywords after which a '/' starts a regular expression
+# literal; after anything else (an identifier, a number, ')' or ']') it
+# is a division
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                  'throw', 'case', 'do', 'else', 'yield', 'await'}
+
+def _skip_string(source, i):
+    """Index just past the '...' or "..." literal starting at i"""
+    quote = source[i]
+    j = i + 1
+    while j < len(source) and source[j] != quote:
+        j += 2 if source[j] == '\\' else 1
+    return j + 1
+
+def _skip_template(source, i):
+    """Index just past the `...` literal starting at i, including nested ${...}"""
+    n = len(source)
+    j = i + 1
+    while j < n and source[j] != '`':
+        if source[j] == '\\':
+            j += 2
+        elif source.startswith('${', j):
+            j += 2
+            depth = 1
+            while j < n and depth:
+                c = source[j]
+                if c in '\'"':
+                    j = _skip_string(source, j)
+                elif c == '`':
+                    j = _skip_template(source, j)
+                else:
+                    depth += {'{': 1, '}': -1}.get(c, 0)
+                    j += 1
+        else:
+            j += 1
+    return j + 1
+
+def minify_js(source):
+    """Conservatively minify JavaScript
+
+    Removes comments, indentation, trailing whitespace and blank lines,
+    and collapses runs of spaces. Line breaks are kept so automatic
+    semicolon insertion behaves exactly as in the source. String,
+    template and regular expression literals are copied verbatim.
+    """
+    out = []
+    i = 0
+    n = len(source)
+
+    def regex_allowed():
+        """Whether a '/' here starts a regex, judged by the previous token"""
+        text = ''.join(out[-64:]).rstrip()
+        if not text:
+            return True
+        if text[-1] in REGEX_PRECEDERS:
+            return True
+        word = re.search(r'[\w$]+$', text)
+        return bool(word) and word.group() in REGEX_KEYWORDS and not text[:word.start()].endswith('.')
+
+    while i < n:
+        c = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+
+        if c in '\'"':
+            j = _skip_string(source, i)
+            out.append(source[i:j])
+            i = j
+        elif c == '`':
+            j = _skip_template(source, i)
+            out.append(source[i:j])
+            i = j
+        elif c == '/' and nxt == '/':
+            while i < n and source[i] != '\n':
+                i += 1
+        elif c == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            out.append(' ')
+        elif c == '/' and regex_allowed():
+            j = i + 1
+            in_class = False
+            while j < n and (in_class or source[j] != '/') and source[j] != '\n':
+                if source[j] == '\\':
+                    j += 1
+                elif source[j] == '[':
+                    in_class = True
+                elif source[j] == ']':
+                    in_class = False
+                j += 1
+            out.append(source[i:j + 1])
+            i = j + 1
+        elif c == '\n':
+            while out and out[-1] in (' ', '\t'):
+                out.pop()
+            if out and out[-1] != '\n':
+                out.append('\n')
+            i += 1
+            while i < n and source[i] in ' \t':
+                i += 1
+        elif c in ' \t\r':
+            if out and out[-1] not in (' ', '\n'):
+                out.append(' ')
+            i += 1
+        else:
+            out.append(c)
+            i += 1
+
+    return ''.join(out).strip() + '\n'
+
+def js_syntax_ok(code):
+    """Whether node accepts the script; True when node is not installed"""
+    node = shutil.which('node')
+    if not node:
+        return True
+    fd, path = tempfile.mkstemp(suffix='.js')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(code)
+        return subprocess.run([node, '--check', path], stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL).returncode == 0
+    finally:
+        os.unlink(path)
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+# Vendoring
+
+def fetch(url):
+    """Download a URL, serving repeated requests from the vendor cache"""
+    cache_path = os.path.join(VENDOR_CACHE, hashlib.sha256(url.encode('utf-8')).hexdigest())
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            return f.read()
+
+    request = urllib.request.Request(url, headers={'User-Agent': BROWSER_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        data = response.read()
+
+    os.makedirs(VENDOR_CACHE, exist_ok=True)
+    with open(cache_path, 'wb') as f:
+        f.write(data)
+    return data
+
+def used_icon_names(texts):
+    """Icon names referenced by the site, e.g. {'brain', 'check'}
+
+    Besides literal fa-* classes, app.js builds some classes at runtime
+    (`fa-${this.getActivityIcon(type)}`), so every quoted lowercase
+    identifier in the scripts counts as a possible icon name.
+    """
+    names = set()
+    for text in texts:
+        names.update(re.findall(r'\bfa-([a-z0-9-]+)', text))
+        names.update(re.findall(r'[\'"]([a-z][a-z0-9-]*)[\'"]', text))
+    return names
+
+def subset_font_awesome(css, names):
+    """Drop icon rules for icons the site never uses"""
+    def keep(match):
+        selectors = match.group(1).split(',')
+        icons = [re.fullmatch(r'\.fa-([a-z0-9-]+)::?before', s.strip()) for s in selectors]
+        if all(icons) and not any(icon.group(1) in names for icon in icons):
+            return ''
+        return match.group(0)
+
+    return re.sub(r'([^{}]+)\{[^{}]*\}', keep, css)
+
+def latin_only(css):
+    """Keep only the latin @font-face blocks of a Google Fonts stylesheet"""
+    blocks = re.findall(r'/\* ([\w-]+) \*/\s*(@font-face\s*\{[^}]*\})', css)
+    if not blocks:
+        return css
+    return '\n'.join(block for subset, block in blocks if subset == 'latin')
+
+def vendor_stylesheet(url, css, vendor_dir, name, output):
+    """Download the files a stylesheet points at and rewrite url(...) to local copies"""
+    def localize(match):
+        target = match.group(1).strip('\'"')
+        if target.startswith('data:'):
+            return match.group(0)
+        absolute = urljoin(url, target)
+        data = fetch(absolute)
+        filename = posixpath.basename(urlsplit(absolute).path)
+        local = os.path.join(vendor_dir, name, hashed_name(filename, data))
+        write_file(os.path.join(output, local), data)
+        return f"url({posixpath.basename(local)})"
+
+    return re.sub(r'url\(([^)]+)\)', localize, css)
+
+def vendor_third_party(output, texts):
+    """Vendor CDN stylesheets and scripts; returns {url: site-relative path}"""
+    vendor_dir = posixpath.join('assets', 'vendor')
+    replacements = {}
+
+    css = fetch(FONT_AWESOME_CSS).decode('utf-8')
+    css = subset_font_awesome(css, used_icon_names(texts))
+    css = minify_css(vendor_stylesheet(FONT_AWESOME_CSS, css, vendor_dir, 'fontawesome', output))
+    replacements[FONT_AWESOME_CSS] = write_hashed(output, posixpath.join(vendor_dir, 'fontawesome', 'icons.css'), css.encode('utf-8'))
+
+    for url in sorted({u for text in texts for u in re.findall(r'https://fonts\.googleapis\.com/css2\?[^"]+', text)}):
+        css = latin_only(fetch(url.replace('&amp;', '&')).decode('utf-8'))
+        css = minify_css(vendor_stylesheet(url, css, vendor_dir, 'fonts', output))
+        replacements[url] = write_hashed(output, posixpath.join(vendor_dir, 'fonts', 'fonts.css'), css.encode('utf-8'))
+
+    replacements[CHART_JS] = write_hashed(output, posixpath.join(vendor_dir, 'chart.min.js'), fetch(CHART_JS))
+    return replacements
+
+# Offline cache
+
+SERVICE_WORKER_SOURCE = """// Generated by build_assets.py from precache-manifest.json; do not edit.
+// Serves every page and asset of the build cache-first. A new build
+// changes this file, and only files whose content hash changed are
+// downloaded again.
+const PRECACHE = __PRECACHE__;
+const CACHE = 'hub-precache';
+const RUNTIME_CACHE = 'hub-runtime';
+// Hashes of the cached files, stored in the cache itself
+const HASHES = '__precache-hashes.json';
+// Third-party stylesheets and fonts (builds without --vendor)
+const RUNTIME_HOSTS = ['fonts.googleapis.com', 'fonts.gstatic.com', 'cdnjs.cloudflare.com'];
+
+const scope = new URL(self.registration.scope);
+const url = path => new URL(path, scope).href;
+
+async function storedHashes(cache) {
+    const response = await cache.match(url(HASHES));
+    return response ? response.json() : {};
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE);
+        const stored = await storedHashes(cache);
+        const changed = Object.keys(PRECACHE).filter(path => stored[path] !== PRECACHE[path]);
+        await Promise.all(changed.map(async path => {
+            const response = await fetch(url(path), { cache: 'no-cache' });
+            if (!response.ok) throw new Error(`precache ${path}: ${response.status}`);
+            await cache.put(url(path), response);
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE);
+        const keep = new Set(Object.keys(PRECACHE).map(url));
+        for (const request of await cache.keys()) {
+            if (!keep.has(request.url)) await cache.delete(request);
+        }
+        await cache.put(url(HASHES), new Response(JSON.stringify(PRECACHE)));
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+    const target = new URL(request.url);
+
+    if (target.origin === scope.origin && target.pathname.startsWith(scope.pathname)) {
+        let path = decodeURIComponent(target.pathname.slice(scope.pathname.length));
+        if (path === '' || path.endsWith('/')) path += 'index.html';
+        if (path in PRECACHE) {
+            event.respondWith(caches.open(CACHE)
+                .then(cache => cache.match(url(path)))
+                .then(cached => cached || fetch(request)));
+        } else if (request.mode === 'navigate') {
+            event.respondWith(fetch(request).catch(() => caches.match(url('index.html'))));
+        }
+    } else if (RUNTIME_HOSTS.includes(target.hostname)) {
+        // Stale-while-revalidate
+        event.respondWith(caches.open(RUNTIME_CACHE).then(async cache => {
+            const cached = await cache.match(request);
+            const network = fetch(request).then(response => {
+                if (response.ok || response.type === 'opaque') cache.put(request, response.clone());
+                return response;
+            });
+            if (!cached) return network;
+            event.waitUntil(network.catch(() => {}));
+            return cached;
+        }));
+    }
+});
+"""
+
+def precache_manifest(output):
+    """{site-relative path: content hash} of every file the service worker caches"""
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(output):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        for filename in sorted(filenames):
+            if (not filename.endswith(PRECACHED) or filename.startswith('.') or
+                    filename in (SERVICE_WORKER, PRECACHE_MANIFEST)):
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path, 'rb') as f:
+                manifest[os.path.relpath(path, output).replace(os.sep, '/')] = content_hash(f.read())
+    return manifest
+
+def write_service_worker(output):
+    """Write precache-manifest.json and sw.js for the files now in output; returns the file count"""
+    manifest = precache_manifest(output)
+    data = json.dumps(manifest, indent=4, sort_keys=True)
+    write_file(os.path.join(output, PRECACHE_MANIFEST), data.encode('utf-8'))
+    source = SERVICE_WORKER_SOURCE.replace('__PRECACHE__', data)
+    write_file(os.path.join(output, SERVICE_WORKER), source.encode('utf-8'))
+    return len(manifest)
+
+# Build
+
+def write_file(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def write_hashed(output, path, data):
+    """Write data under a content-hashed name; returns the site-relative path"""
+    final = hashed_name(path, data)
+    write_file(os.path.join(output, final), data)
+    return final
+
+def copy_site(output):
+    """Copy the site into the output directory, returning site-relative paths"""
+    copied = []
+    for name in SITE_FILES:
+        shutil.copy2(os.path.join(ROOT, name), os.path.join(output, name))
+        copied.append(name)
+    for directory in SITE_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(ROOT, directory)):
+            dirnames[:] = [d for d in dirnames if not d.startswith(('.', '__'))]
+            for filename in filenames:
+                if not filename.endswith(SITE_TYPES) or filename.startswith('.'):
+                    continue
+                source = os.path.join(dirpath, filename)
+                relative = os.path.relpath(source, ROOT).replace(os.sep, '/')
+                target = os.path.join(output, relative)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(source, target)
+                copied.append(relative)
+    return copied
+
+def build_assets(output, copied):
+    """Minify and hash CSS/JS in place; returns {old path: new path}"""
+    renamed = {}
+    for relative in copied:
+        ext = os.path.splitext(relative)[1]
+        if ext not in MINIFIERS or not relative.startswith('assets/'):
+            continue
+        path = os.path.join(output, relative)
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        minified = MINIFIERS[ext](source)
+        # The JS minifier is a scanner, not a parser: never ship output node rejects
+        if ext == '.js' and not js_syntax_ok(minified) and js_syntax_ok(source):
+            print(f"⚠️  {relative}: minified output fails node --check, kept unminified")
+            minified = source
+        minified = minified.encode('utf-8')
+        os.remove(path)
+        renamed[relative] = write_hashed(output, relative, minified)
+    return renamed
+
+def rewrite_references(output, page, renamed, replacements):
+    """Point href/src attributes of a page at the built asset names"""
+    path = os.path.join(output, page)
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    page_dir = posixpath.dirname(page)
+
+    def rewrite(match):
+        target = match.group(2)
+        if target in replacements:
+            new = replacements[target]
+        else:
+            if '://' in target or target.startswith(('#', 'mailto:', 'data:')):
+                return match.group(0)
+            resolved = posixpath.normpath(posixpath.join(page_dir, target))
+            if resolved not in renamed:
+                return match.group(0)
+            new = renamed[resolved]
+        return match.group(1) + posixpath.relpath(new, page_dir or '.') + match.group(3)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(REFERENCE.sub(rewrite, html))
+
+def precompress(output):
+    """Write .gz (and .br if available) next to every compressible file"""
+    count = 0
+    for dirpath, _, filenames in os.walk(output):
+        for filename in filenames:
+            if not filename.endswith(COMPRESSIBLE):
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path, 'rb') as f:
+                data = f.read()
+            # mtime=0 keeps the .gz output byte-for-byte reproducible
+            write_file(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                write_file(path + '.br', brotli.compress(data, quality=11))
+            count += 1
+    return count
+
+def build(output=DEFAULT_OUTPUT, vendor=False):
+    """Build the optimized site into the output directory"""
+    output = os.path.join(ROOT, output)
+    if os.path.exists(output):
+        shutil.rmtree(output)
+    os.makedirs(output)
+
+    copied = copy_site(output)
+    # The dashboard's module tables must match modules.json, whatever the
+    # state of the copy in the source tree
+    write_script(os.path.join(output, SCRIPT))
+    script = SCRIPT.replace(os.sep, '/')
+    if script not in copied:
+        copied.append(script)
+    renamed = build_assets(output, copied)
+
+    pages = [p for p in copied if p.endswith('.html')]
+    replacements = {}
+    if vendor:
+        texts = []
+        for relative in pages + [p for p in copied if p.endswith('.js')]:
+            with open(os.path.join(ROOT, relative), 'r', encoding='utf-8') as f:
+                texts.append(f.read())
+        replacements = vendor_third_party(output, texts)
+
+    for page in pages:
+        rewrite_references(output, page, renamed, replacements)
+
+    precached = write_service_worker(output)
+    compressed = precompress(output)
+    return renamed, replacements, precached, compressed
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build optimized site assets into dist/")
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT,
+                        help=f"output directory (default: {DEFAULT_OUTPUT})")
+    parser.add_argument('--vendor', action='store_true',
+                        help="download fonts, icons and Chart.js so pages need no CDN")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    print("🧠 AI Learning Hub - Asset Build")
+    print("=" * 50)
+
+    try:
+        renamed, replacements, precached, compressed = build(args.output, vendor=args.vendor)
+    except (OSError, ValueError) as e:
+        print(f"❌ Build failed: {e}")
+        sys.exit(1)
+
+    for old, new in sorted(renamed.items()):
+        before = os.path.getsize(os.path.join(ROOT, old))
+        after = os.path.getsize(os.path.join(ROOT, args.output, new))
+        print(f"✅ {old} → {new} ({before:,} → {after:,} bytes)")
+    for url, local in sorted(replacements.items()):
+        print(f"📦 {url} → {local}")
+    print(f"📴 Service worker precaches {precached} files ({SERVICE_WORKER}, {PRECACHE_MANIFEST})")
+    print(f"🗜️  Precompressed {compressed} files{'' if brotli else ' (gzip only; pip install brotli for .br)'}")
+    print(f"\n🚀 Serve it with: python serve.py 8000 --directory {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Search Index Builder
+Builds the full-text index behind the dashboard's search box
+
+Indexes the placeholder modules in modules.json (title, description and
+feature list), the hand-written pages under notebooks/
+and every notebook, one entry per markdown heading section with its code
+cells. Text is tokenized, stop words are dropped and words are stemmed
+(SiteSearch in assets/js/app.js applies the same rules to queries).
+
+The output is one static JSON file with an inverted index whose postings
+already hold each document's BM25 weight for the term, so a query in the
+browser is a handful of dictionary lookups and additions.
+
+Rebuilds are incremental: the tokenized documents of every source file
+are cached in .cache/search/ by modification time and size, so only
+changed files are read again, and the index is only rewritten when its
+content changed. --watch keeps rebuilding as files change.
+
+Usage: python build_search_index.py [--output assets/search-index.json] [--watch]
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import argparse
+import unicodedata
+from html.parser import HTMLParser
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+NOTEBOOKS_DIR = 'notebooks'
+MODULES_SOURCE = 'modules.json'
+DEFAULT_OUTPUT = os.path.join('assets', 'search-index.json')
+CACHE_PATH = os.path.join(ROOT, '.cache', 'search', 'documents.json')
+
+# Bumped whenever tokenizing or the index format changes, invalidating the cache
+INDEX_VERSION = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Title words count this many times, so a match in a title ranks first
+TITLE_BOOST = 3
+
+# Postings store weights as integers in units of 1 / WEIGHT_SCALE
+WEIGHT_SCALE = 100
+
+SNIPPET_LENGTH = 160
+DEFAULT_WATCH_INTERVAL = 1.0
+
+STOP_WORDS = frozenset("""
+a about after all also an and any are as at be been but by can do does each for
+from has have how if in into is it its just more most no not of on or our out so
+some such than that the their them then there these they this to up use used
+using was we what when where which while who will with you your
+""".split())
+
+# Suffix rules, tried in order; the first that leaves a stem of at least
+# three letters wins. Mirrored by stem() in assets/js/app.js.
+SUFFIXES = [
+    ('sses', 'ss'), ('ies', 'y'), ('ments', ''), ('ment', ''), ('ness', ''),
+    ('ings', ''), ('ing', ''), ('edly', ''), ('ed', ''), ('ly', ''), ('ers', 'er'), ('s', '')
+]
+# Suffixes after which a doubled final consonant is undone (running -> run)
+UNDOUBLE_AFTER = {'ing', 'ings', 'ed', 'edly'}
+
+TOKEN = re.compile(r'[a-z0-9]+')
+
+# Markdown and table syntax left out of snippets
+MARKUP = re.compile(r'[#*`>|]+|-{3,}')
+
+def stem(word):
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix, replacement in SUFFIXES:
+        if not word.endswith(suffix) or len(word) - len(suffix) < 3:
+            continue
+        if suffix == 's' and word[-2] in 'siu':
+            return word  # class, analysis, status
+        stemmed = word[:-len(suffix)] + replacement
+        if suffix in UNDOUBLE_AFTER and stemmed[-1] == stemmed[-2] and stemmed[-1] not in 'lsz':
+            stemmed = stemmed[:-1]
+        return stemmed
+    return word
+
+def tokenize(text):
+    """Lowercased, accent-folded, stemmed words without stop words"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return [stem(word) for word in TOKEN.findall(text)
+            if len(word) > 1 and word not in STOP_WORDS]
+
+def make_document(kind, url, title, text):
+    """A document as cached: display fields plus its term frequencies"""
+    terms = {}
+    tokens = tokenize(text) + tokenize(title) * TITLE_BOOST
+    for token in tokens:
+        terms[token] = terms.get(token, 0) + 1
+    snippet = ' '.join(MARKUP.sub(' ', text).split())
+    if len(snippet) > SNIPPET_LENGTH:
+        snippet = snippet[:SNIPPET_LENGTH].rsplit(' ', 1)[0] + '…'
+    return {'kind': kind, 'url': url, 'title': title, 'snippet': snippet,
+            'length': len(tokens), 'terms': terms}
+
+# Sources
+
+class PageText(HTMLParser):
+    """Collects a page's title and visible body text"""
+
+    SKIPPED = {'script', 'style', 'nav', 'header', 'svg', 'noscript'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ''
+        self.chunks = []
+        self.skip_depth = 0
+        self.in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED:
+            self.skip_depth += 1
+        elif tag == 'title':
+            self.in_title = True
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED and self.skip_depth:
+            self.skip_depth -= 1
+        elif tag == 'title':
+            self.in_title = False
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title += data
+        elif not self.skip_depth:
+            self.chunks.append(data)
+
+def page_documents(path):
+    parser = PageText()
+    with open(os.path.join(ROOT, path), encoding='utf-8') as f:
+        parser.feed(f.read())
+    title = parser.title.split(' - AI Learning Hub')[0].strip() or os.path.basename(path)
+    return [make_document('page', path.replace(os.sep, '/'), title, ' '.join(parser.chunks))]
+
+def notebook_documents(path):
+    """One document per markdown heading section, including the code cells under it"""
+    with open(os.path.join(ROOT, path), encoding='utf-8') as f:
+        cells = json.load(f).get('cells', [])
+
+    notebook_title = os.path.splitext(os.path.basename(path))[0].replace('_', ' ')
+    sections = []
+    for cell in cells:
+        source = ''.join(cell.get('source', []))
+        heading = source.lstrip().split('\n', 1)[0] if cell.get('cell_type') == 'markdown' else ''
+        if heading.startswith('#'):
+            sections.append((heading.lstrip('#').strip(), []))
+            # The heading is the title; the section text starts below it
+            source = source.lstrip().split('\n', 1)[1] if '\n' in source.lstrip() else ''
+        elif not sections:
+            sections.append((notebook_title, []))
+        sections[-1][1].append(source)
+
+    url = path.replace(os.sep, '/')
+    return [make_document('notebook', url, title, '\n'.join(chunks))
+            for title, chunks in sections if any(chunk.strip() for chunk in chunks)]
+
+def module_documents(path):
+    from module_catalog import read_catalog
+
+    return [make_document('module', f"{NOTEBOOKS_DIR}/{module['page']}", module['title'],
+                          '\n'.join([module['description']] + module['features']))
+            for module in read_catalog(os.path.join(ROOT, path)) if module.get('placeholder')]
+
+def find_sources():
+    """Map of source path to the function that turns it into documents"""
+    from module_catalog import read_catalog
+
+    # Generated placeholder pages are indexed from their definitions instead
+    generated = {module['page'] for module in read_catalog(os.path.join(ROOT, MODULES_SOURCE))
+                 if module.get('placeholder')}
+    sources = {MODULES_SOURCE: module_documents}
+    for name in sorted(os.listdir(os.path.join(ROOT, NOTEBOOKS_DIR))):
+        path = os.path.join(NOTEBOOKS_DIR, name)
+        if name.endswith('.ipynb'):
+            sources[path] = notebook_documents
+        elif name.endswith('.html') and name not in generated:
+            sources[path] = page_documents
+    return sources
+
+# Incremental build
+
+def fingerprint(path):
+    stat = os.stat(os.path.join(ROOT, path))
+    return [stat.st_mtime_ns, stat.st_size]
+
+def load_cache():
+    try:
+        with open(CACHE_PATH, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get('files', {}) if cache.get('version') == INDEX_VERSION else {}
+
+def save_cache(files):
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    write_atomic(CACHE_PATH, json.dumps({'version': INDEX_VERSION, 'files': files}))
+
+def write_atomic(path, content):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def collect_documents(cache):
+    """Documents of every source, re-reading only changed files
+
+    Returns (files, read, errors): the new cache entries, the paths that
+    were read again and the sources that could not be read.
+    """
+    files, read, errors = {}, [], []
+    for path, reader in find_sources().items():
+        stamp = fingerprint(path)
+        cached = cache.get(path)
+        if cached and cached['fingerprint'] == stamp:
+            files[path] = cached
+            continue
+        try:
+            files[path] = {'fingerprint': stamp, 'documents': reader(path)}
+            read.append(path)
+        except (OSError, ValueError) as e:
+            errors.append(f"{path}: {type(e).__name__}: {e}")
+    return files, read, errors
+
+def build_index(documents):
+    """Inverted index with precomputed BM25 weights per posting"""
+    count = len(documents)
+    average_length = sum(document['length'] for document in documents) / max(count, 1)
+
+    postings = {}
+    for number, document in enumerate(documents):
+        for term, frequency in document['terms'].items():
+            postings.setdefault(term, []).append((number, frequency))
+
+    terms = {}
+    for term in sorted(postings):
+        entries = postings[term]
+        idf = math.log(1 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+        flat = []
+        for number, frequency in entries:
+            length = documents[number]['length']
+            norm = frequency + K1 * (1 - B + B * length / max(average_length, 1))
+            flat.extend((number, max(1, round(WEIGHT_SCALE * idf * frequency * (K1 + 1) / norm))))
+        terms[term] = flat
+
+    return {
+        'version': INDEX_VERSION,
+        'scale': WEIGHT_SCALE,
+        'docs': [[document['kind'], document['url'], document['title'], document['snippet']]
+                 for document in documents],
+        'terms': terms
+    }
+
+def build(output=DEFAULT_OUTPUT, force=False):
+    """Update the index; returns (written, read, errors)"""
+    files, read, errors = collect_documents({} if force else load_cache())
+    documents = [document for path in sorted(files) for document in files[path]['documents']]
+    content = json.dumps(build_index(documents), separators=(',', ':'), ensure_ascii=False)
+
+    output_path = os.path.join(ROOT, output)
+    try:
+        with open(output_path, encoding='utf-8') as f:
+            written = f.read() != content
+    except OSError:
+        written = True
+    if written:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        write_atomic(output_path, content)
+    if read or force:
+        save_cache(files)
+    return written, read, errors
+
+def report(output, written, read, errors):
+    for path in read:
+        print(f"📄 Indexed {path}")
+    for error in errors:
+        print(f"⚠️  Skipped {error}")
+    if written:
+        print(f"✅ Wrote {output} ({os.path.getsize(os.path.join(ROOT, output)) / 1024:.1f} KB)")
+    else:
+        print(f"ℹ️  {output} is up to date")
+
+def watch(output, interval):
+    """Rebuild whenever a source file changes, until interrupted"""
+    print(f"👀 Watching {NOTEBOOKS_DIR}/ and {MODULES_SOURCE} (Ctrl+C to stop)")
+    stamps = None
+    try:
+        while True:
+            current = {path: fingerprint(path) for path in find_sources()}
+            if current != stamps:
+                if stamps is not None:
+                    report(output, *build(output))
+                stamps = current
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the dashboard's full-text search index")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help=f"index file to write (default: {DEFAULT_OUTPUT})")
+    parser.add_argument('--force', action='store_true',
+                        help="ignore the cache and read every source again")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and rebuild whenever a source changes")
+    parser.add_argument('--interval', type=float, default=DEFAULT_WATCH_INTERVAL,
+                        help=f"seconds between checks in --watch mode (default: {DEFAULT_WATCH_INTERVAL})")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    written, read, errors = build(args.output, force=args.force)
+    report(args.output, written, read, errors)
+    if args.watch:
+        watch(args.output, args.interval)
+    elif errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
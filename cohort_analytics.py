@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Cohort Analytics
+Analyses many learners' progress exports at once
+
+Reads `aiLearningData` JSON exports (files or directories of them, or the
+server-side progress store), flattens them into column arrays in worker
+processes, and builds two pandas frames: one row per learner and one row
+per learner and module. All metrics are then computed with vectorized
+pandas/NumPy operations over the whole cohort:
+
+    funnel            per module: learners unlocked, started, completed
+    time_to_complete  per module: days and hours to completion (quantiles)
+    streak_retention  share of learners whose streak reached N days
+    phase_dropoff     how many learners reach, finish and leave each phase
+
+Frames and metrics are written to Parquet when pyarrow is installed and
+to CSV otherwise.
+
+Usage: python cohort_analytics.py [EXPORT ...] [--db .cache/progress.db] [--output cohort]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from progress_store import rollups, migrate
+from module_catalog import load_catalog
+
+DEFAULT_OUTPUT = 'cohort'
+
+# Curriculum phases from modules.json, each in prerequisite order
+PHASES = load_catalog().phases
+# Phase numbers as in the curriculum (1-N); modules outside PHASES get 0
+MODULE_PHASE = {module: number for number, phase in enumerate(PHASES, 1) for module in phase}
+
+STREAK_THRESHOLDS = [1, 3, 7, 14, 30, 60]
+QUANTILES = [0.25, 0.5, 0.75, 0.9]
+
+# Export files handed to each worker at a time
+CHUNK_SIZE = 64
+
+def find_exports(paths):
+    """Expand files and directories to a sorted list of JSON exports"""
+    exports = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            exports.extend(path.rglob('*.json'))
+        else:
+            exports.append(path)
+    return sorted(set(exports))
+
+def unwrap(document):
+    """Accept raw aiLearningData as well as the progress API's {revision, progress}"""
+    if isinstance(document.get('progress'), dict) and 'modules' not in document:
+        return document['progress']
+    return document
+
+def flatten_learner(learner, document):
+    """One learner row plus its module rows, as plain tuples"""
+    summary = rollups(document)
+    modules = document.get('modules') or {}
+    learner_row = (
+        learner,
+        summary['current_streak'],
+        summary['longest_streak'],
+        summary['study_days'],
+        summary['first_study_day'],
+        summary['last_study_day'],
+        summary['hours'],
+        summary['modules_completed'],
+        len(document.get('goals') or []),
+        sum(1 for goal in document.get('goals') or [] if goal.get('completed'))
+    )
+    module_rows = [
+        (learner, module, MODULE_PHASE.get(module, 0), state.get('status'),
+         state.get('progress') or 0, state.get('timeSpent') or 0,
+         state.get('startDate'), state.get('completedDate'))
+        for module, state in modules.items()
+    ]
+    return learner_row, module_rows
+
+def load_export(path):
+    """Worker entry point: parse one export file; bad files are reported, not fatal"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            document = unwrap(json.load(f))
+        migrate(document)
+        return flatten_learner(Path(path).stem, document), None
+    except (OSError, ValueError, AttributeError, TypeError) as e:
+        return None, f"{path}: {type(e).__name__}: {e}"
+
+LEARNER_COLUMNS = ['learner', 'current_streak', 'longest_streak', 'study_days', 'first_study_day',
+                   'last_study_day', 'hours', 'modules_completed', 'goals', 'goals_completed']
+MODULE_COLUMNS = ['learner', 'module', 'phase', 'status', 'progress', 'time_spent',
+                  'start_date', 'completed_date']
+
+def build_frames(results):
+    """Turn (learner_row, module_rows) results into the learner and module frames"""
+    import pandas as pd
+
+    learner_rows, module_rows = [], []
+    for learner_row, rows in results:
+        learner_rows.append(learner_row)
+        module_rows.extend(rows)
+
+    learners = pd.DataFrame.from_records(learner_rows, columns=LEARNER_COLUMNS)
+    for column in ('first_study_day', 'last_study_day'):
+        learners[column] = pd.to_datetime(learners[column], errors='coerce')
+
+    modules = pd.DataFrame.from_records(module_rows, columns=MODULE_COLUMNS)
+    modules['status'] = modules['status'].astype('category')
+    for column in ('start_date', 'completed_date'):
+        modules[column] = pd.to_datetime(modules[column], errors='coerce', utc=True)
+    modules['days_to_complete'] = (
+        (modules['completed_date'] - modules['start_date']).dt.total_seconds() / 86400)
+    return learners, modules
+
+def load_cohort(exports, db=None, workers=None):
+    """Parse every export (and the progress store, if given); returns (learners, modules, errors)"""
+    results, errors = [], []
+    if exports:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result, error in executor.map(load_export, exports, chunksize=CHUNK_SIZE):
+                if error:
+                    errors.append(error)
+                else:
+                    results.append(result)
+
+    if db:
+        from progress_store import ProgressStore
+        store = ProgressStore(db)
+        try:
+            results.extend(flatten_learner(learner, store.document(learner)) for learner in store.learners())
+        finally:
+            store.close()
+
+    learners, modules = build_frames(results)
+    return learners, modules, errors
+
+def module_funnel(modules):
+    """Learners per module at each stage, in curriculum order"""
+    import pandas as pd
+
+    status = modules['status'].astype(str)
+    stages = pd.DataFrame({
+        'module': modules['module'],
+        'unlocked': status.ne('locked'),
+        'started': status.isin(['in-progress', 'completed']) | modules['start_date'].notna(),
+        'completed': status.eq('completed')
+    })
+    funnel = stages.groupby('module', sort=False)[['unlocked', 'started', 'completed']].sum()
+    funnel.insert(0, 'learners', stages.groupby('module', sort=False).size())
+    funnel['start_rate'] = funnel['started'] / funnel['unlocked'].where(funnel['unlocked'] > 0)
+    funnel['completion_rate'] = funnel['completed'] / funnel['started'].where(funnel['started'] > 0)
+
+    order = [module for phase in PHASES for module in phase]
+    funnel = funnel.reindex(order + sorted(set(funnel.index) - set(order)))
+    funnel.insert(0, 'phase', [MODULE_PHASE.get(module, 0) for module in funnel.index])
+    return funnel.reset_index().rename(columns={'index': 'module'})
+
+def time_to_complete(modules):
+    """Quantiles of days and hours spent on completed modules"""
+    completed = modules[modules['status'].astype(str).eq('completed')]
+    grouped = completed.groupby('module', sort=True)
+    days = grouped['days_to_complete'].quantile(QUANTILES).unstack()
+    days.columns = [f"days_p{int(q * 100)}" for q in QUANTILES]
+    hours = grouped['time_spent'].quantile(QUANTILES).unstack()
+    hours.columns = [f"hours_p{int(q * 100)}" for q in QUANTILES]
+    summary = grouped.agg(completed=('learner', 'size'), days_mean=('days_to_complete', 'mean'),
+                          hours_mean=('time_spent', 'mean'))
+    return summary.join(days).join(hours).reset_index()
+
+def streak_retention(learners):
+    """Share of learners whose longest and current streak reached each threshold"""
+    import numpy as np
+    import pandas as pd
+
+    thresholds = np.array(STREAK_THRESHOLDS)
+    longest = learners['longest_streak'].to_numpy()[:, None]
+    current = learners['current_streak'].to_numpy()[:, None]
+    count = max(len(learners), 1)
+    return pd.DataFrame({
+        'days': thresholds,
+        'reached': (longest >= thresholds).sum(axis=0),
+        'reached_share': (longest >= thresholds).sum(axis=0) / count,
+        'active_share': (current >= thresholds).sum(axis=0) / count
+    })
+
+def phase_dropoff(modules, learner_count):
+    """Learners reaching and completing each phase of the unlock path"""
+    import numpy as np
+    import pandas as pd
+
+    known = modules[modules['phase'] > 0]
+    status = known['status'].astype(str)
+    per_phase = pd.DataFrame({
+        'learner': known['learner'],
+        'phase': known['phase'],
+        'open': status.ne('locked'),
+        'completed': status.eq('completed')
+    }).groupby(['learner', 'phase'])[['open', 'completed']].all().unstack('phase', fill_value=False)
+
+    phases = np.arange(1, len(PHASES) + 1)
+    reached = per_phase['open'].reindex(columns=phases, fill_value=False).sum().to_numpy(copy=True)
+    finished = per_phase['completed'].reindex(columns=phases, fill_value=False).sum().to_numpy(copy=True)
+    # Every learner starts in the first phase, whatever their saved module states
+    reached[0] = learner_count
+    next_reached = np.append(reached[1:], 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        completion_rate = np.where(reached > 0, finished / reached, np.nan)
+        dropoff = np.where(reached > 0, 1 - next_reached / reached, np.nan)
+    return pd.DataFrame({
+        'phase': phases,
+        'modules': [', '.join(phase) for phase in PHASES],
+        'reached': reached,
+        'completed': finished,
+        'completion_rate': completion_rate,
+        'dropoff_before_next': dropoff
+    })
+
+def write_frames(frames, output):
+    """Write each frame as Parquet when pyarrow is available, CSV otherwise"""
+    try:
+        import pyarrow  # noqa: F401
+        extension = 'parquet'
+    except ImportError:
+        extension = 'csv'
+
+    os.makedirs(output, exist_ok=True)
+    paths = []
+    for name, frame in frames.items():
+        path = os.path.join(output, f"{name}.{extension}")
+        if extension == 'parquet':
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Cohort analytics over learner progress exports")
+    parser.add_argument('exports', nargs='*',
+                        help="aiLearningData JSON files or directories of them")
+    parser.add_argument('--db', metavar='FILE',
+                        help="also read every learner from this progress store (see progress_store.py)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help=f"directory for the result tables (default: {DEFAULT_OUTPUT}/)")
+    parser.add_argument('--workers', type=int,
+                        help="processes used to parse exports (default: number of CPUs)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    exports = find_exports(args.exports)
+    if not exports and not args.db:
+        print("❌ No exports given (pass JSON files, directories or --db)")
+        sys.exit(1)
+
+    print(f"📊 Loading {len(exports)} export(s){' and ' + args.db if args.db else ''}...")
+    learners, modules, errors = load_cohort(exports, db=args.db, workers=args.workers)
+    for error in errors:
+        print(f"⚠️  Skipped {error}")
+    if learners.empty:
+        print("❌ No learner data could be read")
+        sys.exit(1)
+
+    frames = {
+        'learners': learners,
+        'modules': modules,
+        'funnel': module_funnel(modules),
+        'time_to_complete': time_to_complete(modules),
+        'streak_retention': streak_retention(learners),
+        'phase_dropoff': phase_dropoff(modules, len(learners))
+    }
+    paths = write_frames(frames, args.output)
+
+    print(f"\n👥 {len(learners)} learners, {len(modules)} module records")
+    print("\n🪜 Phase drop-off:")
+    print(frames['phase_dropoff'].drop(columns='modules').to_string(index=False))
+    print("\n🔥 Streak retention:")
+    print(frames['streak_retention'].to_string(index=False))
+    print(f"\n📄 Wrote {len(paths)} tables to {args.output}/")
+
+if __name__ == "__main__":
+    main()
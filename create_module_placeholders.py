@@ -1,169 +1,56 @@
 #!/usr/bin/env python3
 """
 Create placeholder HTML files for upcoming modules
+
+Pages are generated for the modules marked "placeholder" in modules.json.
+
+Builds are incremental: a manifest next to the generated pages records a
+hash of each module's inputs and of the page template, so only modules
+whose hash changed are regenerated and pages of modules removed from the
+catalog are deleted.
+
+Styles shared by every page live in assets/css/module.css, which all
+pages link to, so browsers cache them once for every module page.
+build_assets.py publishes it under a content-hashed name in dist/.
 """
 
 import os
+import re
+import json
+import inspect
+import hashlib
+import argparse
+import tempfile
+from html import escape
+from concurrent.futures import ThreadPoolExecutor
+
+from module_catalog import load_catalog
 
-# Module definitions
+MANIFEST_NAME = '.build-manifest.json'
+STYLESHEET = '../assets/css/module.css'
+
+# Modules with a generated page, in curriculum order (see modules.json)
 modules = [
     {
-        'filename': 'python-for-ai.html',
-        'title': 'Python for AI',
-        'icon': 'fab fa-python',
-        'description': 'Master Python programming for artificial intelligence and machine learning',
-        'features': [
-            'NumPy for numerical computing',
-            'Pandas for data manipulation', 
-            'Matplotlib for visualization',
-            'Scikit-learn for machine learning',
-            'Python best practices',
-            'AI project workflow'
-        ]
-    },
-    {
-        'filename': 'data-handling.html', 
-        'title': 'Data Handling',
-        'icon': 'fas fa-database',
-        'description': 'Learn essential data collection, cleaning, and preprocessing techniques',
-        'features': [
-            'Data collection techniques',
-            'Data cleaning and preprocessing',
-            'Feature engineering',
-            'Data visualization strategies',
-            'Handling missing data',
-            'Data quality assessment'
-        ]
-    },
-    {
-        'filename': 'ml-fundamentals.html',
-        'title': 'ML Fundamentals', 
-        'icon': 'fas fa-cogs',
-        'description': 'Understand core machine learning concepts and methodologies',
-        'features': [
-            'Machine learning algorithms overview',
-            'Model selection and evaluation',
-            'Cross-validation techniques',
-            'Bias-variance tradeoff',
-            'Performance metrics',
-            'ML workflow best practices'
-        ]
-    },
-    {
-        'filename': 'supervised-learning.html',
-        'title': 'Supervised Learning',
-        'icon': 'fas fa-chart-line', 
-        'description': 'Master supervised learning algorithms and techniques',
-        'features': [
-            'Linear and logistic regression',
-            'Decision trees and random forests',
-            'Support vector machines',
-            'Ensemble methods',
-            'Model evaluation',
-            'Hyperparameter tuning'
-        ]
-    },
-    {
-        'filename': 'unsupervised-learning.html',
-        'title': 'Unsupervised Learning',
-        'icon': 'fas fa-search',
-        'description': 'Explore pattern discovery and unsupervised learning methods',
-        'features': [
-            'Clustering algorithms (K-means, hierarchical)',
-            'Dimensionality reduction (PCA, t-SNE)',
-            'Association rule learning',
-            'Anomaly detection',
-            'Clustering validation',
-            'Feature selection'
-        ]
-    },
-    {
-        'filename': 'ml-projects.html',
-        'title': 'ML Projects',
-        'icon': 'fas fa-project-diagram',
-        'description': 'Apply machine learning skills to real-world projects',
-        'features': [
-            'End-to-end project workflow',
-            'Real-world case studies',
-            'Model deployment basics',
-            'Best practices and tips',
-            'Project portfolio building',
-            'Industry applications'
-        ]
-    },
-    {
-        'filename': 'neural-networks.html',
-        'title': 'Neural Networks',
-        'icon': 'fas fa-brain',
-        'description': 'Dive deep into neural networks and deep learning fundamentals',
-        'features': [
-            'Perceptrons and multi-layer networks',
-            'Backpropagation algorithm',
-            'Activation functions',
-            'Optimization techniques',
-            'Regularization methods',
-            'Neural network architectures'
-        ]
-    },
-    {
-        'filename': 'computer-vision.html',
-        'title': 'Computer Vision',
-        'icon': 'fas fa-eye',
-        'description': 'Learn to build AI systems that can see and understand images',
-        'features': [
-            'Convolutional Neural Networks (CNNs)',
-            'Image preprocessing and augmentation',
-            'Object detection and recognition',
-            'Transfer learning',
-            'Image classification',
-            'Computer vision applications'
-        ]
-    },
-    {
-        'filename': 'natural-language-processing.html',
-        'title': 'Natural Language Processing',
-        'icon': 'fas fa-comments',
-        'description': 'Build AI systems that understand and generate human language',
-        'features': [
-            'Text preprocessing and tokenization',
-            'Recurrent Neural Networks (RNNs)',
-            'Transformers and attention mechanisms',
-            'Language models and applications',
-            'Sentiment analysis',
-            'Text generation'
-        ]
-    },
-    {
-        'filename': 'advanced-deep-learning.html',
-        'title': 'Advanced Deep Learning',
-        'icon': 'fas fa-rocket',
-        'description': 'Explore cutting-edge deep learning techniques and research',
-        'features': [
-            'Generative Adversarial Networks (GANs)',
-            'Reinforcement learning basics',
-            'Advanced architectures',
-            'Cutting-edge research topics',
-            'AI safety and ethics',
-            'Future of AI'
-        ]
+        'filename': module['page'],
+        'title': module['title'],
+        'icon': module['icon'],
+        'description': module['description'],
+        'features': module['features']
     }
+    for module in load_catalog() if module.get('placeholder')
 ]
 
-def create_module_html(module):
-    """Create HTML file for a module"""
-    
-    features_html = '\n                        '.join([
-        f'<li><i class="fas fa-check"></i> {feature}</li>'
-        for feature in module['features']
-    ])
-    
-    html_content = f"""<!DOCTYPE html>
+TEMPLATE_FIELD = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{module['title']} - AI Learning Hub</title>
+    <title>{{ title }} - AI Learning Hub</title>
     <link rel="stylesheet" href="../assets/css/style.css">
+    <link rel="stylesheet" href="{{ stylesheet }}">
     <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css">
 </head>
@@ -186,8 +73,8 @@ def create_module_html(module):
     <main class="main">
         <div class="container">
             <div class="module-header">
-                <h1><i class="{module['icon']}"></i> {module['title']}</h1>
-                <p class="module-subtitle">{module['description']}</p>
+                <h1><i class="{{ icon }}"></i> {{ title }}</h1>
+                <p class="module-subtitle">{{ description }}</p>
             </div>
 
             <div class="coming-soon-card">
@@ -197,7 +84,7 @@ def create_module_html(module):
                     <p>This module is currently under development. We're creating comprehensive, interactive content covering:</p>
                     
                     <ul class="feature-list">
-                        {features_html}
+                        {{ features }}
                     </ul>
 
                     <div class="cta-section">
@@ -222,148 +109,150 @@ def create_module_html(module):
             </div>
         </div>
     </main>
-
-    <style>
-        .main {{
-            padding: 2rem 0;
-            min-height: calc(100vh - 80px);
-        }}
-
-        .module-header {{
-            text-align: center;
-            margin-bottom: 3rem;
-        }}
-
-        .module-header h1 {{
-            font-size: 2.5rem;
-            color: var(--gray-800);
-            margin-bottom: 0.5rem;
-        }}
-
-        .module-subtitle {{
-            font-size: 1.25rem;
-            color: var(--gray-600);
-        }}
-
-        .coming-soon-card {{
-            max-width: 800px;
-            margin: 0 auto;
-            background: var(--white);
-            border-radius: var(--radius-lg);
-            box-shadow: var(--shadow-lg);
-            overflow: hidden;
-        }}
-
-        .coming-soon-content {{
-            padding: 3rem;
-            text-align: center;
-        }}
-
-        .coming-soon-content > i {{
-            font-size: 4rem;
-            color: var(--primary-color);
-            margin-bottom: 1.5rem;
-        }}
-
-        .coming-soon-content h2 {{
-            font-size: 2rem;
-            color: var(--gray-800);
-            margin-bottom: 1rem;
-        }}
-
-        .coming-soon-content > p {{
-            font-size: 1.125rem;
-            color: var(--gray-600);
-            margin-bottom: 2rem;
-            line-height: 1.6;
-        }}
-
-        .feature-list {{
-            list-style: none;
-            text-align: left;
-            max-width: 400px;
-            margin: 2rem auto;
-        }}
-
-        .feature-list li {{
-            display: flex;
-            align-items: center;
-            gap: 0.75rem;
-            padding: 0.5rem 0;
-            color: var(--gray-700);
-        }}
-
-        .feature-list i {{
-            color: var(--success-color);
-        }}
-
-        .cta-section {{
-            margin: 2.5rem 0;
-            padding: 2rem;
-            background: var(--gray-50);
-            border-radius: var(--radius);
-        }}
-
-        .cta-section h3 {{
-            color: var(--gray-800);
-            margin-bottom: 1.5rem;
-        }}
-
-        .cta-buttons {{
-            display: flex;
-            gap: 1rem;
-            justify-content: center;
-            flex-wrap: wrap;
-        }}
-
-        .estimated-release {{
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 0.5rem;
-            color: var(--gray-500);
-            font-weight: 500;
-        }}
-
-        @media (max-width: 768px) {{
-            .coming-soon-content {{
-                padding: 2rem 1.5rem;
-            }}
-
-            .module-header h1 {{
-                font-size: 2rem;
-            }}
-
-            .cta-buttons {{
-                flex-direction: column;
-                align-items: center;
-            }}
-        }}
-    </style>
 </body>
 </html>"""
-    
-    return html_content
 
-def main():
-    """Create all module HTML files"""
-    notebooks_dir = "notebooks"
-    
-    if not os.path.exists(notebooks_dir):
-        os.makedirs(notebooks_dir)
-    
+def compile_template(source):
+    """Compile a template into a render function
+
+    The source is split into literal chunks and {{ field }} names once, so
+    rendering a page is a single join with no parsing or formatting.
+    """
+    parts = TEMPLATE_FIELD.split(source)
+    literals = parts[0::2]
+    fields = parts[1::2]
+
+    def render(context):
+        chunks = [literals[0]]
+        for field, literal in zip(fields, literals[1:]):
+            chunks.append(context[field])
+            chunks.append(literal)
+        return ''.join(chunks)
+
+    return render
+
+render_page = compile_template(PAGE_TEMPLATE)
+
+def create_module_html(module):
+    """Create HTML file for a module"""
+    features_html = '\n                        '.join([
+        f'<li><i class="fas fa-check"></i> {escape(feature)}</li>'
+        for feature in module['features']
+    ])
+
+    return render_page({
+        'title': escape(module['title']),
+        'icon': escape(module['icon']),
+        'description': escape(module['description']),
+        'features': features_html,
+        'stylesheet': STYLESHEET
+    })
+
+def template_hash():
+    """Hash of the page template and render code, so edits to either invalidate every page"""
+    source = inspect.getsource(create_module_html)
+    return hashlib.sha256(f"{STYLESHEET}\n{PAGE_TEMPLATE}\n{source}".encode('utf-8')).hexdigest()
+
+def module_hash(module, template_digest):
+    """Hash of everything a module page is rendered from"""
+    payload = json.dumps(module, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(f"{template_digest}\n{payload}".encode('utf-8')).hexdigest()
+
+def load_manifest(path):
+    """Load the build manifest, or an empty one if missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'pages': {}}
+    if not isinstance(manifest.get('pages'), dict):
+        return {'pages': {}}
+    return manifest
+
+def write_atomic(filepath, content):
+    """Write a file via a temporary file and rename, so readers never see partial output"""
+    directory = os.path.dirname(filepath) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def build_page(module, notebooks_dir):
+    """Render and write a single module page"""
+    write_atomic(os.path.join(notebooks_dir, module['filename']),
+                 create_module_html(module))
+    return module['filename']
+
+def build(notebooks_dir="notebooks", force=False):
+    """Regenerate changed module pages and remove stale ones
+
+    Returns a (built, removed, unchanged) tuple of filename lists.
+    """
+    os.makedirs(notebooks_dir, exist_ok=True)
+
+    manifest_path = os.path.join(notebooks_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    previous = manifest['pages']
+    template_digest = template_hash()
+
+    pages = {}
+    to_build = []
+    unchanged = []
     for module in modules:
+        digest = module_hash(module, template_digest)
+        pages[module['filename']] = digest
         filepath = os.path.join(notebooks_dir, module['filename'])
-        
-        if not os.path.exists(filepath):
-            html_content = create_module_html(module)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            print(f"✅ Created {module['filename']}")
+        if force or previous.get(module['filename']) != digest or not os.path.exists(filepath):
+            to_build.append(module)
         else:
-            print(f"⚠️  {module['filename']} already exists, skipping")
+            unchanged.append(module['filename'])
+
+    built = []
+    if to_build:
+        with ThreadPoolExecutor(max_workers=min(32, len(to_build))) as executor:
+            built = list(executor.map(lambda m: build_page(m, notebooks_dir), to_build))
+
+    # Only pages this script generated are ever removed, and only once
+    # their module is gone from the catalog: a module that graduates from
+    # placeholder keeps its page, which is now written by hand
+    catalog_pages = {module['page'] for module in load_catalog()}
+    removed = []
+    for filename in sorted(set(previous) - set(pages) - catalog_pages):
+        try:
+            os.remove(os.path.join(notebooks_dir, filename))
+        except FileNotFoundError:
+            pass
+        removed.append(filename)
+
+    if built or removed or previous != pages or 'stylesheet' in manifest:
+        write_atomic(manifest_path, json.dumps({
+            'template': template_digest,
+            'pages': pages
+        }, indent=2, sort_keys=True) + '\n')
+
+    return built, removed, unchanged
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Create or update the placeholder pages of upcoming modules")
+    parser.add_argument('--force', action='store_true',
+                        help="rebuild every page, even if its inputs are unchanged")
+    return parser.parse_args()
+
+def main():
+    """Create or update all module HTML files"""
+    args = parse_args()
+    built, removed, unchanged = build(force=args.force)
+
+    for filename in built:
+        print(f"✅ Built {filename}")
+    for filename in removed:
+        print(f"🗑️  Removed stale {filename}")
+    print(f"ℹ️  {len(built)} built, {len(removed)} removed, {len(unchanged)} unchanged")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Notebook Export
+Converts the curriculum notebooks to static HTML pages with nbconvert
+
+Notebooks are converted in a pool of worker processes. Each export is
+cached in .cache/notebooks under a hash of the notebook and the export
+settings, so only notebooks that changed are converted again; everything
+else is copied from the cache. With --execute, notebooks are run before
+export and their outputs are cached by the hash of their code cells, so
+editing markdown never re-runs a notebook.
+
+To keep pages small:
+- images larger than INLINE_IMAGE_BYTES are written next to the page as
+  content-hashed files instead of inline base64
+- the stylesheet nbconvert inlines into every page, and any inline copy
+  of plotly.js, become shared content-hashed files
+- text outputs larger than MAX_TEXT_OUTPUT_BYTES are truncated
+
+Usage: python export_notebooks.py [NOTEBOOK ...] [--output dist/notebooks] [--execute]
+"""
+
+import os
+import re
+import sys
+import json
+import base64
+import shutil
+import hashlib
+import argparse
+import tempfile
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from build_assets import content_hash, precompress, write_service_worker, SERVICE_WORKER
+from run_notebooks import find_notebooks, DEFAULT_CELL_TIMEOUT
+
+DEFAULT_OUTPUT = os.path.join('dist', 'notebooks')
+CACHE_DIR = os.path.join('.cache', 'notebooks')
+MANIFEST_NAME = '.export-manifest.json'
+
+# Bump to invalidate cached exports after changing how pages are produced
+EXPORT_VERSION = 1
+
+INLINE_IMAGE_BYTES = 16 * 1024
+MAX_TEXT_OUTPUT_BYTES = 64 * 1024
+
+# Inline <style> and <script> blocks at least this large become shared files
+SHARED_BLOCK_BYTES = 8 * 1024
+
+IMAGE_TYPES = {'image/png': 'png', 'image/jpeg': 'jpg', 'image/gif': 'gif'}
+STYLE_BLOCK = re.compile(r'<style[^>]*>(.*?)</style>', re.S)
+SCRIPT_BLOCK = re.compile(r'<script((?: type="(?:text/javascript|module)")?)>(.*?)</script>', re.S)
+
+def export_key(source, execute):
+    """Cache key for one notebook's export"""
+    import nbconvert
+    settings = json.dumps([EXPORT_VERSION, nbconvert.__version__, execute,
+                           INLINE_IMAGE_BYTES, MAX_TEXT_OUTPUT_BYTES, SHARED_BLOCK_BYTES])
+    return hashlib.sha256(settings.encode('utf-8') + source).hexdigest()[:20]
+
+def code_key(nb):
+    """Hash of everything that affects execution: kernel and code cells"""
+    digest = hashlib.sha256(nb.metadata.get('kernelspec', {}).get('name', 'python3').encode('utf-8'))
+    for cell in nb.cells:
+        if cell.cell_type == 'code':
+            digest.update(b'\0' + cell.source.encode('utf-8'))
+    return digest.hexdigest()[:20]
+
+def execute_cached(nb, path, cache_dir, timeout):
+    """Execute the notebook, or reuse outputs cached for the same code"""
+    import nbformat
+    from nbconvert.preprocessors import ExecutePreprocessor
+
+    cached = os.path.join(cache_dir, 'executed', f"{code_key(nb)}.ipynb")
+    if os.path.exists(cached):
+        executed = nbformat.read(cached, as_version=4)
+    else:
+        executed = nbformat.from_dict(nb)
+        # Failing cells still export, with their tracebacks shown on the page
+        ExecutePreprocessor(timeout=timeout, allow_errors=True).preprocess(
+            executed, {'metadata': {'path': str(Path(path).parent)}})
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        nbformat.write(executed, cached)
+
+    code_cells = [cell for cell in nb.cells if cell.cell_type == 'code']
+    executed_cells = [cell for cell in executed.cells if cell.cell_type == 'code']
+    for cell, result in zip(code_cells, executed_cells):
+        cell.outputs = result.outputs
+        cell.execution_count = result.execution_count
+
+def truncate(text, limit=MAX_TEXT_OUTPUT_BYTES):
+    if isinstance(text, list):
+        text = ''.join(text)
+    if len(text.encode('utf-8')) <= limit:
+        return text
+    kept = text.encode('utf-8')[:limit].decode('utf-8', 'ignore')
+    return f"{kept}\n... [output truncated, {len(text.encode('utf-8')) // 1024} KB in the notebook]"
+
+def slim_outputs(nb, files_dir):
+    """Move large images out of the notebook and truncate huge text outputs
+
+    Returns {file name: bytes} for the extracted images.
+    """
+    files = {}
+    for cell in nb.cells:
+        if cell.cell_type != 'code':
+            continue
+        for output in cell.get('outputs', []):
+            if output.output_type == 'stream':
+                output.text = truncate(output.text)
+                continue
+            data = output.get('data', {})
+            for mime, ext in IMAGE_TYPES.items():
+                if mime not in data:
+                    continue
+                raw = base64.b64decode(data[mime])
+                if len(raw) < INLINE_IMAGE_BYTES:
+                    continue
+                name = f"output.{content_hash(raw)}.{ext}"
+                files[name] = raw
+                # nbconvert's templates link metadata.filenames instead of inlining
+                output.setdefault('metadata', {}).setdefault('filenames', {})[mime] = f"{files_dir}/{name}"
+            for mime in ('text/plain', 'text/html'):
+                if mime in data:
+                    data[mime] = truncate(data[mime])
+
+    # Saved widget state is embedded in the page; drop it when it is huge
+    widgets = nb.metadata.get('widgets')
+    if widgets and len(json.dumps(widgets)) > MAX_TEXT_OUTPUT_BYTES:
+        del nb.metadata['widgets']
+    return files
+
+def share_blocks(page):
+    """Replace large inline styles and scripts with links to hashed shared files
+
+    Returns the new page and {file name: bytes}.
+    """
+    shared = {}
+
+    def externalize(kind, match):
+        content = match.group(match.lastindex)
+        if len(content) < SHARED_BLOCK_BYTES:
+            return match.group(0)
+        data = content.encode('utf-8')
+        if kind == 'style':
+            name = f"notebook.{content_hash(data)}.css"
+            shared[name] = data
+            return f'<link rel="stylesheet" href="{name}">'
+        label = 'plotly' if 'plotly' in content[:4096].lower() else 'script'
+        name = f"{label}.{content_hash(data)}.js"
+        shared[name] = data
+        return f'<script{match.group(1)} src="{name}"></script>'
+
+    page = STYLE_BLOCK.sub(lambda m: externalize('style', m), page)
+    page = SCRIPT_BLOCK.sub(lambda m: externalize('script', m), page)
+    return page, shared
+
+def write_entry(entry, page, files, shared):
+    """Store one export in the cache, atomically"""
+    parent = os.path.dirname(entry)
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+    for subdir, contents in (('files', files), ('shared', shared)):
+        os.makedirs(os.path.join(tmp, subdir))
+        for name, data in contents.items():
+            with open(os.path.join(tmp, subdir, name), 'wb') as f:
+                f.write(data)
+    with open(os.path.join(tmp, 'page.html'), 'w', encoding='utf-8') as f:
+        f.write(page)
+    try:
+        os.replace(tmp, entry)
+    except OSError:
+        # Another run stored the same export first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def export_notebook(job):
+    """Worker entry point: convert one notebook into a cache entry"""
+    path, key, cache_dir, execute, timeout = job
+    try:
+        import nbformat
+        from nbconvert import HTMLExporter
+
+        nb = nbformat.read(path, as_version=4)
+        if execute:
+            execute_cached(nb, path, cache_dir, timeout)
+        stem = Path(path).stem
+        files = slim_outputs(nb, f"{stem}_files")
+        page, _ = HTMLExporter().from_notebook_node(nb)
+        page, shared = share_blocks(page)
+        write_entry(os.path.join(cache_dir, key), page, files, shared)
+        return path, None
+    except Exception as e:
+        return path, f"{type(e).__name__}: {e}"
+
+def publish(entry, output, stem):
+    """Copy a cached export into the output directory"""
+    shutil.copyfile(os.path.join(entry, 'page.html'), os.path.join(output, f"{stem}.html"))
+    files_dir = os.path.join(output, f"{stem}_files")
+    shutil.rmtree(files_dir, ignore_errors=True)
+    files = os.listdir(os.path.join(entry, 'files'))
+    if files:
+        os.makedirs(files_dir)
+        for name in files:
+            shutil.copyfile(os.path.join(entry, 'files', name), os.path.join(files_dir, name))
+    for name in os.listdir(os.path.join(entry, 'shared')):
+        target = os.path.join(output, name)
+        # Shared files are content-hashed, so an existing copy is identical
+        if not os.path.exists(target):
+            shutil.copyfile(os.path.join(entry, 'shared', name), target)
+
+def remove_page(output, stem):
+    for path in (f"{stem}.html", f"{stem}.html.gz", f"{stem}.html.br"):
+        if os.path.exists(os.path.join(output, path)):
+            os.remove(os.path.join(output, path))
+    shutil.rmtree(os.path.join(output, f"{stem}_files"), ignore_errors=True)
+
+def export(notebooks, output=DEFAULT_OUTPUT, cache_dir=CACHE_DIR, execute=False,
+           timeout=DEFAULT_CELL_TIMEOUT, workers=None, force=False):
+    """Export notebooks; returns (converted, copied, unchanged, removed, errors)"""
+    os.makedirs(output, exist_ok=True)
+    manifest_path = os.path.join(output, MANIFEST_NAME)
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    keys = {}
+    for path in notebooks:
+        with open(path, 'rb') as f:
+            keys[Path(path).stem] = (str(path), export_key(f.read(), execute))
+
+    if force:
+        for _, key in keys.values():
+            shutil.rmtree(os.path.join(cache_dir, key), ignore_errors=True)
+    jobs = [(path, key, cache_dir, execute, timeout) for path, key in keys.values()
+            if not os.path.isdir(os.path.join(cache_dir, key))]
+
+    errors = {}
+    if len(jobs) == 1:
+        results = [export_notebook(jobs[0])]
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=workers or min(len(jobs), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(export_notebook, jobs))
+    else:
+        results = []
+    for path, error in results:
+        if error:
+            errors[path] = error
+    converted = [path for path, error in results if not error]
+
+    manifest, copied, unchanged = {}, [], []
+    for stem, (path, key) in keys.items():
+        if path in errors:
+            continue
+        manifest[stem] = key
+        if previous.get(stem) == key and os.path.exists(os.path.join(output, f"{stem}.html")):
+            unchanged.append(path)
+            continue
+        publish(os.path.join(cache_dir, key), output, stem)
+        if path not in converted:
+            copied.append(path)
+
+    removed = [stem for stem in previous if stem not in keys]
+    for stem in removed:
+        remove_page(output, stem)
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return converted, copied, unchanged, removed, errors
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Convert notebooks to static HTML pages")
+    parser.add_argument('notebooks', nargs='*',
+                        help="notebooks or directories to export (default: notebooks/)")
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT,
+                        help=f"output directory (default: {DEFAULT_OUTPUT})")
+    parser.add_argument('--execute', action='store_true',
+                        help="run notebooks before exporting (outputs are cached per code version)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_CELL_TIMEOUT,
+                        help=f"seconds each cell may run with --execute (default: {DEFAULT_CELL_TIMEOUT})")
+    parser.add_argument('--workers', type=int,
+                        help="notebooks to convert in parallel (default: number of CPUs)")
+    parser.add_argument('--force', action='store_true',
+                        help="convert every notebook even if a cached export exists")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    notebooks = find_notebooks(args.notebooks)
+    if not notebooks:
+        print("❌ No notebooks found")
+        sys.exit(1)
+
+    print(f"📓 Exporting {len(notebooks)} notebook(s) to {args.output}/...")
+    converted, copied, unchanged, removed, errors = export(
+        notebooks, args.output, execute=args.execute, timeout=args.timeout,
+        workers=args.workers, force=args.force)
+    if converted or copied or removed:
+        # Keep the service worker of a build_assets.py build in step with the pages
+        site = os.path.dirname(os.path.abspath(args.output))
+        if os.path.exists(os.path.join(site, SERVICE_WORKER)):
+            write_service_worker(site)
+            precompress(site)
+        else:
+            precompress(args.output)
+
+    for path in converted:
+        print(f"✅ Converted {path}")
+    for path in copied:
+        print(f"♻️  From cache {path}")
+    for stem in removed:
+        print(f"🗑️  Removed {stem}.html")
+    for path, error in errors.items():
+        print(f"❌ {path}: {error}")
+    print(f"\n{len(converted)} converted, {len(copied)} from cache, {len(unchanged)} unchanged")
+
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Multi-Learner Jupyter Pool
+Runs one Jupyter Lab server per learner behind a tiny local router
+
+Each learner gets their own workspace (workspaces/<learner>/, seeded with
+a copy of the notebooks) and their own Jupyter server on a free port with
+a private token, so one heavy notebook cannot starve everyone else. The
+number of servers is capped by available cores and memory, and servers
+with no activity for a while are shut down to make room.
+
+The router answers on one well-known port (8888 by default):
+
+    /                      sign in with a learner name and passcode
+    /learner/<name>[/path] start (if needed) and redirect to that learner's server
+    /status                JSON overview of the pool (local clients only)
+    anything else          redirected to the server of the learner in the cookie
+
+Learner servers run with HUB_ROOT and HUB_LEARNER set, so quiz scores
+from a workspace are recorded in the hub's progress store under the
+learner's name (open the dashboard with ?sync=<name> to see them).
+
+The redirect carries the learner's Jupyter token, so it is only given to
+a browser that signed in as that learner. The first sign-in with a name
+sets its passcode (stored salted and hashed next to the workspace);
+later sign-ins must repeat it. Signing in sets a cookie signed with a
+key that lives only as long as the router, so after a restart learners
+sign in again.
+
+Usage: python jupyter_pool.py [--port 8888] [--bind ADDRESS] [--max-servers N]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import signal
+import socket
+import secrets
+import hashlib
+import hmac
+import argparse
+import ipaddress
+import threading
+import subprocess
+import urllib.request
+from datetime import datetime
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, quote
+from html import escape
+
+from setup import get_venv_python, wait_until_ready, port_in_use
+
+DEFAULT_PORT = 8888
+WORKSPACES_DIR = 'workspaces'
+NOTEBOOKS_DIR = 'notebooks'
+HUB_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Resources one learner's Jupyter server is budgeted for
+MEMORY_PER_SERVER_MB = 768
+CPUS_PER_SERVER = 0.5
+
+# Servers without kernel or browser activity for this long are reaped
+IDLE_TIMEOUT = 30 * 60
+REAP_INTERVAL = 60
+
+LEARNER_NAME = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+COOKIE_NAME = 'hub_learner'
+
+# Passcodes are stored as salted PBKDF2 hashes in workspaces/.<learner>.passcode
+MIN_PASSCODE_LENGTH = 4
+PASSCODE_ITERATIONS = 200_000
+MAX_FORM_BYTES = 4096
+
+LANDING_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Jupyter Lab - AI Learning Hub</title>
+</head>
+<body style="font-family: sans-serif; max-width: 32rem; margin: 4rem auto;">
+    <h1>AI Learning Hub - Jupyter Lab</h1>
+    <p>{{ message }}</p>
+    <form action="/learner" method="post">
+        <p><label>Your learner name: <input name="name" pattern="[A-Za-z0-9_-]{1,64}" required></label></p>
+        <p><label>Passcode: <input name="passcode" type="password" minlength="4" required></label></p>
+        <p><small>The first sign-in with a name sets its passcode.</small></p>
+        <button type="submit">Open my notebooks</button>
+    </form>
+</body>
+</html>
+"""
+
+def total_memory_mb():
+    """Physical memory in MB, or None where it cannot be determined"""
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def default_capacity():
+    """How many Jupyter servers this machine can host"""
+    by_cpu = int((os.cpu_count() or 1) / CPUS_PER_SERVER)
+    memory = total_memory_mb()
+    by_memory = memory // MEMORY_PER_SERVER_MB if memory else by_cpu
+    return max(1, min(by_cpu, by_memory))
+
+def free_port(host='127.0.0.1'):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+class PoolFull(Exception):
+    """Raised when every slot is taken by an active learner"""
+
+class LearnerServer:
+    """One learner's Jupyter Lab process"""
+
+    def __init__(self, learner, port, token, process):
+        self.learner = learner
+        self.port = port
+        self.token = token
+        self.process = process
+        self.started_at = time.time()
+
+    def running(self):
+        return self.process.poll() is None
+
+    def idle_seconds(self, host):
+        """Seconds since the server last saw activity, or None if unknown"""
+        url = f"http://{host}:{self.port}/api/status?token={self.token}"
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                status = json.load(response)
+        except (OSError, ValueError):
+            return None
+        if status.get('connections') or status.get('kernels'):
+            # Running kernels count as activity even when nobody is watching
+            return 0
+        try:
+            last = datetime.fromisoformat(status['last_activity'].replace('Z', '+00:00'))
+        except (KeyError, ValueError):
+            return None
+        return time.time() - last.timestamp()
+
+class JupyterPool:
+    """Start, track and reap one Jupyter server per learner"""
+
+    def __init__(self, host='127.0.0.1', max_servers=None, idle_timeout=IDLE_TIMEOUT):
+        self.host = host
+        # Address used to reach the learner servers from this machine
+        self.local_host = '127.0.0.1' if host in ('', '0.0.0.0') else host
+        self.max_servers = max_servers or default_capacity()
+        self.idle_timeout = idle_timeout
+        self.servers = {}
+        self.starting = {}
+        self.lock = threading.Lock()
+        # Signs learner cookies; a new key on every start
+        self.session_key = secrets.token_bytes(32)
+
+    def check_passcode(self, learner, passcode):
+        """Whether the passcode is the learner's; the first one given becomes it"""
+        path = os.path.join(WORKSPACES_DIR, f".{learner}.passcode")
+        try:
+            with open(path, encoding='utf-8') as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            salt = secrets.token_bytes(16)
+            digest = hashlib.pbkdf2_hmac('sha256', passcode.encode('utf-8'), salt, PASSCODE_ITERATIONS)
+            os.makedirs(WORKSPACES_DIR, exist_ok=True)
+            tmp_path = f"{path}.{secrets.token_hex(4)}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'salt': salt.hex(), 'hash': digest.hex()}, f)
+            try:
+                # link() fails if the file exists: of two first sign-ins
+                # racing, only one sets the passcode
+                os.link(tmp_path, path)
+            except FileExistsError:
+                return self.check_passcode(learner, passcode)
+            finally:
+                os.remove(tmp_path)
+            return True
+        digest = hashlib.pbkdf2_hmac('sha256', passcode.encode('utf-8'),
+                                     bytes.fromhex(stored['salt']), PASSCODE_ITERATIONS)
+        return hmac.compare_digest(digest.hex(), stored['hash'])
+
+    def sign(self, learner):
+        """Cookie value naming a signed-in learner"""
+        signature = hmac.new(self.session_key, learner.encode('utf-8'), hashlib.sha256).hexdigest()
+        return f"{learner}.{signature}"
+
+    def signed_in(self, cookie_value):
+        """The learner a cookie value was signed for, or None"""
+        learner = cookie_value.rpartition('.')[0]
+        if LEARNER_NAME.match(learner) and hmac.compare_digest(self.sign(learner), cookie_value):
+            return learner
+        return None
+
+    def workspace(self, learner):
+        """The learner's workspace, seeded with the course notebooks on first use"""
+        path = os.path.join(WORKSPACES_DIR, learner)
+        if not os.path.exists(path):
+            shutil.copytree(NOTEBOOKS_DIR, os.path.join(path, NOTEBOOKS_DIR),
+                            ignore=shutil.ignore_patterns('*.html', '.*'))
+        return path
+
+    def start_server(self, learner):
+        port = free_port(self.host)
+        token = secrets.token_urlsafe(24)
+        process = subprocess.Popen([
+            get_venv_python(), '-m', 'jupyter', 'lab', '--no-browser',
+            f'--ServerApp.ip={self.host}', f'--port={port}', '--ServerApp.port_retries=0',
+            f'--ServerApp.root_dir={self.workspace(learner)}',
+            f'--IdentityProvider.token={token}'
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+           env=dict(os.environ, HUB_ROOT=HUB_ROOT, HUB_LEARNER=learner))
+        server = LearnerServer(learner, port, token, process)
+        try:
+            wait_until_ready(f"Jupyter for {learner}", process, f"http://{self.local_host}:{port}/api")
+        except RuntimeError:
+            process.terminate()
+            raise
+        return server
+
+    def get(self, learner):
+        """Return the learner's server, starting one if necessary
+
+        Servers start outside the lock, so a burst of learners arriving
+        together boots their servers in parallel. A full pool is made
+        room in the same way, without holding the lock.
+        """
+        reaped = False
+        while True:
+            with self.lock:
+                server = self.servers.get(learner)
+                if server and server.running():
+                    return server
+                self.servers.pop(learner, None)
+
+                pending = self.starting.get(learner)
+                if pending is None:
+                    if self.in_use() < self.max_servers:
+                        pending = self.starting[learner] = threading.Event()
+                        break
+                    if reaped:
+                        raise PoolFull(f"all {self.max_servers} Jupyter servers are in use")
+            if pending is not None:
+                # Another request is already starting this learner's server
+                pending.wait()
+            else:
+                self.reap(force_one=True)
+                reaped = True
+
+        server = None
+        try:
+            server = self.start_server(learner)
+        finally:
+            with self.lock:
+                del self.starting[learner]
+                if server:
+                    self.servers[learner] = server
+            pending.set()
+        return server
+
+    def in_use(self):
+        return len(self.servers) + len(self.starting)
+
+    def idle_times(self):
+        """Idle seconds per learner; asks each server, so call it sparingly"""
+        return {learner: server.idle_seconds(self.local_host)
+                for learner, server in list(self.servers.items()) if server.running()}
+
+    def _evict_locked(self, idle_times, force_one=False):
+        """Drop dead and idle servers from the pool and return the ones to stop
+
+        With force_one, also the idlest server past half the timeout.
+        """
+        for learner, server in list(self.servers.items()):
+            if not server.running():
+                del self.servers[learner]
+
+        evicted = []
+        candidates = []
+        for learner, idle in idle_times.items():
+            if learner not in self.servers or idle is None:
+                continue
+            if idle >= self.idle_timeout:
+                evicted.append(self.servers.pop(learner))
+            elif force_one and idle >= self.idle_timeout / 2:
+                candidates.append((idle, learner))
+        if force_one and candidates and self.in_use() >= self.max_servers:
+            evicted.append(self.servers.pop(max(candidates)[1]))
+        return evicted
+
+    def reap(self, force_one=False):
+        # Query the servers before taking the lock and stop them after
+        # releasing it, so requests are not blocked
+        idle_times = self.idle_times()
+        with self.lock:
+            evicted = self._evict_locked(idle_times, force_one)
+        for server in evicted:
+            self.stop(server)
+
+    def stop(self, server):
+        if server.running():
+            server.process.terminate()
+            try:
+                server.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.process.kill()
+
+    def stop_all(self):
+        with self.lock:
+            servers = list(self.servers.values())
+            self.servers.clear()
+        for server in servers:
+            self.stop(server)
+
+    def status(self):
+        with self.lock:
+            now = time.time()
+            return {
+                'max_servers': self.max_servers,
+                'servers': {
+                    learner: {'port': server.port, 'pid': server.process.pid,
+                              'uptime': round(now - server.started_at, 1)}
+                    for learner, server in self.servers.items() if server.running()
+                }
+            }
+
+def make_handler(pool):
+    class RouterHandler(BaseHTTPRequestHandler):
+        """Map learners to their own Jupyter server with redirects"""
+
+        def send_body(self, status, body, content_type='text/plain; charset=utf-8', headers=None):
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def landing_page(self, status=200, message=''):
+            self.send_body(status, LANDING_PAGE.replace('{{ message }}', escape(message)),
+                           'text/html; charset=utf-8')
+
+        def signed_in(self):
+            cookie = SimpleCookie(self.headers.get('Cookie', ''))
+            return pool.signed_in(cookie[COOKIE_NAME].value) if COOKIE_NAME in cookie else None
+
+        def redirect_to(self, learner, path, query):
+            if not LEARNER_NAME.match(learner):
+                self.send_body(400, "Learner names may only contain letters, digits, '-' and '_'\n")
+                return
+            if self.signed_in() != learner:
+                self.landing_page(401, f"Please sign in as {learner} to open these notebooks.")
+                return
+            try:
+                server = pool.get(learner)
+            except PoolFull as e:
+                self.send_body(503, f"{e}; please try again in a few minutes\n", headers={'Retry-After': '60'})
+                return
+            except RuntimeError as e:
+                self.send_body(500, f"{e}\n")
+                return
+
+            host = (self.headers.get('Host') or pool.host).rsplit(':', 1)[0]
+            separator = '&' if query else ''
+            location = f"http://{host}:{server.port}/{path.lstrip('/')}?{query}{separator}token={server.token}"
+            self.send_response(302)
+            self.send_header('Location', location)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def do_POST(self):
+            if urlsplit(self.path).path != '/learner':
+                self.send_body(404, "Not Found\n")
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+            except ValueError:
+                length = -1
+            if not 0 <= length <= MAX_FORM_BYTES:
+                self.send_body(413, "Form too large\n")
+                return
+            form = parse_qs(self.rfile.read(length).decode('utf-8', 'replace'))
+            name = form.get('name', [''])[0]
+            passcode = form.get('passcode', [''])[0]
+            if not LEARNER_NAME.match(name):
+                self.landing_page(400, "Learner names may only contain letters, digits, '-' and '_'.")
+                return
+            if len(passcode) < MIN_PASSCODE_LENGTH:
+                self.landing_page(400, f"Passcodes need at least {MIN_PASSCODE_LENGTH} characters.")
+                return
+            if not pool.check_passcode(name, passcode):
+                self.landing_page(403, f"Wrong passcode for {name}.")
+                return
+            self.send_response(303)
+            self.send_header('Location', f"/learner/{quote(name)}/lab")
+            self.send_header('Set-Cookie', f"{COOKIE_NAME}={pool.sign(name)}; Path=/; HttpOnly; SameSite=Lax")
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            parts = url.path.split('/', 3)
+
+            if url.path == '/status':
+                # Lists every learner and port, so only for the machine itself
+                if ipaddress.ip_address(self.client_address[0]).is_loopback:
+                    self.send_body(200, json.dumps(pool.status(), indent=2), 'application/json')
+                else:
+                    self.send_body(403, "Status is only available from localhost\n")
+            elif len(parts) >= 3 and parts[1] == 'learner':
+                self.redirect_to(parts[2], parts[3] if len(parts) > 3 else 'lab', url.query)
+            else:
+                learner = self.signed_in()
+                if learner:
+                    self.redirect_to(learner, url.path, url.query)
+                else:
+                    self.landing_page()
+
+        def log_message(self, format, *args):
+            pass
+
+    return RouterHandler
+
+def reaper(pool, stop_event):
+    while not stop_event.wait(REAP_INTERVAL):
+        pool.reap()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run one Jupyter Lab per learner behind a router")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f"router port (default: {DEFAULT_PORT})")
+    parser.add_argument('--bind', default='127.0.0.1',
+                        help="address for the router and the Jupyter servers (default: 127.0.0.1)")
+    parser.add_argument('--max-servers', type=int,
+                        help=f"cap on concurrent servers (default: from cores and memory, now {default_capacity()})")
+    parser.add_argument('--idle-timeout', type=int, default=IDLE_TIMEOUT,
+                        help=f"seconds of inactivity before a server is reaped (default: {IDLE_TIMEOUT})")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if port_in_use(args.port):
+        print(f"❌ Port {args.port} is already in use")
+        sys.exit(1)
+
+    pool = JupyterPool(host=args.bind, max_servers=args.max_servers, idle_timeout=args.idle_timeout)
+    router = ThreadingHTTPServer((args.bind, args.port), make_handler(pool))
+    stop_event = threading.Event()
+    threading.Thread(target=reaper, args=(pool, stop_event), daemon=True).start()
+
+    # The supervisor stops us with SIGTERM; unwind so learner servers are stopped too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    print(f"✅ Jupyter pool router on http://{args.bind}:{args.port}/ "
+          f"(up to {pool.max_servers} learner servers)")
+    try:
+        router.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        router.server_close()
+        pool.stop_all()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Module Catalog
+Loads the curriculum from modules.json, the single list of modules
+
+Every module has an id, title, icon, phase, the module page under
+notebooks/ and the modules it requires. Modules with "placeholder": true
+get a generated "coming soon" page (create_module_placeholders.py) built
+from their description and features; "notebook" names the module's
+Jupyter notebook, if it has one.
+
+Loading checks the manifest (unique ids, known prerequisites, no cycles,
+no prerequisite from a later phase) and precomputes a lookup table by id,
+a topological order of the prerequisite graph (manifest order wherever
+the graph allows it) and the modules of each phase. Every consumer reads
+this catalog:
+
+- create_module_placeholders.py renders the placeholder pages
+- validate_setup.py checks that every module page and notebook exists
+- cohort_analytics.py and render_snapshot.py get phases, names and pages
+- the dashboard loads the same tables from assets/js/modules.js, which
+  this script compiles (build_assets.py compiles a fresh copy into
+  every build)
+
+Usage: python module_catalog.py [--check]
+"""
+
+import os
+import sys
+import json
+import heapq
+import argparse
+from functools import lru_cache
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MANIFEST = os.path.join(ROOT, 'modules.json')
+SCRIPT = os.path.join('assets', 'js', 'modules.js')
+
+REQUIRED_FIELDS = ('id', 'title', 'icon', 'page')
+
+# Fields the dashboard needs; descriptions and features stay out of the script
+SCRIPT_FIELDS = ('title', 'icon', 'page', 'notebook', 'phase', 'prerequisites')
+
+SCRIPT_HEADER = "// Generated by module_catalog.py from modules.json; edit modules.json instead\n"
+
+class CatalogError(ValueError):
+    """Raised for a manifest that cannot be compiled"""
+
+class Catalog:
+    """Modules by id, in topological order, grouped by phase"""
+
+    def __init__(self, modules):
+        self.modules = {module['id']: module for module in modules}
+        self.order = topological_order(modules)
+        self.phases = group_phases(self.modules, self.order)
+
+    def __getitem__(self, module_id):
+        return self.modules[module_id]
+
+    def __contains__(self, module_id):
+        return module_id in self.modules
+
+    def __iter__(self):
+        """Modules in topological order"""
+        return (self.modules[module_id] for module_id in self.order)
+
+    def __len__(self):
+        return len(self.order)
+
+    def name(self, module_id):
+        return self.modules[module_id]['title'] if module_id in self.modules else module_id
+
+    def page(self, module_id):
+        return self.modules[module_id]['page'] if module_id in self.modules else f"{module_id}.html"
+
+    def unlocked(self, module_id, completed):
+        """Whether every prerequisite of a module is in the completed set"""
+        return all(required in completed for required in self.modules[module_id]['prerequisites'])
+
+def check_modules(modules):
+    """Validate manifest entries and fill in defaults; returns them in manifest order"""
+    if not isinstance(modules, list) or not modules:
+        raise CatalogError("modules.json needs a non-empty 'modules' list")
+
+    seen = {}
+    for position, module in enumerate(modules):
+        if not isinstance(module, dict):
+            raise CatalogError(f"module #{position + 1} is not an object")
+        missing = [field for field in REQUIRED_FIELDS if not module.get(field)]
+        if missing:
+            raise CatalogError(f"module {module.get('id', f'#{position + 1}')} lacks {', '.join(missing)}")
+        if module['id'] in seen:
+            raise CatalogError(f"duplicate module id {module['id']}")
+        module.setdefault('prerequisites', [])
+        if module.get('placeholder'):
+            module.setdefault('description', '')
+            module.setdefault('features', [])
+        seen[module['id']] = module
+
+    for module in modules:
+        unknown = [required for required in module['prerequisites'] if required not in seen]
+        if unknown:
+            raise CatalogError(f"module {module['id']} requires unknown {', '.join(unknown)}")
+    return modules
+
+def topological_order(modules):
+    """Kahn's algorithm; ties go to the module listed first in the manifest"""
+    position = {module['id']: index for index, module in enumerate(modules)}
+    waiting = {module['id']: len(set(module['prerequisites'])) for module in modules}
+    dependents = {module['id']: [] for module in modules}
+    for module in modules:
+        for required in set(module['prerequisites']):
+            dependents[required].append(module['id'])
+
+    ready = [position[module_id] for module_id, count in waiting.items() if count == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        module_id = modules[heapq.heappop(ready)]['id']
+        order.append(module_id)
+        for dependent in dependents[module_id]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                heapq.heappush(ready, position[dependent])
+
+    if len(order) != len(modules):
+        cycle = sorted(module_id for module_id, count in waiting.items() if count)
+        raise CatalogError(f"prerequisite cycle among {', '.join(cycle)}")
+    return order
+
+def group_phases(modules, order):
+    """Module ids of each phase, phase 1 first
+
+    A module without a phase goes into the phase after its latest
+    prerequisite. Phases must be numbered 1..N without gaps.
+    """
+    for module_id in order:
+        module = modules[module_id]
+        earliest = max((modules[required]['phase'] for required in module['prerequisites']), default=1)
+        module.setdefault('phase', earliest + 1 if module['prerequisites'] else 1)
+        if module['phase'] < earliest:
+            raise CatalogError(f"module {module_id} (phase {module['phase']}) requires a module of phase {earliest}")
+
+    numbers = sorted({modules[module_id]['phase'] for module_id in order})
+    if numbers != list(range(1, len(numbers) + 1)):
+        raise CatalogError(f"phases must be numbered 1..{len(numbers)}, found {numbers}")
+    phases = [[] for _ in numbers]
+    for module_id in order:
+        phases[modules[module_id]['phase'] - 1].append(module_id)
+    return phases
+
+def read_catalog(path=MANIFEST):
+    """Compile a manifest into a catalog"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except ValueError as e:
+        raise CatalogError(f"{path} is not valid JSON: {e}")
+    return Catalog(check_modules(manifest.get('modules')))
+
+@lru_cache(maxsize=None)
+def load_catalog(path=MANIFEST):
+    """The catalog of a manifest, compiled once per process"""
+    return read_catalog(path)
+
+def compile_script(catalog):
+    """assets/js/modules.js: the lookup table, topological order and phases as MODULE_CATALOG"""
+    table = {
+        'order': catalog.order,
+        'phases': catalog.phases,
+        'modules': {module['id']: {field: module[field] for field in SCRIPT_FIELDS if field in module}
+                    for module in catalog}
+    }
+    data = json.dumps(table, separators=(',', ':'), ensure_ascii=False)
+    return f"{SCRIPT_HEADER}const MODULE_CATALOG = {data};\n"
+
+def write_script(output=SCRIPT, path=MANIFEST):
+    """Compile the manifest into the dashboard script; returns whether it changed"""
+    content = compile_script(load_catalog(path))
+    output_path = os.path.join(ROOT, output)
+    try:
+        with open(output_path, encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, output_path)
+    return True
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check modules.json and compile it for the dashboard")
+    parser.add_argument('--manifest', default=MANIFEST,
+                        help="module manifest (default: modules.json)")
+    parser.add_argument('--output', default=SCRIPT,
+                        help=f"script to write (default: {SCRIPT})")
+    parser.add_argument('--check', action='store_true',
+                        help="only verify that the script is up to date (for CI)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    try:
+        catalog = load_catalog(args.manifest)
+        if args.check:
+            with open(os.path.join(ROOT, args.output), encoding='utf-8') as f:
+                current = f.read() == compile_script(catalog)
+            if not current:
+                print(f"❌ {args.output} is out of date; run: python module_catalog.py")
+                sys.exit(1)
+            print(f"✅ {args.output} matches modules.json")
+            return
+        written = write_script(args.output, args.manifest)
+    except (OSError, CatalogError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"📚 {len(catalog)} modules in {len(catalog.phases)} phases")
+    print(f"✅ Wrote {args.output}" if written else f"ℹ️  {args.output} is up to date")
+
+if __name__ == "__main__":
+    main()
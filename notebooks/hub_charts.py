@@ -0,0 +1,109 @@
+"""
+AI Learning Hub - Notebook Chart Helper
+Shows plotly figures without embedding plotly.js in every output
+
+`fig.show()` in a notebook inlines the whole plotly.js bundle (several MB)
+into each figure's output, so saved notebooks and exported pages grow by
+megabytes per chart. `show(fig)` instead:
+
+- embeds only the figure data: JupyterLab draws it with its built-in
+  plotly renderer, and exported pages load plotly.js once per page from a
+  URL (the CDN, or a local copy set with HUB_PLOTLY_JS)
+- renders figures with more data than MAX_INTERACTIVE_BYTES, or every
+  figure when HUB_CHARTS=static, as a static SVG/PNG image (needs kaleido;
+  without it the figure stays interactive)
+- caches static images by a hash of the figure on disk in .chart_cache/,
+  so re-running a notebook does not render them again
+
+Usage in a notebook:
+
+    from hub_charts import show
+    show(fig)
+"""
+
+import os
+import json
+import uuid
+import hashlib
+
+# Figures whose JSON is larger than this are shown as static images
+MAX_INTERACTIVE_BYTES = 512 * 1024
+
+CACHE_DIR = '.chart_cache'
+
+# interactive, static or auto (by size)
+MODE = os.environ.get('HUB_CHARTS', 'auto')
+
+def plotly_js_url():
+    """Where plotly.js is loaded from: HUB_PLOTLY_JS, or the CDN build matching plotly"""
+    if os.environ.get('HUB_PLOTLY_JS'):
+        return os.environ['HUB_PLOTLY_JS']
+    from plotly.offline import get_plotlyjs_version
+    return f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+def figure_key(spec, *options):
+    return hashlib.sha256('\0'.join((spec,) + tuple(str(o) for o in options)).encode('utf-8')).hexdigest()[:16]
+
+def loader_html():
+    """A script tag that loads plotly.js unless the page already has it"""
+    url = plotly_js_url()
+    return (f'<script>if (!window.Plotly && !document.querySelector(\'script[src="{url}"]\')) {{'
+            f'var s = document.createElement("script"); s.src = "{url}"; document.head.appendChild(s);}}</script>')
+
+def interactive_html(spec):
+    """Figure div plus a small script that draws it once plotly.js has loaded"""
+    div_id = f"hub-chart-{uuid.uuid4().hex[:12]}"
+    # "</" is escaped so the figure data cannot close the script element
+    data = spec.replace('</', '<\\/')
+    return (f'<div id="{div_id}" class="hub-chart"></div>'
+            f'<script>(function draw() {{'
+            f'if (!window.Plotly) {{ return setTimeout(draw, 50); }}'
+            f'var fig = {data};'
+            f'Plotly.newPlot("{div_id}", fig.data, fig.layout || {{}}, {{responsive: true}});'
+            f'}})();</script>')
+
+def static_image(fig, spec, fmt):
+    """Render through kaleido, cached on disk; returns bytes or None without kaleido"""
+    path = os.path.join(CACHE_DIR, f"{figure_key(spec, fmt)}.{fmt}")
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    try:
+        image = fig.to_image(format=fmt)
+    except (ImportError, ValueError, RuntimeError):
+        return None
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(image)
+    return image
+
+def choose_renderer(spec, static=None):
+    if static is not None:
+        return 'static' if static else 'interactive'
+    if MODE in ('static', 'interactive'):
+        return MODE
+    return 'static' if len(spec) > MAX_INTERACTIVE_BYTES else 'interactive'
+
+def show(fig, static=None, fmt='svg'):
+    """Display a plotly figure the light way
+
+    static=True/False forces a renderer; fmt is 'svg' or 'png' for static output.
+    """
+    from IPython.display import display, SVG, Image
+
+    spec = fig.to_json()
+    renderer = choose_renderer(spec, static)
+
+    if renderer == 'static':
+        image = static_image(fig, spec, fmt)
+        if image is not None:
+            display(SVG(image) if fmt == 'svg' else Image(image))
+            return
+        # No kaleido: fall through to the interactive view
+
+    display({
+        # JupyterLab renders this itself, without running any script
+        'application/vnd.plotly.v1+json': json.loads(spec),
+        # nbconvert pages and other frontends use the HTML
+        'text/html': loader_html() + interactive_html(spec)
+    }, raw=True)
@@ -0,0 +1,426 @@
+"""
+AI Learning Hub - Notebook Quiz Engine
+Spaced-repetition quizzes over question banks of any size
+
+Question banks are JSON files (quizzes/*.json) that stay easy to edit.
+On first use a bank is compiled into a compressed columnar NumPy file in
+.hub_quiz/: all strings in one UTF-8 buffer plus integer offset columns.
+Later runs load only that file, and a question's text is only decoded
+when it is shown, so banks with thousands of questions open instantly.
+
+Each round draws its questions with one vectorized weighted sample over
+the whole bank. Questions answered wrongly come back more often, ones
+answered correctly less often, and ones seen a moment ago are held back.
+The answer history is kept in .hub_quiz/ as well.
+
+The quiz widgets are built once and updated in place for every question
+and round. Round scores are recorded in the dashboard's progress store
+(see progress_store.py) when one is found.
+
+Usage in a notebook:
+
+    from hub_quiz import Quiz
+    Quiz('quizzes/ai-fundamentals.json').start()
+"""
+
+import os
+import sys
+import json
+import time
+import secrets
+import hashlib
+import argparse
+from html import escape
+from datetime import datetime, timezone
+
+import numpy as np
+
+STATE_DIR = '.hub_quiz'
+
+DEFAULT_ROUND_SIZE = 5
+
+# Weight of a question never answered; answered ones start at 1 and go up
+# with every mistake and down with every correct answer
+UNSEEN_WEIGHT = 1.5
+MISTAKE_WEIGHT = 2.0
+MIN_WEIGHT = 0.05
+
+# Questions answered within about this many seconds are unlikely to come back
+RECENT_SECONDS = 600
+
+# The hub checkout, where progress_store.py lives; jupyter_pool.py sets
+# HUB_ROOT, as learner workspaces hold only a copy of the notebooks
+HUB_ROOT = os.environ.get('HUB_ROOT') or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Progress store the dashboard syncs to (serve.py --progress-db); override
+# with HUB_PROGRESS_DB, and pick the learner with HUB_LEARNER
+PROGRESS_DB = os.environ.get('HUB_PROGRESS_DB', os.path.join(HUB_ROOT, '.cache', 'progress.db'))
+
+def question_id(question):
+    """Stable id of a question, so history survives edits to the rest of the bank"""
+    return hashlib.sha1(question.encode('utf-8')).hexdigest()[:16].encode('ascii')
+
+def compile_bank(source, target):
+    """Compile a JSON question bank into the columnar .npz format"""
+    with open(source, encoding='utf-8') as f:
+        questions = json.load(f)
+    title = os.path.splitext(os.path.basename(source))[0]
+    if isinstance(questions, dict):
+        title = questions.get('title', title)
+        questions = questions['questions']
+
+    strings, bounds = [], [0]
+
+    def add(text):
+        data = str(text).encode('utf-8')
+        strings.append(data)
+        bounds.append(bounds[-1] + len(data))
+        return len(strings) - 1
+
+    columns = {name: [] for name in ('question', 'explanation', 'topic', 'options', 'option_count', 'correct')}
+    for number, q in enumerate(questions):
+        if not 0 <= q['correct'] < len(q['options']):
+            raise ValueError(f"question {number + 1}: correct answer {q['correct']} is not an option")
+        columns['question'].append(add(q['question']))
+        columns['explanation'].append(add(q.get('explanation', '')))
+        columns['topic'].append(add(q.get('topic', '')))
+        columns['options'].append(len(strings))
+        for option in q['options']:
+            add(option)
+        columns['option_count'].append(len(q['options']))
+        columns['correct'].append(q['correct'])
+
+    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+    tmp_path = f"{target}.tmp.npz"
+    np.savez_compressed(
+        tmp_path,
+        title=np.array(title.encode('utf-8')),
+        ids=np.array([question_id(q['question']) for q in questions], dtype='S16'),
+        text=np.frombuffer(b''.join(strings), dtype=np.uint8),
+        bounds=np.array(bounds, dtype=np.int64),
+        **{name: np.array(values, dtype=np.int8 if name in ('option_count', 'correct') else np.int32)
+           for name, values in columns.items()})
+    os.replace(tmp_path, target)
+    return len(questions)
+
+class QuestionBank:
+    """A compiled question bank, loaded on first use"""
+
+    def __init__(self, source):
+        self.source = source
+        self.name = os.path.splitext(os.path.basename(source))[0]
+        self.path = os.path.join(STATE_DIR, f"{self.name}.npz")
+        self.columns = None
+
+    def load(self):
+        if self.columns is None:
+            # Recompile when the JSON source is newer than the compiled bank
+            if (not os.path.exists(self.path) or
+                    (os.path.exists(self.source) and os.path.getmtime(self.source) > os.path.getmtime(self.path))):
+                compile_bank(self.source, self.path)
+            with np.load(self.path) as data:
+                self.columns = {name: data[name] for name in data.files}
+            self.text = self.columns['text'].tobytes()
+            self.title = self.columns['title'].item().decode('utf-8')
+        return self.columns
+
+    def __len__(self):
+        return len(self.load()['ids'])
+
+    @property
+    def ids(self):
+        return self.load()['ids']
+
+    def string(self, index):
+        bounds = self.columns['bounds']
+        return self.text[bounds[index]:bounds[index + 1]].decode('utf-8')
+
+    def question(self, number):
+        """Decode one question into a dict"""
+        columns = self.load()
+        first = int(columns['options'][number])
+        return {
+            'question': self.string(columns['question'][number]),
+            'options': [self.string(first + i) for i in range(int(columns['option_count'][number]))],
+            'correct': int(columns['correct'][number]),
+            'explanation': self.string(columns['explanation'][number]),
+            'topic': self.string(columns['topic'][number])
+        }
+
+class History:
+    """Per-question answer counts for one bank, aligned to the bank's order"""
+
+    def __init__(self, bank):
+        self.path = os.path.join(STATE_DIR, f"{bank.name}.history.npz")
+        count = len(bank)
+        self.ids = bank.ids
+        self.seen = np.zeros(count, dtype=np.int32)
+        self.wrong = np.zeros(count, dtype=np.int32)
+        self.last = np.zeros(count, dtype=np.float64)
+        if os.path.exists(self.path):
+            self.merge()
+
+    def merge(self):
+        """Map saved rows onto the current bank by question id"""
+        with np.load(self.path) as saved:
+            saved_ids, seen, wrong, last = saved['ids'], saved['seen'], saved['wrong'], saved['last']
+        order = np.argsort(saved_ids)
+        sorted_ids = saved_ids[order]
+        position = np.minimum(np.searchsorted(sorted_ids, self.ids), len(sorted_ids) - 1)
+        found = sorted_ids[position] == self.ids if len(sorted_ids) else np.zeros(len(self.ids), dtype=bool)
+        rows = order[position[found]]
+        self.seen[found], self.wrong[found], self.last[found] = seen[rows], wrong[rows], last[rows]
+
+    def record(self, number, correct):
+        self.seen[number] += 1
+        self.wrong[number] += 0 if correct else 1
+        self.last[number] = time.time()
+
+    def weights(self, now=None):
+        """Sampling weight of every question"""
+        now = time.time() if now is None else now
+        right = self.seen - self.wrong
+        weights = (1 + MISTAKE_WEIGHT * self.wrong) / (1 + right)
+        weights = np.where(self.seen == 0, UNSEEN_WEIGHT, weights)
+        recency = 1 - np.exp(-(now - self.last) / RECENT_SECONDS)
+        return np.maximum(weights * np.where(self.seen == 0, 1.0, recency), MIN_WEIGHT)
+
+    def save(self):
+        os.makedirs(STATE_DIR, exist_ok=True)
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(tmp_path, ids=self.ids, seen=self.seen, wrong=self.wrong, last=self.last)
+        os.replace(tmp_path, self.path)
+
+def weighted_sample(weights, size, rng):
+    """Sample without replacement in proportion to weights (Efraimidis-Spirakis)
+
+    Each question gets the key log(u) / weight and the largest keys win, so
+    a whole round is drawn with one vectorized pass over the bank.
+    """
+    size = min(size, len(weights))
+    keys = np.log(rng.random(len(weights))) / weights
+    chosen = np.argpartition(-keys, size - 1)[:size]
+    return chosen[np.argsort(-keys[chosen])]
+
+def record_score(bank_name, title, score, total, learner=None, db=PROGRESS_DB):
+    """Add the round to the learner's progress; returns the learner or None
+
+    The learner is HUB_LEARNER, or the only learner in the store.
+    """
+    if not os.path.exists(db):
+        return None
+    sys.path.insert(0, HUB_ROOT)
+    try:
+        from progress_store import ProgressStore
+    except ImportError:
+        return None
+    finally:
+        sys.path.pop(0)
+
+    store = ProgressStore(db)
+    try:
+        learners = store.learners()
+        learner = learner or os.environ.get('HUB_LEARNER') or (learners[0] if len(learners) == 1 else None)
+        if learner is None:
+            return None
+        now = datetime.now(timezone.utc)
+        scores = dict(store.document(learner).get('quizScores') or {})
+        previous = scores.get(bank_name, {})
+        percentage = round(100 * score / total) if total else 0
+        scores[bank_name] = {
+            'last': percentage,
+            'best': max(percentage, previous.get('best', 0)),
+            'rounds': previous.get('rounds', 0) + 1,
+            'date': now.isoformat()
+        }
+        ts = now.timestamp()
+        # The id is the record's sync key; the suffix keeps activities
+        # created in the same millisecond apart
+        activity_id = f"activity-{int(ts * 1000)}-{secrets.token_hex(3)}"
+        store.submit(learner, [
+            {'key': 'quizScores', 'value': scores, 'ts': ts},
+            {'key': f"activities/{activity_id}", 'ts': ts, 'value': {
+                'id': activity_id,
+                'text': f"Quiz: {title} {score}/{total} ({percentage}%)",
+                'date': now.isoformat().replace('+00:00', 'Z'),
+                'type': 'quiz'
+            }}
+        ]).result()
+        return learner
+    finally:
+        store.close()
+
+class Quiz:
+    """Rounds of questions drawn from a bank, shown in reusable widgets"""
+
+    def __init__(self, source, size=DEFAULT_ROUND_SIZE, seed=None, learner=None):
+        self.bank = QuestionBank(source)
+        self.size = size
+        self.learner = learner
+        self.rng = np.random.default_rng(seed)
+        self.history = None
+        self.widgets = None
+        self.round = []
+        self.position = 0
+        self.score = 0
+
+    def new_round(self):
+        if self.history is None:
+            self.history = History(self.bank)
+        self.round = weighted_sample(self.history.weights(), self.size, self.rng).tolist()
+        self.position = 0
+        self.score = 0
+
+    @property
+    def current(self):
+        return self.bank.question(self.round[self.position])
+
+    def answer(self, choice):
+        """Score the current question; returns (correct, question)"""
+        question = self.current
+        correct = choice == question['correct']
+        self.score += int(correct)
+        self.history.record(self.round[self.position], correct)
+        return correct, question
+
+    def finish(self):
+        """Save the history and feed the round into the progress store"""
+        self.history.save()
+        try:
+            return record_score(self.bank.name, self.bank.title, self.score, len(self.round), self.learner)
+        except Exception:
+            # A missing or busy progress store must not break the quiz
+            return None
+
+    def verdict(self):
+        percentage = 100 * self.score / len(self.round)
+        if percentage >= 80:
+            return "🏆 Excellent! You have a strong understanding of these concepts."
+        if percentage >= 60:
+            return "👍 Good job! You're on the right track."
+        return "📚 Keep studying! Review the concepts and try again."
+
+    def start(self):
+        """Show the quiz: widgets when ipywidgets is available, text prompts otherwise"""
+        self.new_round()
+        try:
+            import ipywidgets  # noqa: F401
+        except ImportError:
+            return self.run_text()
+        from IPython.display import display
+        if self.widgets is None:
+            self.build_widgets()
+        self.show_question()
+        display(self.widgets['box'])
+
+    # Widget interface: built once, then only values change
+
+    def build_widgets(self):
+        import ipywidgets as widgets
+
+        w = {
+            'status': widgets.HTML(),
+            'question': widgets.HTML(),
+            'options': widgets.RadioButtons(options=[], value=None, layout=widgets.Layout(width='auto')),
+            'submit': widgets.Button(description='Check answer', button_style='primary'),
+            'next': widgets.Button(description='Next question'),
+            'feedback': widgets.HTML()
+        }
+        w['submit'].on_click(lambda _: self.on_submit())
+        w['next'].on_click(lambda _: self.on_next())
+        w['box'] = widgets.VBox([w['status'], w['question'], w['options'],
+                                 widgets.HBox([w['submit'], w['next']]), w['feedback']])
+        self.widgets = w
+
+    def show_question(self):
+        w = self.widgets
+        question = self.current
+        w['status'].value = (f"<b>🎯 Question {self.position + 1}/{len(self.round)}</b> · "
+                             f"Score: {self.score}/{self.position}")
+        w['question'].value = f"<p>❓ {escape(question['question'])}</p>"
+        w['options'].options = [(f"{chr(65 + i)}. {option}", i) for i, option in enumerate(question['options'])]
+        w['options'].value = None
+        w['options'].disabled = False
+        w['feedback'].value = ''
+        w['submit'].disabled = False
+        w['next'].disabled = True
+        w['next'].description = 'Next question'
+
+    def on_submit(self):
+        w = self.widgets
+        if w['options'].value is None:
+            w['feedback'].value = "<p>Pick an answer first.</p>"
+            return
+        correct, question = self.answer(w['options'].value)
+        result = ("✅ Correct!" if correct else
+                  f"❌ Incorrect! The correct answer is: {escape(question['options'][question['correct']])}")
+        w['feedback'].value = f"<p>{result}</p><p>💡 {escape(question['explanation'])}</p>"
+        w['options'].disabled = True
+        w['submit'].disabled = True
+        w['next'].disabled = False
+        last = self.position + 1 == len(self.round)
+        w['next'].description = 'See results' if last else 'Next question'
+
+    def on_next(self):
+        w = self.widgets
+        if w['next'].description == 'New round':
+            self.new_round()
+            self.show_question()
+            return
+        self.position += 1
+        if self.position < len(self.round):
+            self.show_question()
+            return
+
+        learner = self.finish()
+        total = len(self.round)
+        w['status'].value = f"<b>🎉 Quiz Complete!</b> Final Score: {self.score}/{total} ({100 * self.score / total:.1f}%)"
+        w['question'].value = f"<p>{self.verdict()}</p>"
+        w['options'].options = []
+        w['feedback'].value = (f"<p>💾 Saved to the progress of {escape(str(learner))}.</p>" if learner else
+                               "<p>Questions you missed will come back more often.</p>")
+        w['submit'].disabled = True
+        w['next'].description = 'New round'
+
+    # Text interface for environments without ipywidgets
+
+    def run_text(self):
+        letters = [chr(65 + i) for i in range(26)]
+        while self.position < len(self.round):
+            question = self.current
+            print(f"\n🎯 Question {self.position + 1}/{len(self.round)}")
+            print(f"Score: {self.score}/{self.position}\n")
+            print(f"❓ {question['question']}\n")
+            for i, option in enumerate(question['options']):
+                print(f"{letters[i]}. {option}")
+            choices = letters[:len(question['options'])]
+            answer = input("\nYour answer: ").strip().upper()
+            if answer not in choices:
+                print(f"Please enter one of {', '.join(choices)}")
+                continue
+            correct, question = self.answer(choices.index(answer))
+            print("\n✅ Correct!" if correct else
+                  f"\n❌ Incorrect!\nThe correct answer is: {question['options'][question['correct']]}")
+            print(f"💡 Explanation: {question['explanation']}")
+            self.position += 1
+
+        learner = self.finish()
+        total = len(self.round)
+        print(f"\n🎉 Quiz Complete!\nFinal Score: {self.score}/{total} ({100 * self.score / total:.1f}%)")
+        print(self.verdict())
+        if learner:
+            print(f"💾 Saved to the progress of {learner}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compile quiz banks into the columnar format")
+    parser.add_argument('banks', nargs='+', help="JSON question banks")
+    return parser.parse_args()
+
+def main():
+    for source in parse_args().banks:
+        bank = QuestionBank(source)
+        count = compile_bank(source, bank.path)
+        print(f"✅ {source}: {count} questions → {bank.path} ({os.path.getsize(bank.path) / 1024:.1f} KB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Startup Profiler
+Measures what a learner waits for before the first notebook cell finishes
+
+Three numbers are taken, each as the median of several fresh runs:
+
+    import     per-package import time from `python -X importtime`, for each
+               package on its own and for all of them in one process (what
+               the notebook's Environment Test cell actually pays)
+    kernel     time until a new kernel answers
+    first_cell wall time of the first code cell of the notebook
+
+Results are saved as a JSON baseline together with the installed package
+versions. The next run is compared against it, and every metric that got
+slower by more than --threshold (and at least --min-delta seconds) is
+flagged together with the package versions that changed in between.
+
+Usage: python profile_startup.py [--baseline startup_baseline.json] [--repeat 3]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import statistics
+import subprocess
+
+from run_notebooks import run_cell, DEFAULT_CELL_TIMEOUT, KERNEL_STARTUP_TIMEOUT
+
+DEFAULT_BASELINE = 'startup_baseline.json'
+DEFAULT_NOTEBOOK = 'notebooks/01_AI_Fundamentals.ipynb'
+
+# Imported by the notebook's Environment Test cell and by validate_setup.py --deep
+PACKAGES = ['numpy', 'pandas', 'matplotlib', 'plotly', 'ipywidgets', 'IPython']
+
+DEFAULT_REPEAT = 3
+
+# A metric regresses when it is this much slower (relative and absolute)
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_MIN_DELTA = 0.05
+
+# Modules listed as the heaviest imports of the combined run
+TOP_MODULES = 15
+
+VERSIONS_SCRIPT = """
+import sys, json, importlib.metadata
+versions = {}
+for name in sys.argv[1:]:
+    try:
+        versions[name] = importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        versions[name] = None
+print(json.dumps(versions))
+"""
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into {module: (self_s, cumulative_s)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].strip()
+        modules[name] = (int(fields[0]) / 1e6, int(fields[1]) / 1e6)
+    return modules
+
+def time_import(python, packages):
+    """Import packages in a fresh interpreter; returns (wall_s, {module: (self_s, cumulative_s)})"""
+    code = '; '.join(f"import {package}" for package in packages)
+    start = time.perf_counter()
+    result = subprocess.run([python, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed'
+        raise RuntimeError(error)
+    return wall, parse_importtime(result.stderr)
+
+def profile_imports(python, packages, repeat):
+    """Median import times per package and for all packages together"""
+    imports, metrics, errors = {}, {}, {}
+
+    for package in packages:
+        runs = []
+        try:
+            for _ in range(repeat):
+                wall, modules = time_import(python, [package])
+                runs.append((wall, modules.get(package, (0, wall))[1]))
+        except RuntimeError as e:
+            errors[package] = str(e)
+            continue
+        imports[package] = {
+            'cumulative_s': round(statistics.median(cumulative for _, cumulative in runs), 4),
+            'wall_s': round(statistics.median(wall for wall, _ in runs), 4)
+        }
+        metrics[f"import.{package}"] = imports[package]['cumulative_s']
+
+    available = [package for package in packages if package in imports]
+    heaviest = []
+    if available:
+        runs = [time_import(python, available) for _ in range(repeat)]
+        metrics['import.all'] = round(statistics.median(wall for wall, _ in runs), 4)
+        # Self time per module, median across runs, to show where the time goes
+        self_times = {}
+        for _, modules in runs:
+            for module, (self_s, _) in modules.items():
+                self_times.setdefault(module, []).append(self_s)
+        heaviest = sorted(((module, round(statistics.median(times), 4)) for module, times in self_times.items()),
+                          key=lambda item: item[1], reverse=True)[:TOP_MODULES]
+    return imports, metrics, heaviest, errors
+
+def first_code_cell(notebook):
+    import nbformat
+
+    nb = nbformat.read(notebook, as_version=4)
+    kernel_name = nb.metadata.get('kernelspec', {}).get('name', 'python3')
+    source = next((cell.source for cell in nb.cells if cell.cell_type == 'code' and cell.source.strip()), None)
+    return kernel_name, source
+
+def profile_kernel(notebook, repeat, cell_timeout=DEFAULT_CELL_TIMEOUT):
+    """Median kernel startup and first-cell latency over fresh kernels"""
+    from jupyter_client.manager import start_new_kernel
+
+    kernel_name, source = first_code_cell(notebook)
+    cwd = os.path.dirname(os.path.abspath(notebook))
+    startups, first_cells, status = [], [], 'ok'
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        manager, client = start_new_kernel(kernel_name=kernel_name, cwd=cwd,
+                                           startup_timeout=KERNEL_STARTUP_TIMEOUT)
+        startups.append(time.perf_counter() - start)
+        try:
+            if source is not None:
+                cell_start = time.perf_counter()
+                cell_status, _, _ = run_cell(client, source, cell_timeout)
+                first_cells.append(time.perf_counter() - cell_start)
+                if cell_status != 'ok':
+                    status = cell_status
+        finally:
+            client.stop_channels()
+            manager.shutdown_kernel(now=True)
+
+    metrics = {'kernel.startup': round(statistics.median(startups), 4)}
+    if first_cells:
+        metrics['kernel.first_cell'] = round(statistics.median(first_cells), 4)
+    return metrics, status
+
+def package_versions(python, packages):
+    result = subprocess.run([python, '-c', VERSIONS_SCRIPT, *packages], capture_output=True, text=True)
+    try:
+        return json.loads(result.stdout)
+    except ValueError:
+        return {}
+
+def requirements_digest(path='requirements.txt'):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+    except OSError:
+        return None
+
+def compare(current, previous, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    """Metrics that got slower (regressions) or faster, as (name, old, new) tuples"""
+    regressions, improvements = [], []
+    for name, new in current['metrics'].items():
+        old = previous.get('metrics', {}).get(name)
+        if old is None:
+            continue
+        if new - old >= min_delta and new > old * (1 + threshold):
+            regressions.append((name, old, new))
+        elif old - new >= min_delta and new < old * (1 - threshold):
+            improvements.append((name, old, new))
+    return regressions, improvements
+
+def changed_versions(current, previous):
+    old_versions = previous.get('versions', {})
+    return [(package, old_versions.get(package), version)
+            for package, version in current['versions'].items()
+            if package in old_versions and old_versions[package] != version]
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        print(f"⚠️  Ignoring unreadable baseline {path}")
+        return None
+
+def save_baseline(report, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, path)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Profile import, kernel startup and first-cell latency")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help=f"JSON file with the previous run; updated after each run (default: {DEFAULT_BASELINE})")
+    parser.add_argument('--notebook', default=DEFAULT_NOTEBOOK,
+                        help=f"notebook whose first code cell is timed (default: {DEFAULT_NOTEBOOK})")
+    parser.add_argument('--python', default=sys.executable,
+                        help="interpreter to profile imports in, e.g. ai_env/bin/python (default: this one)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f"fresh runs per measurement; the median is kept (default: {DEFAULT_REPEAT})")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"relative slowdown reported as a regression (default: {DEFAULT_THRESHOLD:.0%}%)")
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help=f"smallest slowdown in seconds reported as a regression (default: {DEFAULT_MIN_DELTA})")
+    parser.add_argument('--skip-kernel', action='store_true',
+                        help="only profile imports, without starting kernels")
+    parser.add_argument('--no-save', action='store_true',
+                        help="compare against the baseline without replacing it")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="exit with status 1 when a regression is found (for CI)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    repeat = max(1, args.repeat)
+
+    print(f"⏱️  Profiling imports ({repeat} run(s) each)...")
+    imports, metrics, heaviest, errors = profile_imports(args.python, PACKAGES, repeat)
+    for package in PACKAGES:
+        if package in errors:
+            print(f"❌ {package:<12} {errors[package]}")
+        else:
+            print(f"✅ {package:<12} {imports[package]['cumulative_s']:6.2f}s")
+    if 'import.all' in metrics:
+        print(f"📦 all together {metrics['import.all']:6.2f}s")
+        print("\n🐢 Heaviest modules (self time):")
+        for module, self_s in heaviest:
+            print(f"   {self_s * 1000:8.1f} ms  {module}")
+
+    kernel_status = None
+    if not args.skip_kernel:
+        print(f"\n⏱️  Profiling kernel startup and first cell of {args.notebook}...")
+        try:
+            kernel_metrics, kernel_status = profile_kernel(args.notebook, repeat)
+        except Exception as e:
+            print(f"❌ Kernel profiling failed: {type(e).__name__}: {e}")
+        else:
+            metrics.update(kernel_metrics)
+            print(f"✅ kernel startup {kernel_metrics['kernel.startup']:6.2f}s")
+            if 'kernel.first_cell' in kernel_metrics:
+                icon = '✅' if kernel_status == 'ok' else '⚠️ '
+                print(f"{icon} first cell     {kernel_metrics['kernel.first_cell']:6.2f}s"
+                      f"{'' if kernel_status == 'ok' else f' ({kernel_status})'}")
+
+    report = {
+        'generated_at': time.time(),
+        'python': platform.python_version(),
+        'interpreter': args.python,
+        'platform': platform.platform(),
+        'requirements': requirements_digest(),
+        'repeat': repeat,
+        'versions': package_versions(args.python, PACKAGES),
+        'metrics': metrics,
+        'imports': imports,
+        'heaviest_modules': heaviest,
+        'errors': errors
+    }
+
+    regressions = []
+    previous = load_baseline(args.baseline)
+    if previous:
+        regressions, improvements = compare(report, previous, args.threshold, args.min_delta)
+        print(f"\n📊 Compared with {args.baseline}:")
+        for name, old, new in regressions:
+            print(f"⚠️  {name}: {old:.2f}s → {new:.2f}s (+{new - old:.2f}s)")
+        for name, old, new in improvements:
+            print(f"🚀 {name}: {old:.2f}s → {new:.2f}s ({new - old:.2f}s)")
+        if not regressions and not improvements:
+            print("✅ No significant change")
+        changes = changed_versions(report, previous)
+        if changes:
+            print("\n📦 Package versions changed since then:")
+            for package, old, new in changes:
+                print(f"   {package}: {old} → {new}")
+        if previous.get('requirements') != report['requirements']:
+            print("📝 requirements.txt changed since then")
+
+    if args.no_save:
+        print(f"\n📄 Baseline {args.baseline} left unchanged")
+    else:
+        save_baseline(report, args.baseline)
+        print(f"\n📄 Baseline saved to {args.baseline}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
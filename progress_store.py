@@ -0,0 +1,518 @@
+"""
+AI Learning Hub - Progress Store
+Server-side copy of each learner's dashboard progress
+
+The dashboard keeps progress in one localStorage blob. This module keeps
+the same data in an embedded SQLite database (WAL mode) split into one
+row per record, so a sync only sends and writes the records that
+changed:
+
+    modules/<id>       one row per module
+    studyDays/<day>    one row per study day (count of module activities)
+    goals/<id>         one row per goal
+    activities/<id>    one row per activity
+    <field>            any other top-level field (streak, reminders, ...)
+
+Writes from all learners are coalesced by a single writer thread and
+committed together in one transaction every FLUSH_INTERVAL seconds.
+Later writes to the same record within a batch replace earlier ones.
+
+serve.py mounts the HTTP API from this module under /api/progress/.
+Run directly, it exports per-learner study rollups:
+
+Usage: python progress_store.py [--db .cache/progress.db] [--output rollups.json|rollups.csv]
+"""
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+import asyncio
+import sqlite3
+import operator
+import itertools
+import argparse
+import threading
+from datetime import date, timedelta
+from concurrent.futures import Future
+
+# Kept under .cache/, which serve.py never serves
+DEFAULT_DB = os.path.join('.cache', 'progress.db')
+
+# Seconds the writer waits to gather a batch before committing
+FLUSH_INTERVAL = 0.2
+
+# Largest sync request body accepted
+MAX_BODY_BYTES = 1024 * 1024
+
+# Fields stored as one row per record instead of as a single value;
+# keyed collections are objects, the others lists of records with an id
+COLLECTIONS = ('modules', 'studyDays', 'goals', 'activities')
+KEYED_COLLECTIONS = ('modules', 'studyDays')
+
+LEARNER_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# Version of the progress document layout, stored as its schemaVersion
+# field; older documents are upgraded by MIGRATIONS. Mirrored by
+# PROGRESS_SCHEMA_VERSION and migrateData() in assets/js/app.js.
+DOCUMENT_VERSION = 3
+
+MODULE_STATUSES = ('locked', 'not-started', 'in-progress', 'completed')
+MODULE_DEFAULTS = {'status': 'locked', 'progress': 0, 'timeSpent': 0, 'startDate': None, 'completedDate': None}
+DAY_KEY = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Record lists of a document and the name of one of their records
+RECORD_LISTS = {'goals': 'goal', 'activities': 'activity'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS learners (
+    learner TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS progress (
+    learner TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    updated_at REAL NOT NULL,
+    revision INTEGER NOT NULL,
+    PRIMARY KEY (learner, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS progress_revision ON progress (learner, revision);
+"""
+
+UPSERT_RECORD = ('INSERT INTO progress (learner, key, value, updated_at, revision) '
+                 'VALUES (?, ?, ?, ?, ?) '
+                 'ON CONFLICT (learner, key) DO UPDATE SET value = excluded.value, '
+                 'updated_at = excluded.updated_at, revision = excluded.revision')
+NEWER_ONLY = ' WHERE excluded.updated_at >= progress.updated_at'
+
+class InvalidRequest(ValueError):
+    """Raised for sync requests that do not follow the protocol"""
+
+class InvalidDocument(ValueError):
+    """Raised for progress documents that do not follow the schema"""
+
+def flatten(document):
+    """Split a progress document into {key: value} records"""
+    records = {}
+    for field, value in document.items():
+        if field in COLLECTIONS and isinstance(value, dict):
+            for record_id, record in value.items():
+                records[f"{field}/{record_id}"] = record
+        elif field in COLLECTIONS and isinstance(value, list):
+            for record in value:
+                records[f"{field}/{record['id']}"] = record
+        else:
+            records[field] = value
+    return records
+
+def assemble(records):
+    """Rebuild a progress document from {key: value} records"""
+    document = {'modules': {}, 'studyDays': {}, 'goals': [], 'activities': []}
+    for key, value in records.items():
+        field, _, record_id = key.partition('/')
+        if not record_id:
+            document[field] = value
+        elif field in KEYED_COLLECTIONS:
+            document[field][record_id] = value
+        else:
+            document.setdefault(field, []).append(value)
+    # Rows come back in key order; restore chronological order
+    document['goals'].sort(key=lambda g: g.get('createdDate') or '')
+    document['activities'].sort(key=lambda a: a.get('date') or '')
+    return document
+
+def study_days(document):
+    """Module activities per day as {'YYYY-MM-DD': count}
+
+    Uses the dashboard's study index when present; older documents only
+    have the activity log, bucketed here by UTC date.
+    """
+    if document.get('studyDays'):
+        return dict(document['studyDays'])
+    days = {}
+    for activity in document.get('activities', []):
+        if 'module' in activity.get('type', '') and activity.get('date'):
+            day = activity['date'][:10]
+            days[day] = days.get(day, 0) + 1
+    return days
+
+# Schema migrations: MIGRATIONS[n] upgrades a version n document to n + 1
+# in place. Every step leaves already-upgraded data alone.
+
+def add_study_days(document):
+    """1 -> 2: the study index, rebuilt from the activity log"""
+    if 'studyDays' not in document:
+        document['studyDays'] = study_days(document)
+
+def complete_records(document):
+    """2 -> 3: every module record has every field; goals and activities have unique ids"""
+    for record in (document.get('modules') or {}).values():
+        if isinstance(record, dict):
+            for field, default in MODULE_DEFAULTS.items():
+                record.setdefault(field, default)
+    for field, name in RECORD_LISTS.items():
+        ids = set()
+        for index, record in enumerate(document.get(field) or []):
+            if not isinstance(record, dict):
+                continue
+            if not record.get('id'):
+                record['id'] = f"{name}-legacy-{index}"
+            elif record['id'] in ids:
+                # Ids made from the same millisecond; the store would keep only one
+                record['id'] = f"{record['id']}-{index}"
+            ids.add(record['id'])
+
+MIGRATIONS = {1: add_study_days, 2: complete_records}
+
+def migrate(document):
+    """Upgrade a progress document to DOCUMENT_VERSION in place; returns its original version"""
+    version = document.get('schemaVersion', 1)
+    if not isinstance(version, int) or version < 1:
+        raise InvalidDocument(f"invalid schemaVersion {version!r}")
+    if version > DOCUMENT_VERSION:
+        raise InvalidDocument(f"schemaVersion {version} is newer than this tool ({DOCUMENT_VERSION})")
+    for step in range(version, DOCUMENT_VERSION):
+        MIGRATIONS[step](document)
+    document['schemaVersion'] = DOCUMENT_VERSION
+    return version
+
+def validate(document):
+    """Raise InvalidDocument unless a migrated document follows the schema"""
+    modules = document.get('modules', {})
+    if not isinstance(modules, dict):
+        raise InvalidDocument("'modules' must be an object")
+    for module_id, record in modules.items():
+        if not isinstance(record, dict):
+            raise InvalidDocument(f"module {module_id} is not an object")
+        if record.get('status') not in MODULE_STATUSES:
+            raise InvalidDocument(f"module {module_id} has unknown status {record.get('status')!r}")
+        for field in ('progress', 'timeSpent'):
+            value = record.get(field)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise InvalidDocument(f"module {module_id} has invalid {field} {value!r}")
+
+    days = document.get('studyDays', {})
+    if not isinstance(days, dict):
+        raise InvalidDocument("'studyDays' must be an object")
+    for day, count in days.items():
+        if not DAY_KEY.match(day) or isinstance(count, bool) or not isinstance(count, int) or count < 0:
+            raise InvalidDocument(f"invalid study day {day}: {count!r}")
+
+    for field, name in RECORD_LISTS.items():
+        records = document.get(field, [])
+        if not isinstance(records, list):
+            raise InvalidDocument(f"'{field}' must be a list")
+        ids = set()
+        for record in records:
+            if not isinstance(record, dict) or not isinstance(record.get('id'), str):
+                raise InvalidDocument(f"every entry of '{field}' needs a string id")
+            if record['id'] in ids:
+                raise InvalidDocument(f"duplicate {name} id {record['id']}")
+            ids.add(record['id'])
+
+def streaks(days, today=None):
+    """Current and longest runs of consecutive study days"""
+    today = today or date.today()
+    dates = sorted(date.fromisoformat(day) for day in days)
+    longest = run = 0
+    previous = None
+    for day in dates:
+        run = run + 1 if previous and day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+    # Same rule as the dashboard: a streak that ended yesterday is still alive
+    current = run if previous and today - previous <= timedelta(days=1) else 0
+    return current, longest
+
+def rollups(document, today=None):
+    """Study summary for one learner, matching the dashboard's calendar and streak"""
+    days = study_days(document)
+    current, longest = streaks(days, today)
+    modules = document.get('modules', {}).values()
+    return {
+        'study_days': len(days),
+        'first_study_day': min(days) if days else None,
+        'last_study_day': max(days) if days else None,
+        'current_streak': current,
+        'longest_streak': longest,
+        'modules_completed': sum(1 for m in modules if m.get('status') == 'completed'),
+        'hours': round(sum(m.get('timeSpent') or 0 for m in modules), 2),
+        'days': dict(sorted(days.items()))
+    }
+
+def next_revision(db, learner):
+    """Bump a learner's revision inside the current transaction and return it"""
+    db.execute('INSERT INTO learners (learner, revision) VALUES (?, 1) '
+               'ON CONFLICT (learner) DO UPDATE SET revision = revision + 1', (learner,))
+    return db.execute('SELECT revision FROM learners WHERE learner = ?', (learner,)).fetchone()[0]
+
+class ProgressStore:
+    """SQLite-backed progress records with a coalescing background writer"""
+
+    def __init__(self, path=DEFAULT_DB, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.local = threading.local()
+        self.pending = {}
+        self.waiters = []
+        self.condition = threading.Condition()
+        self.closed = False
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        db = self.connection()
+        db.executescript(SCHEMA)
+        db.commit()
+
+        self.writer = threading.Thread(target=self.write_loop, name='progress-writer', daemon=True)
+        self.writer.start()
+
+    def connection(self):
+        """Per-thread connection; WAL lets readers run while the writer commits"""
+        db = getattr(self.local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self.local.db = db
+        return db
+
+    def submit(self, learner, changes):
+        """Queue changes for the writer; returns a Future resolved with the new revision
+
+        `changes` is a list of {'key', 'value', 'ts'} dicts; a value of
+        None deletes the record.
+        """
+        future = Future()
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("progress store is closed")
+            for change in changes:
+                # Coalesce: a newer write to the same record replaces the queued one
+                queued = self.pending.get((learner, change['key']))
+                if queued is None or change['ts'] >= queued[1]:
+                    self.pending[(learner, change['key'])] = (change['value'], change['ts'])
+            self.waiters.append((learner, future))
+            self.condition.notify()
+        return future
+
+    def write_loop(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.waiters and not self.closed:
+                    self.condition.wait()
+                if self.closed and not self.pending and not self.waiters:
+                    return
+            # Let more requests join this batch before committing
+            time.sleep(self.flush_interval)
+            with self.condition:
+                batch, self.pending = self.pending, {}
+                waiters, self.waiters = self.waiters, []
+            try:
+                revisions = self.write_batch(batch)
+            except Exception as e:
+                for _, future in waiters:
+                    future.set_exception(e)
+                continue
+            for learner, future in waiters:
+                future.set_result(revisions.get(learner) or self.revision(learner))
+
+    def write_batch(self, batch):
+        """Commit a batch of coalesced changes in one transaction"""
+        db = self.connection()
+        by_learner = {}
+        for (learner, key), (value, ts) in batch.items():
+            by_learner.setdefault(learner, []).append((key, value, ts))
+
+        revisions = {}
+        with db:
+            for learner, rows in by_learner.items():
+                revision = next_revision(db, learner)
+                # Last writer wins by client timestamp, so a stale device cannot
+                # overwrite newer progress
+                db.executemany(
+                    UPSERT_RECORD + NEWER_ONLY,
+                    [(learner, key, None if value is None else json.dumps(value), ts, revision)
+                     for key, value, ts in rows])
+                revisions[learner] = revision
+        return revisions
+
+    def revision(self, learner):
+        row = self.connection().execute('SELECT revision FROM learners WHERE learner = ?',
+                                        (learner,)).fetchone()
+        return row[0] if row else 0
+
+    def changes_since(self, learner, since=0):
+        """Records changed after a revision, as {key: value}; deleted records map to None"""
+        rows = self.connection().execute(
+            'SELECT key, value FROM progress WHERE learner = ? AND revision > ?', (learner, since))
+        return {key: None if value is None else json.loads(value) for key, value in rows}
+
+    def document(self, learner):
+        """The learner's full progress document"""
+        records = {key: value for key, value in self.changes_since(learner).items() if value is not None}
+        return assemble(records)
+
+    def snapshot(self, learner):
+        """(revision, document) read in one transaction, so the revision covers exactly the document"""
+        db = self.connection()
+        db.execute('BEGIN')
+        try:
+            return self.revision(learner), self.document(learner)
+        finally:
+            db.rollback()
+
+    def learners(self):
+        return [row[0] for row in self.connection().execute('SELECT learner FROM learners ORDER BY learner')]
+
+    def import_documents(self, documents, replace=False):
+        """Write whole serialized documents in one transaction, bypassing the writer thread
+
+        `documents` is a list of (learner, {key: value JSON}, ts). A record
+        only overwrites an older one, unless `replace` is set: then each
+        document replaces the learner's data, and records missing from it
+        are deleted. Returns the number of records written.
+        """
+        db = self.connection()
+        written = 0
+        with db:
+            for learner, records, ts in documents:
+                revision = next_revision(db, learner)
+                if replace:
+                    db.execute('UPDATE progress SET value = NULL, updated_at = ?, revision = ? '
+                               'WHERE learner = ? AND value IS NOT NULL', (ts, revision, learner))
+                db.executemany(UPSERT_RECORD + ('' if replace else NEWER_ONLY),
+                               [(learner, key, value, ts, revision) for key, value in records.items()])
+                written += len(records)
+        return written
+
+    def iter_documents(self):
+        """Every learner's records as (learner, revision, {key: value JSON}), one learner at a time"""
+        db = self.connection()
+        # Both tables are read in primary key order and walked side by side,
+        # which is much cheaper than joining them row by row
+        revisions = db.execute('SELECT learner, revision FROM learners ORDER BY learner')
+        rows = db.execute('SELECT learner, key, value FROM progress WHERE value IS NOT NULL ORDER BY learner')
+        revision = 0
+        for learner, group in itertools.groupby(rows, key=operator.itemgetter(0)):
+            for candidate, revision in revisions:
+                if candidate == learner:
+                    break
+            yield learner, revision, {key: value for _, key, value in group}
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.writer.join()
+
+def parse_sync(body):
+    """Validate a sync request body"""
+    try:
+        request = json.loads(body or b'{}')
+    except ValueError:
+        raise InvalidRequest("body is not valid JSON")
+    if not isinstance(request, dict):
+        raise InvalidRequest("body must be a JSON object")
+
+    since = request.get('since', 0)
+    changes = request.get('changes', [])
+    if not isinstance(since, int) or not isinstance(changes, list):
+        raise InvalidRequest("'since' must be an integer and 'changes' a list")
+    now = time.time()
+    for change in changes:
+        if not isinstance(change, dict) or not isinstance(change.get('key'), str):
+            raise InvalidRequest("every change needs a string 'key'")
+        change.setdefault('value', None)
+        ts = change.get('ts', now)
+        change['ts'] = float(ts) if isinstance(ts, (int, float)) else now
+    return since, changes
+
+class ProgressAPI:
+    """HTTP endpoints for serve.py
+
+        GET  /api/progress/<learner>        full document and current revision
+        GET  /api/progress/<learner>/rollups  study days and streaks
+        POST /api/progress/<learner>/sync   {"since": rev, "changes": [...]}
+                                            -> {"revision": rev, "changes": {key: value}}
+    """
+
+    prefix = '/api/progress/'
+    max_body_bytes = MAX_BODY_BYTES
+
+    def __init__(self, store):
+        self.store = store
+
+    def matches(self, path):
+        return path.startswith(self.prefix)
+
+    async def handle(self, loop, method, path, body):
+        """Returns (status, JSON-serializable payload)"""
+        parts = path[len(self.prefix):].strip('/').split('/')
+        learner = parts[0]
+        if not LEARNER_ID.match(learner):
+            return 400, {'error': 'invalid learner id'}
+
+        if method == 'GET' and len(parts) == 1:
+            revision, document = await loop.run_in_executor(None, self.store.snapshot, learner)
+            return 200, {'revision': revision, 'progress': document}
+
+        if method == 'GET' and parts[1:] == ['rollups']:
+            document = await loop.run_in_executor(None, self.store.document, learner)
+            return 200, rollups(document)
+
+        if method == 'POST' and parts[1:] == ['sync']:
+            try:
+                since, changes = parse_sync(body)
+            except InvalidRequest as e:
+                return 400, {'error': str(e)}
+            if changes:
+                revision = await asyncio.wrap_future(self.store.submit(learner, changes))
+            else:
+                revision = await loop.run_in_executor(None, self.store.revision, learner)
+            updates = await loop.run_in_executor(None, self.store.changes_since, learner, since)
+            return 200, {'revision': revision, 'changes': updates}
+
+        return 404, {'error': 'not found'}
+
+def export_rollups(store, path):
+    """Write every learner's rollups as JSON, or one row per study day as CSV"""
+    learners = {learner: rollups(store.document(learner)) for learner in store.learners()}
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['learner', 'day', 'module_activities'])
+            for learner, summary in learners.items():
+                writer.writerows((learner, day, count) for day, count in summary['days'].items())
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'generated_at': time.time(), 'learners': learners}, f, indent=2)
+    return len(learners)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export study rollups from the progress store")
+    parser.add_argument('--db', default=DEFAULT_DB,
+                        help=f"progress database (default: {DEFAULT_DB})")
+    parser.add_argument('--output', default='progress_rollups.json',
+                        help="JSON summary, or CSV of study days when the name ends in .csv "
+                             "(default: progress_rollups.json)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    # Do not create an empty database for a mistyped path
+    if not os.path.exists(args.db):
+        print(f"❌ No progress database at {args.db}")
+        sys.exit(1)
+
+    store = ProgressStore(args.db)
+    try:
+        count = export_rollups(store, args.output)
+    finally:
+        store.close()
+    print(f"📄 Rollups for {count} learner(s): {args.output}")
+
+if __name__ == "__main__":
+    main()
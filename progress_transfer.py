@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Progress Transfer
+Streams learner progress between progress stores as newline-delimited JSON
+
+One learner per line:
+
+    {"learner": "alice", "revision": 12, "progress": {"schemaVersion": 3, "modules": {...}, ...}}
+
+    export   progress store -> NDJSON, one learner at a time in key order
+    import   NDJSON -> progress store; every document is migrated to the
+             current schema version and validated first
+    migrate  NDJSON -> NDJSON, migrating and validating without a store
+
+Nothing is ever loaded whole: lines are read in chunks, parsed, migrated,
+validated and serialized in worker processes, and at most a few chunks
+per worker are in flight. The results come back in input order; import
+writes each chunk in one transaction. Files ending in .gz are
+(de)compressed on the fly and `-` stands for stdin/stdout.
+
+Imported records only replace older ones (by the line's "updatedAt",
+or the import time), the same rule the sync API uses; --replace makes
+every imported document replace the learner's data instead. Bad lines
+are reported with their line numbers and skipped, and can be collected
+with --rejects.
+
+Usage: python progress_transfer.py export learners.ndjson.gz [--db .cache/progress.db]
+       python progress_transfer.py import learners.ndjson.gz [--db .cache/progress.db] [--replace]
+       python progress_transfer.py migrate old.ndjson new.ndjson
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+from functools import partial
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from progress_store import (DEFAULT_DB, LEARNER_ID, ProgressStore, InvalidDocument,
+                            assemble, flatten, migrate, validate)
+
+# Learners per chunk handed to a worker (and per import transaction)
+CHUNK_SIZE = 500
+
+# Chunks in flight per worker; bounds memory however large the input is
+CHUNKS_PER_WORKER = 2
+
+# Rejected lines printed to the terminal; --rejects keeps all of them
+MAX_REPORTED_ERRORS = 20
+
+def open_stream(path, mode):
+    """Binary stream for a path, gzip-compressed for .gz, stdin/stdout for -"""
+    if path == '-':
+        return os.fdopen(os.dup((sys.stdin if mode == 'rb' else sys.stdout).fileno()), mode)
+    if path.endswith('.gz'):
+        # Level 1 keeps compression far from being the bottleneck
+        return gzip.open(path, mode, compresslevel=1) if mode == 'wb' else gzip.open(path, mode)
+    return open(path, mode, buffering=1024 * 1024)
+
+def read_chunks(stream, size=CHUNK_SIZE):
+    """Non-empty lines as lists of (line number, bytes)"""
+    chunk = []
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            chunk.append((number, line))
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def run_pipeline(function, chunks, workers):
+    """function(chunk) for every chunk, in order, with a bounded number in flight"""
+    if workers <= 1:
+        yield from map(function, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+# One encoder for every value; json.dumps() with options builds a new one per call
+encode = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+def dump(entry):
+    return encode(entry).encode('utf-8') + b'\n'
+
+def parse_line(line):
+    """A migrated and validated entry from one NDJSON line"""
+    entry = json.loads(line)
+    if not isinstance(entry, dict):
+        raise InvalidDocument("line is not a JSON object")
+    learner = entry.get('learner')
+    if not isinstance(learner, str) or not LEARNER_ID.match(learner):
+        raise InvalidDocument(f"invalid learner id {learner!r}")
+    document = entry.get('progress')
+    if not isinstance(document, dict):
+        raise InvalidDocument("'progress' must be an object")
+    migrate(document)
+    validate(document)
+    return entry
+
+# Worker entry points; each returns its chunk's results plus (line, error, raw line) tuples
+
+def prepare_import(chunk, now):
+    """Serialized store records per learner"""
+    documents, errors = [], []
+    for number, line in chunk:
+        try:
+            entry = parse_line(line)
+            records = {key: encode(value) for key, value in flatten(entry['progress']).items()}
+        except (ValueError, TypeError, KeyError) as e:
+            errors.append((number, f"{type(e).__name__}: {e}", line))
+            continue
+        updated_at = entry.get('updatedAt')
+        ts = float(updated_at) if isinstance(updated_at, (int, float)) and not isinstance(updated_at, bool) else now
+        documents.append((entry['learner'], records, ts))
+    return documents, errors
+
+def migrate_chunk(chunk):
+    """Migrated lines, ready to write"""
+    output, errors = [], []
+    for number, line in chunk:
+        try:
+            output.append(dump(parse_line(line)))
+        except (ValueError, TypeError) as e:
+            errors.append((number, f"{type(e).__name__}: {e}", line))
+    return b''.join(output), errors
+
+def export_chunk(chunk):
+    """NDJSON lines for (learner, revision, records) tuples from the store"""
+    output, errors = [], []
+    for learner, revision, records in chunk:
+        try:
+            # One parse for all of a learner's records instead of one per record
+            values = json.loads(f"[{','.join(records.values())}]")
+            document = assemble(dict(zip(records, values)))
+            # Documents synced by older dashboards may predate the current schema
+            migrate(document)
+        except (ValueError, TypeError) as e:
+            errors.append((learner, f"{type(e).__name__}: {e}", b''))
+            continue
+        output.append(dump({'learner': learner, 'revision': revision, 'progress': document}))
+    return b''.join(output), errors
+
+def chunked(items, size=CHUNK_SIZE):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class Transfer:
+    """Counts, timing and rejected lines of one run"""
+
+    def __init__(self, rejects=None):
+        self.start = time.perf_counter()
+        self.learners = 0
+        self.records = 0
+        self.errors = 0
+        self.rejects = open_stream(rejects, 'wb') if rejects else None
+
+    def reject(self, errors):
+        for where, message, line in errors:
+            self.errors += 1
+            if self.errors <= MAX_REPORTED_ERRORS:
+                print(f"⚠️  {'line ' if isinstance(where, int) else ''}{where}: {message}", file=sys.stderr)
+            if self.rejects and line:
+                self.rejects.write(line if line.endswith(b'\n') else line + b'\n')
+
+    def finish(self, verb, size=None):
+        if self.rejects:
+            self.rejects.close()
+        elapsed = time.perf_counter() - self.start
+        rate = f", {self.learners / elapsed:,.0f} learners/s" if elapsed and self.learners else ''
+        volume = f", {size / 1e6 / elapsed:.1f} MB/s" if size and elapsed else ''
+        if self.errors > MAX_REPORTED_ERRORS:
+            print(f"⚠️  ... {self.errors - MAX_REPORTED_ERRORS} more rejected", file=sys.stderr)
+        print(f"{'✅' if not self.errors else '⚠️ '} {verb} {self.learners:,} learner(s)"
+              f"{f', {self.records:,} records' if self.records else ''} in {elapsed:.1f}s{rate}{volume}"
+              f"{f'; {self.errors} rejected' if self.errors else ''}", file=sys.stderr)
+        return 1 if self.errors else 0
+
+def stream_size(path):
+    try:
+        return os.path.getsize(path) if path != '-' else None
+    except OSError:
+        return None
+
+def run_import(args):
+    transfer = Transfer(args.rejects)
+    store = ProgressStore(args.db)
+    now = time.time()
+    try:
+        with open_stream(args.input, 'rb') as stream:
+            results = run_pipeline(partial(prepare_import, now=now), read_chunks(stream), args.workers)
+            for documents, errors in results:
+                transfer.reject(errors)
+                transfer.records += store.import_documents(documents, replace=args.replace)
+                transfer.learners += len(documents)
+    finally:
+        store.close()
+    return transfer.finish(f"Imported into {args.db}:", stream_size(args.input))
+
+def run_export(args):
+    if not os.path.exists(args.db):
+        print(f"❌ No progress database at {args.db}", file=sys.stderr)
+        return 1
+    transfer = Transfer()
+    store = ProgressStore(args.db)
+    try:
+        with open_stream(args.output, 'wb') as stream:
+            for data, errors in run_pipeline(export_chunk, chunked(store.iter_documents()), args.workers):
+                transfer.reject(errors)
+                stream.write(data)
+                transfer.learners += data.count(b'\n')
+    finally:
+        store.close()
+    return transfer.finish(f"Exported to {args.output}:", stream_size(args.output))
+
+def run_migrate(args):
+    transfer = Transfer(args.rejects)
+    with open_stream(args.input, 'rb') as source, open_stream(args.output, 'wb') as target:
+        for data, errors in run_pipeline(migrate_chunk, read_chunks(source), args.workers):
+            transfer.reject(errors)
+            target.write(data)
+            transfer.learners += data.count(b'\n')
+    return transfer.finish(f"Migrated to {args.output}:", stream_size(args.input))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Stream learner progress in and out of a progress store as NDJSON")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="write every learner of a store to NDJSON")
+    export.add_argument('output', help="NDJSON file to write (.gz to compress, - for stdout)")
+    export.add_argument('--db', default=DEFAULT_DB, help=f"progress database (default: {DEFAULT_DB})")
+
+    load = commands.add_parser('import', help="migrate, validate and write NDJSON learners into a store")
+    load.add_argument('input', help="NDJSON file to read (.gz is decompressed, - for stdin)")
+    load.add_argument('--db', default=DEFAULT_DB, help=f"progress database (default: {DEFAULT_DB})")
+    load.add_argument('--replace', action='store_true',
+                      help="replace each learner's data instead of keeping newer records")
+    load.add_argument('--rejects', metavar='FILE', help="write lines that failed validation to this file")
+
+    convert = commands.add_parser('migrate', help="upgrade NDJSON learners to the current schema")
+    convert.add_argument('input', help="NDJSON file to read (.gz is decompressed, - for stdin)")
+    convert.add_argument('output', help="NDJSON file to write (.gz to compress, - for stdout)")
+    convert.add_argument('--rejects', metavar='FILE', help="write lines that failed validation to this file")
+
+    for command in (export, load, convert):
+        command.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                             help="processes that parse and serialize documents (default: number of CPUs)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    handlers = {'export': run_export, 'import': run_import, 'migrate': run_migrate}
+    try:
+        sys.exit(handlers[args.command](args))
+    except (OSError, EOFError) as e:
+        print(f"❌ {type(e).__name__}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -108,7 +108,7 @@ echo "============================================"
 
 # Start web server in background
 print_info "Starting web dashboard on http://localhost:8000"
-python -m http.server 8000 &
+python serve.py 8000 --quiet &
 WEB_PID=$!
 
 # Wait a moment for server to start
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Dashboard Snapshot Renderer
+Pre-renders index.html for one learner so the dashboard paints immediately
+
+Takes a progress document (an `aiLearningData` export, or a learner in the
+progress store) and fills index.html with everything app.js would
+otherwise compute on load: stats, phase and module states, activities,
+goals, achievements, the study calendar and inline SVG versions of the
+charts. The document is embedded in the page; app.js then hydrates only
+the sections whose data changed since the snapshot was rendered, and
+loads Chart.js only when the charts have to be redrawn.
+
+Meant for kiosks and low-end Chromebooks. Put the snapshot next to
+index.html so the asset paths resolve.
+
+Usage: python render_snapshot.py PROGRESS.json [--output snapshot.html]
+       python render_snapshot.py --db .cache/progress.db --learner ID
+"""
+
+import re
+import sys
+import json
+import html
+import argparse
+import calendar
+from datetime import date, datetime
+
+from progress_store import DOCUMENT_VERSION, migrate, streaks
+from module_catalog import load_catalog
+
+DEFAULT_TEMPLATE = 'index.html'
+DEFAULT_OUTPUT = 'snapshot.html'
+
+# Module names, pages, phases and prerequisites; app.js reads the same
+# tables from assets/js/modules.js
+CATALOG = load_catalog()
+STATUS_LABELS = {
+    'not-started': 'Not Started',
+    'in-progress': 'In Progress',
+    'completed': 'Completed',
+    'locked': 'Locked'
+}
+ACTIVITY_ICONS = {
+    'system': 'info-circle',
+    'module-start': 'play',
+    'module-complete': 'check-circle',
+    'goal': 'target',
+    'goal-complete': 'trophy',
+    'achievement': 'star',
+    'quiz': 'question-circle'
+}
+
+# Sample series drawn by getWeeklyData() and getTimeSpentData() in app.js
+WEEKLY_HOURS = [2, 3, 1, 4, 2, 0, 1]
+WEEKLY_LABELS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+TIME_SPENT = [8, 12, 15, 10]
+TIME_LABELS = ['Week 1', 'Week 2', 'Week 3', 'Week 4']
+
+CHART_SCRIPT = re.compile(r'\s*<script src="([^"]*chart(?:\.[0-9a-f]{10})?(?:\.min)?\.js)"></script>', re.I)
+
+def js_round(value):
+    """Math.round for the non-negative values shown on the dashboard"""
+    return int(value + 0.5)
+
+def default_document(today):
+    """The same defaults as loadData() in app.js"""
+    return {
+        'schemaVersion': DOCUMENT_VERSION,
+        'modules': {
+            module['id']: {'status': 'locked' if module['prerequisites'] else 'not-started', 'progress': 0,
+                           'timeSpent': 0, 'startDate': None, 'completedDate': None}
+            for module in CATALOG
+        },
+        'goals': [{
+            'id': 'goal-1',
+            'title': 'Master AI Fundamentals',
+            'description': 'Complete the first phase of the curriculum',
+            'priority': 'high',
+            'deadline': '2025-09-15',
+            'completed': False,
+            'createdDate': '2025-08-14'
+        }],
+        'streak': 0,
+        'lastStudyDate': None,
+        'totalHours': 0,
+        'achievements': [],
+        'studyDays': {},
+        'reminders': {'enabled': True, 'time': '19:00',
+                      'days': ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']},
+        'activities': [{'id': 'activity-1', 'text': 'Welcome to your AI learning journey!',
+                        'date': f"{today.isoformat()}T00:00:00.000Z", 'type': 'system'}]
+    }
+
+def unlock_modules(modules):
+    """unlockModules() from app.js: open a module once all its prerequisites are complete"""
+    completed = {module for module, state in modules.items() if state['status'] == 'completed'}
+    for module in CATALOG.order:
+        if modules[module]['status'] == 'locked' and CATALOG.unlocked(module, completed):
+            modules[module]['status'] = 'not-started'
+
+def merge_defaults(defaults, saved):
+    """mergeDefaults() from app.js: saved values win, objects are merged key by key"""
+    merged = dict(defaults)
+    for key, value in saved.items():
+        if isinstance(value, dict) and isinstance(defaults.get(key), dict):
+            merged[key] = merge_defaults(defaults[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def prepare(document, today):
+    """Migrate, merge with the defaults and derive what app.js derives on load"""
+    migrate(document)
+    # Partial documents (e.g. from the progress store) may lack some modules
+    data = merge_defaults(default_document(today), document)
+    unlock_modules(data['modules'])
+    data['streak'] = streaks(data['studyDays'], today)[0]
+    return data
+
+# -- Editing the template -------------------------------------------------
+
+def element_span(page, attribute, start=0):
+    """(start, content start, content end, end) of the first element carrying attribute"""
+    match = re.compile(r'<(\w+)\b[^>]*\s' + re.escape(attribute) + r'(?=[\s>/])[^>]*>').search(page, start)
+    if not match:
+        raise ValueError(f"template has no element with {attribute}")
+    if match.group(0).endswith('/>'):
+        return match.start(), match.end(), match.end(), match.end()
+    name = match.group(1)
+    tags = re.compile(rf'<(/?){name}\b[^>]*>')
+    depth, position = 1, match.end()
+    while depth:
+        tag = tags.search(page, position)
+        if not tag:
+            raise ValueError(f"unclosed <{name}> with {attribute}")
+        depth += -1 if tag.group(1) else 1
+        position = tag.end()
+    return match.start(), match.end(), tag.start(), tag.end()
+
+def replace_inner(page, attribute, content, start=0):
+    begin, inner_start, inner_end, end = element_span(page, attribute, start)
+    return page[:inner_start] + content + page[inner_end:]
+
+def replace_opening_tag(page, attribute, transform, start=0):
+    begin, inner_start, _, _ = element_span(page, attribute, start)
+    return page[:begin] + transform(page[begin:inner_start]) + page[inner_start:]
+
+def set_attribute(tag, name, value):
+    if re.search(rf'\s{name}="[^"]*"', tag):
+        return re.sub(rf'(\s{name}=")[^"]*(")', lambda m: m.group(1) + value + m.group(2), tag, count=1)
+    return re.sub(r'\s*/?>$', lambda m: f' {name}="{value}"{m.group(0)}', tag, count=1)
+
+# -- Sections -------------------------------------------------------------
+
+def format_date(value, now):
+    """formatDate() from app.js, relative to the render time"""
+    try:
+        moment = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return html.escape(str(value))
+    if moment.tzinfo:
+        moment = moment.astimezone().replace(tzinfo=None)
+    days = int(abs((now - moment).total_seconds()) // 86400)
+    if days == 0:
+        return 'Today'
+    if days == 1:
+        return 'Yesterday'
+    if days < 7:
+        return f"{days} days ago"
+    return f"{moment.month}/{moment.day}/{moment.year}"
+
+def render_module_actions(module, status):
+    if status == 'locked':
+        return '<button class="btn btn-disabled" disabled>Complete Prerequisites</button>'
+    # Jupyter and Colab links only for modules with a notebook in the catalog
+    notebook = CATALOG[module].get('notebook') if module in CATALOG else None
+    links = f"""
+                        <a href="http://localhost:8888/notebooks/notebooks/{notebook}" class="btn btn-secondary" target="_blank" title="Open in Jupyter Lab">
+                            <i class="fas fa-rocket"></i> Jupyter
+                        </a>
+                        <a href="https://colab.research.google.com/github/murali-marimekala/AIExplorationHub/blob/main/notebooks/{notebook}" class="btn btn-tertiary" target="_blank" title="Open in Google Colab">
+                            <i class="fab fa-google"></i> Colab
+                        </a>""" if notebook else ''
+    return f"""
+                        <a href="notebooks/{CATALOG.page(module)}" class="btn btn-primary">Start Learning</a>{links}
+                    """
+
+def render_modules(page, modules):
+    for module, state in modules.items():
+        attribute = f'data-module="{module}"'
+        if attribute not in page:
+            continue
+        status = state['status']
+        begin = element_span(page, attribute)[0]
+        page = replace_opening_tag(page, attribute, lambda tag: set_attribute(tag, 'class', f"module-card {status}"))
+        page = replace_opening_tag(page, 'class="status', lambda tag: set_attribute(tag, 'class', f"status {status}"), begin)
+        page = replace_inner(page, 'class="status', STATUS_LABELS.get(status, status), begin)
+        page = replace_inner(page, 'class="module-actions"', render_module_actions(module, status), begin)
+    return page
+
+def render_progress(page, data):
+    modules = data['modules']
+    total = len(modules)
+    completed = sum(1 for m in modules.values() if m['status'] == 'completed')
+    percentage = js_round(completed / total * 100) if total else 0
+    hours = sum(m.get('timeSpent') or 0 for m in modules.values())
+    next_module = next((module for module in CATALOG.order
+                        if modules[module]['status'] in ('not-started', 'in-progress')), None)
+
+    for element_id, text in (('totalModules', total), ('completedModules', completed),
+                             ('progressPercentage', f"{percentage}%"), ('dashboardProgress', f"{percentage}%"),
+                             ('streakDays', data['streak']), ('totalHours', js_round(hours)),
+                             ('nextTopic', CATALOG.name(next_module) if next_module else 'All Complete!')):
+        page = replace_inner(page, f'id="{element_id}"', html.escape(str(text)))
+
+    circumference = 2 * 3.141592653589793 * 50
+    offset = circumference - percentage / 100 * circumference
+    page = replace_opening_tag(page, 'id="progressCircle"',
+                               lambda tag: set_attribute(tag, 'stroke-dashoffset', f"{offset:.2f}"))
+
+    for number, phase in enumerate(CATALOG.phases, 1):
+        done = sum(1 for module in phase if modules[module]['status'] == 'completed')
+        width = js_round(done / len(phase) * 100)
+        attribute = f'data-phase="{number}"'
+        page = replace_opening_tag(page, attribute, lambda tag: set_attribute(tag, 'style', f"width: {width}%"))
+        page = replace_inner(page, 'class="progress-text"', f"{done}/{len(phase)} modules", element_span(page, attribute)[3])
+    return page
+
+def escape(value):
+    return html.escape(str(value or ''))
+
+def render_activities(activities, now):
+    return ''.join(f"""
+                    <div class="activity-item">
+                        <i class="fas fa-{ACTIVITY_ICONS.get(activity.get('type'), 'circle')}"></i>
+                        <span>{escape(activity.get('text'))}</span>
+                        <time>{format_date(activity.get('date'), now)}</time>
+                    </div>
+                """ for activity in reversed(activities[-5:]))
+
+def render_goals(goals, now):
+    active = [goal for goal in goals if not goal.get('completed')]
+    if not active:
+        return """
+                    <div class="goal-item">
+                        <div class="goal-content">
+                            <p>No active goals. Add one using the form!</p>
+                        </div>
+                    </div>
+                """
+    return ''.join(f"""
+                    <div class="goal-item">
+                        <div class="goal-content">
+                            <h4>{escape(goal.get('title'))}</h4>
+                            <p>{escape(goal.get('description'))}</p>
+                            <div class="goal-meta">
+                                <span class="priority {escape(goal.get('priority'))}">{escape(goal.get('priority'))} Priority</span>
+                                <span class="deadline">Due: {format_date(goal.get('deadline'), now)}</span>
+                            </div>
+                        </div>
+                        <div class="goal-actions">
+                            <button class="btn-icon" onclick="aiHub.completeGoal('{escape(goal.get('id'))}')">
+                                <i class="fas fa-check"></i>
+                            </button>
+                            <button class="btn-icon" onclick="aiHub.deleteGoal('{escape(goal.get('id'))}')">
+                                <i class="fas fa-trash"></i>
+                            </button>
+                        </div>
+                    </div>
+                """ for goal in active)
+
+def render_achievements(page, data):
+    modules = data['modules'].values()
+    unlocked = [
+        any(m['status'] == 'completed' for m in modules),
+        data['streak'] >= 7,
+        sum(m.get('timeSpent') or 0 for m in modules) >= 100,
+        all(m['status'] == 'completed' for m in modules)
+    ]
+    position = element_span(page, 'id="achievementsList"')[1]
+    for earned in unlocked:
+        begin, _, _, end = element_span(page, 'class="achievement', position)
+        if earned:
+            page = replace_opening_tag(page, 'class="achievement', lambda tag: set_attribute(tag, 'class', 'achievement unlocked'), begin)
+            end = element_span(page, 'class="achievement', begin)[3]
+        position = end
+    return page
+
+def render_calendar(days, today):
+    """generateCalendar() from app.js for the current month"""
+    cells = ''.join(f'<div class="calendar-day-header">{day}</div>'
+                    for day in ('Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'))
+    first_weekday, length = calendar.monthrange(today.year, today.month)
+    cells += '<div class="calendar-day empty"></div>' * ((first_weekday + 1) % 7)
+    for day in range(1, length + 1):
+        current = date(today.year, today.month, day)
+        classes = 'calendar-day'
+        if current == today:
+            classes += ' today'
+        if days.get(current.isoformat()):
+            classes += ' has-study'
+        cells += f'<div class="{classes}">{day}</div>'
+    return f"""
+            <div class="calendar-header">
+                {calendar.month_name[today.month]} {today.year}
+            </div>
+            <div class="calendar-grid">
+        {cells}</div>"""
+
+# -- Charts ---------------------------------------------------------------
+
+WIDTH, HEIGHT, PAD = 300, 160, 24
+
+def chart_svg(chart_id, label, body):
+    return (f'<svg class="chart-snapshot" data-chart="{chart_id}" viewBox="0 0 {WIDTH} {HEIGHT}" '
+            f'role="img" aria-label="{label}" style="width: 100%; height: auto">{body}</svg>')
+
+def axis_labels(labels, xs):
+    return ''.join(f'<text x="{x:.1f}" y="{HEIGHT - 6}" font-size="10" text-anchor="middle" fill="#6b7280">{text}</text>'
+                   for text, x in zip(labels, xs))
+
+def line_chart(values, labels):
+    top = max(values) or 1
+    step = (WIDTH - 2 * PAD) / (len(values) - 1)
+    xs = [PAD + i * step for i in range(len(values))]
+    ys = [HEIGHT - PAD - v / top * (HEIGHT - 2 * PAD) for v in values]
+    points = ' '.join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    area = f"{xs[0]:.1f},{HEIGHT - PAD} {points} {xs[-1]:.1f},{HEIGHT - PAD}"
+    return (f'<polygon points="{area}" fill="rgba(79, 70, 229, 0.1)"/>'
+            f'<polyline points="{points}" fill="none" stroke="#4f46e5" stroke-width="2"/>'
+            + ''.join(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3" fill="#4f46e5"/>' for x, y in zip(xs, ys))
+            + axis_labels(labels, xs))
+
+def doughnut_chart(values, labels, colors):
+    radius, center = 45, (WIDTH / 2, 70)
+    circumference = 2 * 3.141592653589793 * radius
+    total = sum(values)
+    body, offset = '', 0
+    for value, color in zip(values, colors):
+        length = value / total * circumference if total else 0
+        body += (f'<circle cx="{center[0]}" cy="{center[1]}" r="{radius}" fill="none" stroke="{color}" '
+                 f'stroke-width="22" stroke-dasharray="{length:.2f} {circumference - length:.2f}" '
+                 f'stroke-dashoffset="{-offset:.2f}" transform="rotate(-90 {center[0]} {center[1]})"/>')
+        offset += length
+    legend_x = [WIDTH / 2 - 90, WIDTH / 2, WIDTH / 2 + 90]
+    for text, color, x in zip(labels, colors, legend_x):
+        body += (f'<rect x="{x - 36:.1f}" y="{HEIGHT - 16}" width="10" height="10" fill="{color}"/>'
+                 f'<text x="{x - 22:.1f}" y="{HEIGHT - 7}" font-size="10" fill="#6b7280">{text}</text>')
+    return body
+
+def bar_chart(values, labels):
+    top = max(values) or 1
+    slot = (WIDTH - 2 * PAD) / len(values)
+    xs = [PAD + slot * (i + 0.5) for i in range(len(values))]
+    body = ''
+    for x, value in zip(xs, values):
+        height = value / top * (HEIGHT - 2 * PAD)
+        body += (f'<rect x="{x - slot * 0.35:.1f}" y="{HEIGHT - PAD - height:.1f}" width="{slot * 0.7:.1f}" '
+                 f'height="{height:.1f}" fill="#06b6d4"/>')
+    return body + axis_labels(labels, xs)
+
+def render_charts(page, data):
+    statuses = [m['status'] for m in data['modules'].values()]
+    charts = {
+        'weeklyChart': chart_svg('weeklyChart', 'Study hours this week', line_chart(WEEKLY_HOURS, WEEKLY_LABELS)),
+        'moduleChart': chart_svg('moduleChart', 'Module completion', doughnut_chart(
+            [statuses.count('completed'), statuses.count('in-progress'), statuses.count('not-started')],
+            ['Completed', 'In Progress', 'Not Started'], ['#10b981', '#f59e0b', '#e5e7eb'])),
+        'timeChart': chart_svg('timeChart', 'Study time per week', bar_chart(TIME_SPENT, TIME_LABELS))
+    }
+    for chart_id, svg in charts.items():
+        begin = element_span(page, f'id="{chart_id}"')[0]
+        # The canvas stays for app.js, hidden until it has to redraw the chart
+        page = replace_opening_tag(page, f'id="{chart_id}"', lambda tag: set_attribute(tag, 'hidden', 'hidden'))
+        page = page[:begin] + svg + page[begin:]
+    return page
+
+# -- Snapshot -------------------------------------------------------------
+
+def render_snapshot(template, document, now=None):
+    """Return the pre-rendered page for a progress document"""
+    now = now or datetime.now()
+    today = now.date()
+    data = prepare(document, today)
+
+    page = render_progress(template, data)
+    page = render_modules(page, data['modules'])
+    page = replace_inner(page, 'id="activityList"', render_activities(data['activities'], now))
+    page = replace_inner(page, 'id="goalsList"', render_goals(data['goals'], now))
+    page = render_achievements(page, data)
+    page = replace_inner(page, 'id="studyCalendar"', render_calendar(data['studyDays'], today))
+    page = render_charts(page, data)
+
+    # Chart.js is only needed once the data no longer matches the snapshot
+    chart_script = CHART_SCRIPT.search(page)
+    if chart_script:
+        page = page[:chart_script.start()] + page[chart_script.end():]
+
+    snapshot = {
+        'day': today.isoformat(),
+        'chartScript': chart_script.group(1) if chart_script else None,
+        'progress': data
+    }
+    # "</" is escaped so the JSON cannot close the script element
+    payload = json.dumps(snapshot, separators=(',', ':')).replace('</', '<\\/')
+    script = f'<script type="application/json" id="snapshotData">{payload}</script>\n    '
+    first_script = page.index('<script src=')
+    return page[:first_script] + script + page[first_script:]
+
+def load_document(args):
+    if args.db:
+        from progress_store import ProgressStore
+        store = ProgressStore(args.db)
+        try:
+            if args.learner not in store.learners():
+                raise ValueError(f"no learner {args.learner!r} in {args.db}")
+            return store.document(args.learner)
+        finally:
+            store.close()
+    with open(args.progress, encoding='utf-8') as f:
+        document = json.load(f)
+    # Also accept the progress API's {revision, progress} response
+    if isinstance(document.get('progress'), dict) and 'modules' not in document:
+        document = document['progress']
+    return document
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pre-render the dashboard for one learner's progress")
+    parser.add_argument('progress', nargs='?',
+                        help="aiLearningData JSON export")
+    parser.add_argument('--db', metavar='FILE',
+                        help="read the learner from this progress store instead")
+    parser.add_argument('--learner',
+                        help="learner id in the progress store (with --db)")
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE,
+                        help=f"page to fill in (default: {DEFAULT_TEMPLATE})")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help=f"snapshot to write (default: {DEFAULT_OUTPUT})")
+    args = parser.parse_args()
+    if bool(args.progress) == bool(args.db) or (args.db and not args.learner):
+        parser.error("give either a progress file or --db together with --learner")
+    return args
+
+def main():
+    args = parse_args()
+    try:
+        document = load_document(args)
+        with open(args.template, encoding='utf-8') as f:
+            template = f.read()
+        page = render_snapshot(template, document)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(page)
+    print(f"✅ Snapshot written to {args.output} ({len(page.encode('utf-8')) // 1024} KB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Headless Notebook Runner
+Executes notebooks without a browser and reports how long each cell takes
+
+Every notebook runs in its own local kernel, and several notebooks run in
+parallel worker processes. For each code cell the runner records wall
+time and the kernel's peak memory, then writes a JSON (and optionally
+CSV) timing report so slow or memory-hungry cells show up before
+learners hit them.
+
+Usage: python run_notebooks.py [NOTEBOOK ...] [--report timing.json] [--csv timing.csv]
+With no notebooks given, every notebook under notebooks/ is run.
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import queue
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+NOTEBOOKS_DIR = 'notebooks'
+DEFAULT_REPORT = 'notebook_timing.json'
+
+# Seconds a single cell may run before the kernel is interrupted
+DEFAULT_CELL_TIMEOUT = 300
+KERNEL_STARTUP_TIMEOUT = 60
+
+# Defined silently in every kernel: peak resident memory of the kernel in MB
+PEAK_RSS_SETUP = """
+def __hub_peak_rss_mb():
+    try:
+        import resource, sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        try:
+            import psutil
+            info = psutil.Process().memory_info()
+            return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+        except ImportError:
+            return None
+"""
+PEAK_RSS_EXPRESSION = '__hub_peak_rss_mb()'
+
+def find_notebooks(paths):
+    """Expand the given paths (files or directories) to a sorted list of notebooks"""
+    notebooks = []
+    for path in paths or [NOTEBOOKS_DIR]:
+        path = Path(path)
+        if path.is_dir():
+            notebooks.extend(p for p in path.rglob('*.ipynb') if '.ipynb_checkpoints' not in p.parts)
+        else:
+            notebooks.append(path)
+    return sorted(set(notebooks))
+
+def run_cell(client, code, timeout):
+    """Execute one cell; returns (status, outputs, peak RSS in MB or None)"""
+    from nbformat.v4 import output_from_msg
+
+    msg_id = client.execute(code, store_history=True, allow_stdin=False,
+                            user_expressions={'peak_rss': PEAK_RSS_EXPRESSION})
+    outputs = []
+    deadline = time.monotonic() + timeout
+    status = 'ok'
+
+    # Collect outputs until the kernel goes idle for this request
+    while True:
+        try:
+            msg = client.get_iopub_msg(timeout=max(0.1, deadline - time.monotonic()))
+        except queue.Empty:
+            return 'timeout', outputs, None
+        if msg['parent_header'].get('msg_id') != msg_id:
+            continue
+        msg_type = msg['msg_type']
+        if msg_type == 'status' and msg['content']['execution_state'] == 'idle':
+            break
+        if msg_type == 'error':
+            status = 'error'
+        if msg_type in ('stream', 'display_data', 'execute_result', 'error'):
+            outputs.append(output_from_msg(msg))
+
+    # Skip replies to earlier requests, e.g. a cell interrupted after a timeout
+    while True:
+        try:
+            reply = client.get_shell_msg(timeout=max(1, deadline - time.monotonic()))
+        except queue.Empty:
+            return status, outputs, None
+        if reply['parent_header'].get('msg_id') == msg_id:
+            break
+
+    peak = reply['content'].get('user_expressions', {}).get('peak_rss', {})
+    try:
+        peak_rss = float(peak['data']['text/plain']) if peak.get('status') == 'ok' else None
+    except (KeyError, ValueError):
+        peak_rss = None
+    return status, outputs, peak_rss
+
+def run_notebook(path, cell_timeout=DEFAULT_CELL_TIMEOUT, allow_errors=False, save_dir=None):
+    """Execute a notebook in a fresh kernel and time every code cell"""
+    import nbformat
+    from jupyter_client.manager import start_new_kernel
+
+    path = Path(path)
+    nb = nbformat.read(path, as_version=4)
+    kernel_name = nb.metadata.get('kernelspec', {}).get('name', 'python3')
+    result = {'notebook': str(path), 'kernel': kernel_name, 'status': 'ok', 'cells': []}
+
+    start = time.perf_counter()
+    manager, client = start_new_kernel(kernel_name=kernel_name, cwd=str(path.parent.resolve()),
+                                       startup_timeout=KERNEL_STARTUP_TIMEOUT)
+    result['kernel_startup_s'] = round(time.perf_counter() - start, 4)
+
+    try:
+        client.execute(PEAK_RSS_SETUP, silent=True, store_history=False)
+        client.get_shell_msg(timeout=KERNEL_STARTUP_TIMEOUT)
+        previous_peak = None
+
+        for index, cell in enumerate(nb.cells):
+            if cell.cell_type != 'code' or not cell.source.strip():
+                continue
+
+            cell_start = time.perf_counter()
+            status, outputs, peak_rss = run_cell(client, cell.source, cell_timeout)
+            wall = time.perf_counter() - cell_start
+
+            cell.outputs = outputs
+            first_line = next((line for line in cell.source.splitlines() if line.strip()), '')
+            result['cells'].append({
+                'index': index,
+                'label': first_line.lstrip('# ').strip()[:80],
+                'status': status,
+                'wall_s': round(wall, 4),
+                'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+                'rss_growth_mb': (round(peak_rss - previous_peak, 1)
+                                  if peak_rss is not None and previous_peak is not None else None)
+            })
+            if peak_rss is not None:
+                previous_peak = peak_rss
+
+            if status == 'timeout':
+                manager.interrupt_kernel()
+            if status != 'ok':
+                result['status'] = status
+                if not allow_errors:
+                    break
+    finally:
+        client.stop_channels()
+        manager.shutdown_kernel(now=True)
+
+    result['total_s'] = round(time.perf_counter() - start, 4)
+
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+        nbformat.write(nb, os.path.join(save_dir, path.name))
+    return result
+
+def run_safely(args):
+    """Worker entry point: never let one notebook take down the whole run"""
+    path, cell_timeout, allow_errors, save_dir = args
+    try:
+        return run_notebook(path, cell_timeout, allow_errors, save_dir)
+    except Exception as e:
+        return {'notebook': str(path), 'status': 'failed', 'error': f"{type(e).__name__}: {e}", 'cells': []}
+
+def run_all(notebooks, workers=None, cell_timeout=DEFAULT_CELL_TIMEOUT, allow_errors=False, save_dir=None):
+    """Run notebooks in parallel worker processes, one kernel each"""
+    jobs = [(str(path), cell_timeout, allow_errors, save_dir) for path in notebooks]
+    if len(jobs) == 1:
+        return [run_safely(jobs[0])]
+    with ProcessPoolExecutor(max_workers=workers or min(len(jobs), os.cpu_count() or 1)) as executor:
+        return list(executor.map(run_safely, jobs))
+
+def write_csv(results, path):
+    fields = ['notebook', 'index', 'label', 'status', 'wall_s', 'peak_rss_mb', 'rss_growth_mb']
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for result in results:
+            for cell in result['cells']:
+                writer.writerow({'notebook': result['notebook'], **cell})
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Execute notebooks headlessly and time every cell")
+    parser.add_argument('notebooks', nargs='*',
+                        help=f"notebooks or directories to run (default: {NOTEBOOKS_DIR}/)")
+    parser.add_argument('--report', default=DEFAULT_REPORT,
+                        help=f"JSON timing report to write (default: {DEFAULT_REPORT})")
+    parser.add_argument('--csv', metavar='PATH',
+                        help="also write one CSV row per cell")
+    parser.add_argument('--workers', type=int,
+                        help="notebooks to run in parallel (default: number of CPUs)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_CELL_TIMEOUT,
+                        help=f"seconds each cell may run (default: {DEFAULT_CELL_TIMEOUT})")
+    parser.add_argument('--allow-errors', action='store_true',
+                        help="keep running the remaining cells after a failing cell")
+    parser.add_argument('--save-executed', metavar='DIR',
+                        help="write the executed notebooks, with outputs, into DIR")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    notebooks = find_notebooks(args.notebooks)
+    if not notebooks:
+        print("❌ No notebooks found")
+        sys.exit(1)
+
+    print(f"🧪 Running {len(notebooks)} notebook(s)...")
+    results = run_all(notebooks, workers=args.workers, cell_timeout=args.timeout,
+                      allow_errors=args.allow_errors, save_dir=args.save_executed)
+
+    for result in results:
+        icon = '✅' if result['status'] == 'ok' else '❌'
+        summary = f" in {result['total_s']:.1f}s (kernel {result['kernel_startup_s']:.1f}s)" if 'total_s' in result else ''
+        print(f"\n{icon} {result['notebook']}{summary}")
+        if 'error' in result:
+            print(f"   {result['error']}")
+        for cell in sorted(result['cells'], key=lambda c: c['wall_s'], reverse=True):
+            memory = f"{cell['peak_rss_mb']:.0f} MB" if cell['peak_rss_mb'] is not None else 'n/a'
+            print(f"   [{cell['index']:>3}] {cell['wall_s']:7.2f}s {memory:>8}  {cell['status']:<7} {cell['label']}")
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({'generated_at': time.time(), 'notebooks': results}, f, indent=2)
+    print(f"\n📄 Timing report: {args.report}")
+    if args.csv:
+        write_csv(results, args.csv)
+        print(f"📄 CSV report: {args.csv}")
+
+    if any(result['status'] != 'ok' for result in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Static File Server
+Serves the dashboard and module pages for a whole classroom at once
+
+Replaces `python -m http.server`, which handles one request at a time and
+sends no caching headers. This server runs on asyncio and supports:
+
+- concurrent HTTP/1.1 keep-alive connections
+- conditional GETs with ETag / If-None-Match and Last-Modified / If-Modified-Since
+- precompressed `.br` / `.gz` siblings chosen from Accept-Encoding
+- single byte-range requests (206 Partial Content)
+- zero-copy transfers with sendfile where the platform supports it
+
+With --progress-db it also serves the progress sync API from
+progress_store.py under /api/progress/, next to the dashboard.
+
+Usage: python serve.py [port] [--bind ADDRESS] [--directory DIR] [--progress-db FILE]
+"""
+
+import os
+import re
+import sys
+import stat
+import json
+import asyncio
+import argparse
+import traceback
+import mimetypes
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import unquote, urlsplit
+
+DEFAULT_PORT = 8000
+
+# Seconds an idle keep-alive connection is held open
+KEEP_ALIVE_TIMEOUT = 15
+
+# Largest request head (request line plus headers) accepted
+MAX_HEADER_BYTES = 16 * 1024
+
+# Files with a content hash in their name (e.g. app.3f2a9c1b7d.js)
+# never change, so browsers may cache them for a year
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}\.\w+$')
+
+# The only paths served: the dashboard, its assets, module pages and
+# notebooks, and the service worker files of a build. Everything else in
+# the repository (scripts, venvs, reports, databases) answers 404
+SITE_PATH = re.compile(r'^(?:|index\.html|sw\.js|precache-manifest\.json|assets/.+|'
+                       r'notebooks/[^/]+\.(?:html|ipynb))$')
+
+# Never served, even below assets/: SQLite databases and their journals
+PRIVATE_SUFFIXES = ('.db', '.db-wal', '.db-shm', '.db-journal')
+
+# Precompressed siblings in order of preference
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+STATUS_TEXT = {
+    200: 'OK',
+    206: 'Partial Content',
+    301: 'Moved Permanently',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    403: 'Forbidden',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    411: 'Length Required',
+    413: 'Content Too Large',
+    416: 'Range Not Satisfiable',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error'
+}
+
+mimetypes.add_type('application/javascript', '.js')
+mimetypes.add_type('application/manifest+json', '.webmanifest')
+mimetypes.add_type('font/woff2', '.woff2')
+
+class BadRequest(Exception):
+    """Raised for requests that cannot be parsed"""
+
+    def __init__(self, status=400):
+        super().__init__(STATUS_TEXT[status])
+        self.status = status
+
+def make_etag(st, suffix=''):
+    """Strong validator derived from file size and modification time
+
+    Each content encoding gets its own tag, so byte ranges and If-Range
+    never mix representations.
+    """
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}{suffix}"'
+
+def parse_range(header, size):
+    """Parse a single `bytes=` range into (start, end), both inclusive
+
+    Returns None if the header should be ignored (multiple or malformed
+    ranges) and raises BadRequest(416) if the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+
+    first, sep, last = spec.strip().partition('-')
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        elif last:
+            # Suffix range: the final N bytes
+            start = max(0, size - int(last))
+            end = size - 1
+        else:
+            return None
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise BadRequest(416)
+    return start, min(end, size - 1)
+
+def cache_control(path):
+    if HASHED_NAME.search(os.path.basename(path)):
+        return 'public, max-age=31536000, immutable'
+    # Revalidate on every use; a matching ETag makes that a cheap 304
+    return 'no-cache'
+
+class StaticFileServer:
+    """Serve files below a root directory over HTTP/1.1"""
+
+    def __init__(self, root, quiet=False, api=None):
+        self.root = os.path.realpath(root)
+        self.quiet = quiet
+        self.api = api
+
+    def log(self, peer, request_line, status, length):
+        if not self.quiet:
+            host = peer[0] if peer else '-'
+            print(f'{host} - "{request_line}" {status} {length}', file=sys.stderr)
+
+    async def read_request(self, reader):
+        """Read a request head, returning (method, target, version, headers)"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+        except asyncio.LimitOverrunError:
+            raise BadRequest(431)
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise BadRequest()
+            return None
+
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split()
+        if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+            raise BadRequest()
+        method, target, version = parts
+
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(':')
+            if not sep:
+                raise BadRequest()
+            headers[name.strip().lower()] = value.strip()
+        return method, target, version, headers
+
+    def resolve(self, target):
+        """Map a request target to a file path below the root
+
+        Returns None for paths outside the root and '' for paths that are
+        not part of the site (see SITE_PATH), dotfiles, anything in a
+        dot-directory and databases.
+        """
+        path = unquote(urlsplit(target).path)
+        if '\x00' in path:
+            return None
+        full = os.path.realpath(os.path.join(self.root, path.lstrip('/')))
+        if full != self.root and not full.startswith(self.root + os.sep):
+            return None
+        # Check the requested and the resolved path, so a symlink cannot expose them
+        for candidate in (path, os.path.relpath(full, self.root)):
+            names = [name for name in re.split(r'[\\/]', candidate) if name]
+            if any(name.startswith('.') and name not in ('.', '..') for name in names):
+                return ''
+            if names and names[-1].lower().endswith(PRIVATE_SUFFIXES):
+                return ''
+        # Only the resolved path is matched, as the request may contain '..'
+        if not SITE_PATH.match('/'.join(name for name in names if name != '.')):
+            return ''
+        return full
+
+    def choose_variant(self, path, st, accept_encoding):
+        """Pick a precompressed sibling that is at least as new as the original"""
+        accepted = {token.split(';')[0].strip() for token in accept_encoding.split(',')}
+        for encoding, extension in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                variant_st = os.stat(path + extension)
+            except OSError:
+                continue
+            if stat.S_ISREG(variant_st.st_mode) and variant_st.st_mtime_ns >= st.st_mtime_ns:
+                return path + extension, variant_st, encoding
+        return path, st, None
+
+    def not_modified(self, headers, etag, st):
+        if 'if-none-match' in headers:
+            candidates = [tag.strip() for tag in headers['if-none-match'].split(',')]
+            return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+        if 'if-modified-since' in headers:
+            try:
+                since = parsedate_to_datetime(headers['if-modified-since']).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(st.st_mtime) <= since
+        return False
+
+    async def send_simple(self, writer, status, keep_alive, extra=None, body=b'',
+                          content_type='text/plain; charset=utf-8'):
+        lines = [
+            f'HTTP/1.1 {status} {STATUS_TEXT[status]}',
+            f'Date: {formatdate(usegmt=True)}',
+            'Server: AILearningHub',
+            f'Content-Length: {len(body)}',
+            f'Connection: {"keep-alive" if keep_alive else "close"}'
+        ]
+        if body:
+            lines.append(f'Content-Type: {content_type}')
+        for name, value in (extra or {}).items():
+            lines.append(f'{name}: {value}')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+        return len(body)
+
+    async def serve_file(self, writer, method, target, headers, keep_alive):
+        """Answer a GET or HEAD request for a static file; returns (status, bytes sent)"""
+        path = self.resolve(target)
+        if path is None:
+            return 403, await self.send_simple(writer, 403, keep_alive, body=b'Forbidden\n')
+        if not path:
+            return 404, await self.send_simple(writer, 404, keep_alive, body=b'Not Found\n')
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            return 404, await self.send_simple(writer, 404, keep_alive, body=b'Not Found\n')
+
+        if stat.S_ISDIR(st.st_mode):
+            url = urlsplit(target)
+            if not url.path.endswith('/'):
+                location = url.path + '/' + (f'?{url.query}' if url.query else '')
+                return 301, await self.send_simple(writer, 301, keep_alive, {'Location': location})
+            path = os.path.join(path, 'index.html')
+            try:
+                st = os.stat(path)
+            except OSError:
+                return 404, await self.send_simple(writer, 404, keep_alive, body=b'Not Found\n')
+
+        if not stat.S_ISREG(st.st_mode):
+            return 404, await self.send_simple(writer, 404, keep_alive, body=b'Not Found\n')
+
+        content_type, _ = mimetypes.guess_type(path)
+        content_type = content_type or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+
+        # Ranges apply to the identity representation only
+        wants_range = 'range' in headers
+        if wants_range:
+            send_path, send_st, encoding = path, st, None
+        else:
+            send_path, send_st, encoding = self.choose_variant(path, st, headers.get('accept-encoding', ''))
+
+        etag = make_etag(st, f'-{encoding}' if encoding else '')
+        response_headers = {
+            'Content-Type': content_type,
+            'ETag': etag,
+            'Last-Modified': formatdate(st.st_mtime, usegmt=True),
+            'Cache-Control': cache_control(path),
+            'Accept-Ranges': 'bytes',
+            'Vary': 'Accept-Encoding'
+        }
+        if encoding:
+            response_headers['Content-Encoding'] = encoding
+
+        if self.not_modified(headers, etag, st):
+            return 304, await self.send_simple(writer, 304, keep_alive, response_headers)
+
+        size = send_st.st_size
+        status, start, length = 200, 0, size
+        if wants_range and headers.get('if-range', etag) == etag:
+            try:
+                byte_range = parse_range(headers['range'], size)
+            except BadRequest:
+                response_headers['Content-Range'] = f'bytes */{size}'
+                return 416, await self.send_simple(writer, 416, keep_alive, response_headers)
+            if byte_range:
+                start, end = byte_range
+                status, length = 206, end - start + 1
+                response_headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+        lines = [
+            f'HTTP/1.1 {status} {STATUS_TEXT[status]}',
+            f'Date: {formatdate(usegmt=True)}',
+            'Server: AILearningHub',
+            f'Content-Length: {length}',
+            f'Connection: {"keep-alive" if keep_alive else "close"}'
+        ]
+        lines.extend(f'{name}: {value}' for name, value in response_headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+        if method == 'GET' and length:
+            with open(send_path, 'rb') as f:
+                # Uses os.sendfile() when the transport allows it and
+                # falls back to buffered reads otherwise
+                await asyncio.get_running_loop().sendfile(writer.transport, f, start, length)
+        await writer.drain()
+        return status, length if method == 'GET' else 0
+
+    async def serve_api(self, reader, writer, method, path, headers, keep_alive):
+        """Answer an API request; returns (status, bytes sent, keep_alive)"""
+        if 'transfer-encoding' in headers:
+            # Bodies must come with a Content-Length; an unread chunked
+            # body would be parsed as the next request, so close instead
+            return 411, await self.send_simple(writer, 411, False), False
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > self.api.max_body_bytes:
+            # The body is left unread, so the connection cannot be reused
+            return 413, await self.send_simple(writer, 413, False), False
+        body = await reader.readexactly(length) if length else b''
+
+        status, payload = await self.api.handle(asyncio.get_running_loop(), method, path, body)
+        data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        sent = await self.send_simple(writer, status, keep_alive, {'Cache-Control': 'no-store'},
+                                      body=data, content_type='application/json')
+        return status, sent, keep_alive
+
+    async def dispatch(self, reader, writer, method, target, headers, keep_alive):
+        """Answer one request; returns (status, bytes sent, keep_alive)"""
+        if self.api and self.api.matches(urlsplit(target).path):
+            return await self.serve_api(reader, writer, method, urlsplit(target).path, headers, keep_alive)
+        if method not in ('GET', 'HEAD'):
+            return 405, await self.send_simple(writer, 405, False, {'Allow': 'GET, HEAD'}), False
+        if 'transfer-encoding' in headers or headers.get('content-length', '0').strip() != '0':
+            # Static files take no body; it is left unread, so the
+            # connection cannot be reused
+            keep_alive = False
+        status, length = await self.serve_file(writer, method, target, headers, keep_alive)
+        return status, length, keep_alive
+
+    async def handle_connection(self, reader, writer):
+        peer = writer.get_extra_info('peername')
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except BadRequest as e:
+                    await self.send_simple(writer, e.status, False)
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+
+                method, target, version, headers = request
+                connection = headers.get('connection', '').lower()
+                if version == 'HTTP/1.0':
+                    keep_alive = connection == 'keep-alive'
+                else:
+                    keep_alive = connection != 'close'
+
+                try:
+                    status, length, keep_alive = await self.dispatch(
+                        reader, writer, method, target, headers, keep_alive)
+                except ConnectionError:
+                    raise
+                except Exception:
+                    print(f'Error handling "{method} {target}":', file=sys.stderr)
+                    traceback.print_exc()
+                    keep_alive = False
+                    status = 500
+                    # Part of a response may already be out; closing ends it either way
+                    length = await self.send_simple(writer, 500, False, body=b'Internal Server Error\n')
+
+                self.log(peer, f'{method} {target} {version}', status, length)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+async def serve(root, host, port, quiet=False, progress_db=None):
+    api = None
+    if progress_db:
+        from progress_store import ProgressStore, ProgressAPI
+        api = ProgressAPI(ProgressStore(progress_db))
+        print(f"Progress sync API on /api/progress/ (database: {progress_db})")
+
+    handler = StaticFileServer(root, quiet=quiet, api=api)
+    server = await asyncio.start_server(handler.handle_connection, host, port,
+                                        limit=MAX_HEADER_BYTES, reuse_address=True)
+    address = host or '0.0.0.0'
+    print(f"Serving {handler.root} on http://{address}:{port}/ (Ctrl+C to stop)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if api:
+            api.store.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve the AI Learning Hub dashboard")
+    parser.add_argument('port', nargs='?', type=int, default=DEFAULT_PORT,
+                        help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('--bind', '-b', default='',
+                        help="address to bind to (default: all interfaces)")
+    parser.add_argument('--directory', '-d', default=os.path.dirname(os.path.abspath(__file__)),
+                        help="directory to serve (default: the repository root)")
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help="do not log requests")
+    parser.add_argument('--progress-db', metavar='FILE',
+                        help="serve the progress sync API, storing progress in this SQLite file")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    try:
+        asyncio.run(serve(args.directory, args.bind or None, args.port, quiet=args.quiet,
+                          progress_db=args.progress_db))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
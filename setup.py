@@ -5,10 +5,33 @@ Automatically sets up the environment and starts the platform
 
 import os
 import sys
+import socket
+import hashlib
+import argparse
 import subprocess
+import urllib.error
+import urllib.request
 import time
 import webbrowser
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from supervisor import Supervisor, ManagedProcess, STATUS_FILE
+
+VENV_DIR = 'ai_env'
+REQUIREMENTS = 'requirements.txt'
+
+# Written into a venv after a successful install; holds the requirements hash
+STAMP_FILE = '.requirements.sha256'
+
+WEB_PORT = 8000
+JUPYTER_PORT = 8888
+
+# Learner progress for the sync API; outside anything serve.py hands out
+PROGRESS_DB = os.path.join('.cache', 'progress.db')
+
+# Seconds each server may take to start answering requests
+STARTUP_TIMEOUT = 60
 
 def print_colored(message, color='white'):
     """Print colored messages"""
@@ -44,64 +67,233 @@ def check_python():
         print_error("Python not found. Please install Python 3.8+ and try again.")
         return False
 
-def create_venv():
+def create_venv(venv=VENV_DIR, quiet=False):
     """Create virtual environment"""
-    if not os.path.exists('ai_env'):
-        print_info("Creating Python virtual environment...")
-        subprocess.run([sys.executable, '-m', 'venv', 'ai_env'])
-        print_status("Virtual environment created")
-    else:
+    if not os.path.exists(venv):
+        if not quiet:
+            print_info("Creating Python virtual environment...")
+        subprocess.run([sys.executable, '-m', 'venv', venv])
+        if not quiet:
+            print_status("Virtual environment created")
+    elif not quiet:
         print_status("Virtual environment already exists")
 
-def get_venv_python():
+def get_venv_python(venv=VENV_DIR):
     """Get path to virtual environment Python"""
     if os.name == 'nt':  # Windows
-        return os.path.join('ai_env', 'Scripts', 'python.exe')
+        return os.path.join(venv, 'Scripts', 'python.exe')
     else:
-        return os.path.join('ai_env', 'bin', 'python')
+        return os.path.join(venv, 'bin', 'python')
 
-def install_packages():
-    """Install required packages"""
-    venv_python = get_venv_python()
-    
-    print_info("Upgrading pip...")
-    subprocess.run([venv_python, '-m', 'pip', 'install', '--upgrade', 'pip'])
-    
-    print_info("Installing required packages...")
-    result = subprocess.run([venv_python, '-m', 'pip', 'install', '-r', 'requirements.txt'])
-    
+def requirements_hash():
+    """Hash of requirements.txt, used to tell whether a venv is up to date"""
+    with open(REQUIREMENTS, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def is_up_to_date(venv=VENV_DIR):
+    """Check whether the venv was last provisioned from the current requirements"""
+    try:
+        with open(os.path.join(venv, STAMP_FILE), 'r') as f:
+            return f.read().strip() == requirements_hash()
+    except OSError:
+        return False
+
+def build_wheelhouse(wheelhouse):
+    """Build wheels for pip and every requirement into a local directory"""
+    print_info(f"Building wheelhouse in {wheelhouse}...")
+    result = subprocess.run([sys.executable, '-m', 'pip', 'wheel', '--wheel-dir', wheelhouse,
+                             'pip', '-r', REQUIREMENTS])
     if result.returncode == 0:
-        print_status("All packages installed successfully")
+        print_status(f"Wheelhouse ready: {wheelhouse}")
         return True
     else:
-        print_error("Package installation failed")
+        print_error("Building the wheelhouse failed")
         return False
 
-def start_servers():
-    """Start web server and Jupyter Lab"""
+def install_packages(venv=VENV_DIR, wheelhouse=None, force=False, quiet=False):
+    """Install required packages
+
+    Skipped when the venv's stamp file matches the hash of requirements.txt.
+    With a wheelhouse, pip installs only from that directory and never
+    touches the network.
+    """
+    venv_python = get_venv_python(venv)
+
+    if not force and is_up_to_date(venv):
+        if not quiet:
+            print_status("Packages are up to date (requirements.txt unchanged)")
+        return True
+
+    pip = [venv_python, '-m', 'pip', 'install']
+    if wheelhouse:
+        pip += ['--no-index', '--find-links', wheelhouse]
+    output = {'stdout': subprocess.DEVNULL} if quiet else {}
+
+    if not quiet:
+        print_info("Upgrading pip...")
+    subprocess.run(pip + ['--upgrade', 'pip'], **output)
+
+    if not quiet:
+        print_info("Installing required packages...")
+    result = subprocess.run(pip + ['-r', REQUIREMENTS], **output)
+
+    if result.returncode == 0:
+        with open(os.path.join(venv, STAMP_FILE), 'w') as f:
+            f.write(requirements_hash() + '\n')
+        if not quiet:
+            print_status("All packages installed successfully")
+        return True
+    else:
+        if not quiet:
+            print_error("Package installation failed")
+        return False
+
+def provision_venvs(venvs, wheelhouse=None, force=False, workers=None):
+    """Create and install many learner venvs in parallel from one wheel cache"""
+    def provision(venv):
+        start = time.time()
+        create_venv(venv, quiet=True)
+        ok = install_packages(venv, wheelhouse=wheelhouse, force=force, quiet=True)
+        return venv, ok, time.time() - start
+
+    print_info(f"Provisioning {len(venvs)} virtual environments...")
+    all_ok = True
+    with ThreadPoolExecutor(max_workers=workers or min(8, len(venvs))) as executor:
+        for venv, ok, elapsed in executor.map(provision, venvs):
+            if ok:
+                print_status(f"{venv} ready ({elapsed:.1f}s)")
+            else:
+                print_error(f"{venv} failed ({elapsed:.1f}s)")
+                all_ok = False
+    return all_ok
+
+def build_module_pages():
+    """Regenerate module pages whose catalog entry or template changed"""
+    try:
+        from create_module_placeholders import build
+        built, removed, _ = build()
+    except (OSError, ValueError) as e:
+        print_warning(f"Could not build module pages: {e}")
+        return
+    if built or removed:
+        print_status(f"Module pages updated ({len(built)} built, {len(removed)} removed)")
+
+def move_progress_db(old='progress.db', new=PROGRESS_DB):
+    """Move a progress database from the served repository root to PROGRESS_DB"""
+    if not os.path.exists(old) or os.path.exists(new):
+        return
+    os.makedirs(os.path.dirname(new), exist_ok=True)
+    # The -wal file may hold committed changes not yet in the main file
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(old + suffix):
+            os.replace(old + suffix, new + suffix)
+    print_status(f"Moved {old} to {new}")
+
+def port_in_use(port, host='127.0.0.1'):
+    """Check whether something is already listening on a port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.5)
+        return sock.connect_ex((host, port)) == 0
+
+def http_ready(url):
+    """Check whether an HTTP endpoint answers without a server error"""
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status < 500
+    except urllib.error.HTTPError as e:
+        return e.code < 500
+    except (urllib.error.URLError, OSError):
+        return False
+
+def wait_until_ready(name, process, url, timeout=STARTUP_TIMEOUT):
+    """Poll a freshly started server until it answers, with exponential backoff
+
+    Fails early if the process exits, e.g. because its port was taken.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} exited with code {process.returncode} during startup")
+        if http_ready(url):
+            return
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"{name} did not become ready within {timeout}s ({url})")
+        time.sleep(min(delay, max(0, deadline - time.monotonic())))
+        delay = min(delay * 2, 1.0)
+
+def server_commands(pool=False):
+    """Command lines for the web server and Jupyter Lab (or the per-learner pool)"""
     venv_python = get_venv_python()
-    
-    print_info("Starting web dashboard on http://localhost:8000")
-    web_process = subprocess.Popen([venv_python, '-m', 'http.server', '8000'])
-    
-    time.sleep(2)
-    
-    print_info("Starting Jupyter Lab on http://localhost:8888")
-    jupyter_process = subprocess.Popen([venv_python, '-m', 'jupyter', 'lab', 
-                                      '--no-browser', '--port=8888'])
-    
-    time.sleep(3)
-    
+    web_command = [venv_python, 'serve.py', str(WEB_PORT), '--quiet', '--progress-db', PROGRESS_DB]
+    if pool:
+        jupyter_command = [venv_python, 'jupyter_pool.py', '--port', str(JUPYTER_PORT)]
+    else:
+        # port_retries=0 makes Jupyter fail instead of silently moving to another port
+        jupyter_command = [venv_python, '-m', 'jupyter', 'lab', '--no-browser',
+                           f'--port={JUPYTER_PORT}', '--ServerApp.port_retries=0']
+    return web_command, jupyter_command
+
+def start_servers(pool=False):
+    """Start web server and Jupyter Lab and wait until both are ready"""
+    busy = [port for port in (WEB_PORT, JUPYTER_PORT) if port_in_use(port)]
+    if busy:
+        raise RuntimeError(f"port {', '.join(map(str, busy))} already in use "
+                           f"(check with: lsof -i :{busy[0]})")
+
+    web_command, jupyter_command = server_commands(pool)
+
+    # Both servers boot at the same time; readiness is polled afterwards
+    print_info(f"Starting web dashboard on http://localhost:{WEB_PORT}")
+    web_process = subprocess.Popen(web_command)
+    jupyter_process = None
+
+    # Any failure or Ctrl+C before both are ready stops what was started
+    try:
+        print_info(f"Starting Jupyter Lab on http://localhost:{JUPYTER_PORT}")
+        jupyter_process = subprocess.Popen(jupyter_command)
+
+        start = time.monotonic()
+        wait_until_ready("Web dashboard", web_process, f'http://127.0.0.1:{WEB_PORT}/')
+        print_status(f"Web dashboard ready ({time.monotonic() - start:.1f}s)")
+        jupyter_url = f'http://127.0.0.1:{JUPYTER_PORT}/' + ('status' if pool else 'api')
+        wait_until_ready("Jupyter Lab", jupyter_process, jupyter_url)
+        print_status(f"Jupyter Lab ready ({time.monotonic() - start:.1f}s)")
+    except BaseException:
+        for process in (web_process, jupyter_process):
+            if process:
+                process.terminate()
+        raise
+
     return web_process, jupyter_process
 
 def open_browsers():
     """Open web browsers"""
     print_info("Opening browsers...")
-    webbrowser.open('http://localhost:8000')
-    time.sleep(2)
-    webbrowser.open('http://localhost:8888')
+    webbrowser.open(f'http://localhost:{WEB_PORT}')
+    webbrowser.open(f'http://localhost:{JUPYTER_PORT}')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Set up and start the AI Learning Hub")
+    parser.add_argument('--wheelhouse', metavar='DIR',
+                        help="install packages only from this local wheel directory (no network)")
+    parser.add_argument('--build-wheelhouse', metavar='DIR',
+                        help="download and build wheels for requirements.txt into DIR, then exit")
+    parser.add_argument('--venvs', nargs='+', metavar='PATH',
+                        help="provision these virtual environments in parallel, then exit")
+    parser.add_argument('--workers', type=int,
+                        help="parallel installs for --venvs (default: up to 8)")
+    parser.add_argument('--force-install', action='store_true',
+                        help="reinstall packages even if requirements.txt is unchanged")
+    parser.add_argument('--pool', action='store_true',
+                        help="run one Jupyter Lab per learner behind a router on the Jupyter port")
+    parser.add_argument('--supervise', action='store_true',
+                        help=f"restart the servers with backoff if they crash (status in {STATUS_FILE})")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+
     print_colored("🧠 Welcome to AI Learning Hub!", 'blue')
     print("=" * 44)
     print("Setting up your AI learning environment...")
@@ -110,28 +302,39 @@ def main():
     # Check Python
     if not check_python():
         sys.exit(1)
+
+    if args.build_wheelhouse:
+        sys.exit(0 if build_wheelhouse(args.build_wheelhouse) else 1)
+
+    if args.venvs:
+        ok = provision_venvs(args.venvs, wheelhouse=args.wheelhouse,
+                             force=args.force_install, workers=args.workers)
+        sys.exit(0 if ok else 1)
     
     # Create virtual environment
     create_venv()
     
     # Install packages
-    if not install_packages():
+    if not install_packages(wheelhouse=args.wheelhouse, force=args.force_install):
         sys.exit(1)
     
+    build_module_pages()
+    move_progress_db()
+
     # Start platform
     print()
     print_colored("🚀 Starting AI Learning Hub...", 'blue')
     print("=" * 44)
     
     try:
-        web_process, jupyter_process = start_servers()
+        web_process, jupyter_process = start_servers(pool=args.pool)
         open_browsers()
         
         print()
         print_status("Setup complete! Your AI Learning Hub is now running.")
         print()
-        print("📊 Web Dashboard: http://localhost:8000")
-        print("📓 Jupyter Lab:   http://localhost:8888")
+        print(f"📊 Web Dashboard: http://localhost:{WEB_PORT}")
+        print(f"📓 Jupyter Lab:   http://localhost:{JUPYTER_PORT}")
         print()
         print("🎯 What's Next:")
         print("   1. Explore the dashboard to set learning goals")
@@ -139,17 +342,22 @@ def main():
         print("   3. Start learning and track your progress!")
         print()
         print_info("Platform is running. Press Ctrl+C to stop.")
-        
-        # Keep running until interrupted
-        try:
-            web_process.wait()
-        except KeyboardInterrupt:
-            print()
-            print_info("Shutting down AI Learning Hub...")
-            web_process.terminate()
-            jupyter_process.terminate()
-            print_status("Goodbye! Happy learning! 🎓")
-            
+        if args.supervise:
+            print_info(f"Supervising servers; status is written to {STATUS_FILE}")
+
+        # Watch both servers until Ctrl+C. Without --supervise, one server
+        # exiting shuts the other down too instead of leaving it orphaned
+        web_command, jupyter_command = server_commands(args.pool)
+        supervisor = Supervisor([
+            ManagedProcess('web', web_command, web_process),
+            ManagedProcess('jupyter', jupyter_command, jupyter_process)
+        ], restart=args.supervise, log=print_warning)
+        supervisor.run()
+
+        print()
+        print_info("AI Learning Hub stopped.")
+        print_status("Goodbye! Happy learning! 🎓")
+
     except Exception as e:
         print_error(f"Error starting platform: {e}")
         sys.exit(1)
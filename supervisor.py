@@ -0,0 +1,188 @@
+"""
+AI Learning Hub - Process Supervisor
+Keeps the web dashboard and Jupyter Lab running for a whole classroom
+
+Watches child processes, restarts them with exponential backoff when they
+exit, forwards signals to them, shuts them down gracefully with a kill
+deadline, and writes per-process uptime and restart counts to a JSON
+status file.
+"""
+
+import os
+import sys
+import json
+import time
+import shlex
+import signal
+import subprocess
+
+STATUS_FILE = '.hub_status.json'
+
+# Restart delays grow from MIN to MAX seconds; a child that stays up for
+# STABLE_AFTER seconds is considered healthy again and the delay resets
+MIN_BACKOFF = 1
+MAX_BACKOFF = 60
+STABLE_AFTER = 60
+
+# Seconds children get to exit after SIGTERM before they are killed
+KILL_DEADLINE = 10
+
+POLL_INTERVAL = 0.5
+
+# Signals passed on to every child instead of being handled here
+FORWARDED_SIGNALS = [name for name in ('SIGHUP', 'SIGUSR1', 'SIGUSR2') if hasattr(signal, name)]
+
+class ManagedProcess:
+    """A child process together with its restart bookkeeping"""
+
+    def __init__(self, name, argv, process=None):
+        self.name = name
+        self.argv = argv
+        self.process = process
+        self.started_at = time.time() if process else None
+        self.restarts = 0
+        self.backoff = MIN_BACKOFF
+        self.restart_at = None
+        self.last_exit_code = None
+
+    def start(self):
+        self.process = subprocess.Popen(self.argv)
+        self.started_at = time.time()
+        self.restart_at = None
+
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def status(self, now):
+        running = self.running()
+        return {
+            'pid': self.process.pid if running else None,
+            'state': 'running' if running else ('restarting' if self.restart_at else 'stopped'),
+            'uptime': round(now - self.started_at, 1) if running else 0,
+            'restarts': self.restarts,
+            'last_exit_code': self.last_exit_code
+        }
+
+class Supervisor:
+    """Run a set of ManagedProcess children until asked to stop
+
+    With restart=False the supervisor still watches the children, but as
+    soon as one of them exits it shuts the others down instead of leaving
+    them running on their own.
+    """
+
+    def __init__(self, children, restart=True, status_file=STATUS_FILE, log=print):
+        self.children = children
+        self.restart = restart
+        self.status_file = status_file
+        self.log = log
+        self.stopping = False
+
+    def install_signal_handlers(self):
+        def stop(signum, frame):
+            self.stopping = True
+
+        def forward(signum, frame):
+            for child in self.children:
+                if child.running():
+                    child.process.send_signal(signum)
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+        for name in FORWARDED_SIGNALS:
+            signal.signal(getattr(signal, name), forward)
+
+    def write_status(self):
+        now = time.time()
+        status = {
+            'supervisor_pid': os.getpid(),
+            'updated_at': now,
+            'processes': {child.name: child.status(now) for child in self.children}
+        }
+        tmp_path = f"{self.status_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(status, f, indent=2)
+        os.replace(tmp_path, self.status_file)
+
+    def check_children(self):
+        """Notice exited children and restart them once their backoff expires"""
+        now = time.time()
+        for child in self.children:
+            if child.running():
+                if child.backoff > MIN_BACKOFF and now - child.started_at >= STABLE_AFTER:
+                    child.backoff = MIN_BACKOFF
+                continue
+
+            if child.restart_at is None:
+                child.last_exit_code = child.process.returncode if child.process else None
+                if not self.restart:
+                    self.log(f"{child.name} exited with code {child.last_exit_code}, shutting down")
+                    self.stopping = True
+                    return
+                child.restart_at = now + child.backoff
+                self.log(f"{child.name} exited with code {child.last_exit_code}, "
+                         f"restarting in {child.backoff}s")
+                child.backoff = min(child.backoff * 2, MAX_BACKOFF)
+            elif now >= child.restart_at:
+                try:
+                    child.start()
+                except OSError as e:
+                    self.log(f"{child.name} failed to start: {e}")
+                    child.restart_at = now + child.backoff
+                    child.backoff = min(child.backoff * 2, MAX_BACKOFF)
+                    continue
+                child.restarts += 1
+                self.log(f"{child.name} restarted (pid {child.process.pid}, restart #{child.restarts})")
+
+    def shutdown(self):
+        """Terminate all children, killing any that outlive the deadline"""
+        for child in self.children:
+            child.restart_at = None
+            if child.running():
+                child.process.terminate()
+
+        deadline = time.monotonic() + KILL_DEADLINE
+        for child in self.children:
+            if child.process is None:
+                continue
+            try:
+                child.process.wait(timeout=max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                self.log(f"{child.name} did not stop within {KILL_DEADLINE}s, killing it")
+                child.process.kill()
+                child.process.wait()
+            child.last_exit_code = child.process.returncode
+
+    def run(self):
+        """Supervise until SIGINT/SIGTERM (or, without restarts, a child exits)"""
+        self.install_signal_handlers()
+        for child in self.children:
+            if child.process is None:
+                child.start()
+
+        try:
+            while not self.stopping:
+                self.check_children()
+                self.write_status()
+                time.sleep(POLL_INTERVAL)
+        finally:
+            self.shutdown()
+            self.write_status()
+
+USAGE = "Usage: python supervisor.py NAME='command args' [NAME='command args' ...]"
+
+def main():
+    """Supervise the commands given as NAME=COMMAND arguments"""
+    if sys.argv[1:] in (['-h'], ['--help']):
+        print(USAGE)
+        return
+    if len(sys.argv) < 2 or any('=' not in arg for arg in sys.argv[1:]):
+        print(USAGE)
+        sys.exit(2)
+
+    children = [ManagedProcess(name, shlex.split(command))
+                for name, command in (arg.split('=', 1) for arg in sys.argv[1:])]
+    Supervisor(children).run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# The hub's scripts live at the top of the repository, not in a package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from progress_store import ProgressStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProgressStore(str(tmp_path / 'progress.db'), flush_interval=0)
+    yield store
+    store.close()
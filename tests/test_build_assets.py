@@ -0,0 +1,58 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import ROOT
+from build_assets import minify_css, minify_js
+
+node = shutil.which('node')
+needs_node = pytest.mark.skipif(not node, reason="node is not installed")
+
+TRICKY_JS = r"""
+// Regex literals after keywords, division after identifiers
+function test(s) {
+    return /ab+c\/d[/]/.test(s);   // a comment
+}
+const ratio = 10 / 2 / 5;
+const kind = typeof /x/;
+switch (ratio) {
+    case /y/.source.length: break;
+}
+const holder = {return: 4};
+const half = holder.return / 2;
+/* Templates with nested expressions, strings and templates */
+const label = `outer ${ `inner ${ {k: '}'}.k } // kept` } "${'`'}" end`;
+const url = 'http://example.com'; // not a comment inside the string
+"""
+
+def check_syntax(tmp_path, code):
+    path = tmp_path / 'script.js'
+    path.write_text(code, encoding='utf-8')
+    result = subprocess.run([node, '--check', str(path)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+def test_minify_js_keeps_literals():
+    minified = minify_js(TRICKY_JS)
+    assert 'return /ab+c\\/d[/]/.test(s);' in minified
+    assert 'const ratio = 10 / 2 / 5;' in minified
+    assert 'typeof /x/' in minified
+    assert "`outer ${ `inner ${ {k: '}'}.k } // kept` } \"${'`'}\" end`" in minified
+    assert "'http://example.com';" in minified
+    assert 'a comment' not in minified
+    assert 'Templates with nested' not in minified
+
+@needs_node
+def test_minified_js_passes_node_check(tmp_path):
+    check_syntax(tmp_path, minify_js(TRICKY_JS))
+
+@needs_node
+@pytest.mark.parametrize('name', sorted(os.listdir(os.path.join(ROOT, 'assets', 'js'))))
+def test_minified_site_scripts_pass_node_check(tmp_path, name):
+    with open(os.path.join(ROOT, 'assets', 'js', name), encoding='utf-8') as f:
+        check_syntax(tmp_path, minify_js(f.read()))
+
+def test_minify_css():
+    css = "/* theme */\n.a , .b {\n    color: red;\n    content: ' ; ';\n}\n"
+    assert minify_css(css) == ".a,.b{color:red;content:' ; '}"
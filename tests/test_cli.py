@@ -0,0 +1,17 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from conftest import ROOT
+
+# Every script at the top of the repository is a command-line tool
+SCRIPTS = sorted(name for name in os.listdir(ROOT) if name.endswith('.py'))
+
+@pytest.mark.parametrize('script', SCRIPTS)
+def test_help(script):
+    result = subprocess.run([sys.executable, script, '--help'], cwd=ROOT,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert 'usage' in result.stdout.lower()
@@ -0,0 +1,47 @@
+import pytest
+
+from module_catalog import CatalogError, Catalog, check_modules, read_catalog, topological_order
+
+def modules(*prerequisites):
+    """Modules named a, b, c, ... in manifest order, with the given prerequisites"""
+    return [{'id': chr(ord('a') + index), 'title': f'Module {index}', 'icon': 'fas fa-book',
+             'page': f'{index}.html', 'phase': 1, 'prerequisites': list(required)}
+            for index, required in enumerate(prerequisites)]
+
+def test_order_keeps_manifest_order_where_possible():
+    assert topological_order(modules([], [], [])) == ['a', 'b', 'c']
+
+def test_order_puts_prerequisites_first():
+    # a needs c, b needs a: c must move ahead of both
+    assert topological_order(modules(['c'], ['a'], [])) == ['c', 'a', 'b']
+
+def test_order_ignores_duplicate_prerequisites():
+    assert topological_order(modules([], ['a', 'a'])) == ['a', 'b']
+
+def test_cycle_is_reported():
+    with pytest.raises(CatalogError, match='cycle among a, b'):
+        topological_order(modules(['b'], ['a'], []))
+
+def test_unknown_prerequisite_is_reported():
+    with pytest.raises(CatalogError, match='unknown z'):
+        check_modules(modules(['z']))
+
+def test_duplicate_id_is_reported():
+    entries = modules([], [])
+    entries[1]['id'] = 'a'
+    with pytest.raises(CatalogError, match='duplicate'):
+        check_modules(entries)
+
+def test_catalog_iterates_in_topological_order():
+    catalog = Catalog(check_modules(modules(['b'], [])))
+    assert [module['id'] for module in catalog] == ['b', 'a']
+    assert catalog.unlocked('a', {'b'})
+    assert not catalog.unlocked('a', set())
+
+def test_manifest_prerequisites_come_first():
+    catalog = read_catalog()
+    seen = set()
+    for module in catalog:
+        assert set(module['prerequisites']) <= seen
+        seen.add(module['id'])
+    assert len(seen) == len(catalog)
@@ -0,0 +1,135 @@
+import json
+import asyncio
+
+import pytest
+
+from progress_store import (DOCUMENT_VERSION, InvalidDocument, ProgressAPI,
+                            assemble, flatten, migrate, validate)
+
+def module(status='in-progress', progress=50):
+    return {'status': status, 'progress': progress, 'timeSpent': 1.5,
+            'startDate': None, 'completedDate': None}
+
+def submit(store, learner, key, value, ts):
+    return store.submit(learner, [{'key': key, 'value': value, 'ts': ts}]).result(timeout=5)
+
+def test_flatten_and_assemble_round_trip():
+    document = {
+        'schemaVersion': DOCUMENT_VERSION,
+        'modules': {'ai-fundamentals': module()},
+        'studyDays': {'2026-01-02': 3},
+        'goals': [{'id': 'goal-2', 'createdDate': '2026-01-02'},
+                  {'id': 'goal-1', 'createdDate': '2026-01-01'}],
+        'activities': [{'id': 'activity-1', 'date': '2026-01-01T10:00:00Z'}]
+    }
+    records = flatten(document)
+    assert records['modules/ai-fundamentals'] == module()
+    assert records['goals/goal-1'] == {'id': 'goal-1', 'createdDate': '2026-01-01'}
+
+    rebuilt = assemble(records)
+    assert rebuilt['modules'] == document['modules']
+    assert rebuilt['studyDays'] == document['studyDays']
+    # Goals come back in chronological order
+    assert [goal['id'] for goal in rebuilt['goals']] == ['goal-1', 'goal-2']
+
+def test_submit_bumps_revision_and_reports_changes(store):
+    first = submit(store, 'alice', 'modules/ai-fundamentals', module(), 1.0)
+    second = submit(store, 'alice', 'modules/mathematics', module(progress=10), 2.0)
+    assert (first, second) == (1, 2)
+    assert store.revision('alice') == 2
+    assert store.revision('bob') == 0
+
+    assert store.changes_since('alice', 1) == {'modules/mathematics': module(progress=10)}
+    assert set(store.changes_since('alice')) == {'modules/ai-fundamentals', 'modules/mathematics'}
+
+def test_older_write_does_not_overwrite_newer(store):
+    submit(store, 'alice', 'modules/ai-fundamentals', module(progress=80), 10.0)
+    submit(store, 'alice', 'modules/ai-fundamentals', module(progress=20), 5.0)
+    assert store.document('alice')['modules']['ai-fundamentals']['progress'] == 80
+
+    submit(store, 'alice', 'modules/ai-fundamentals', module(progress=90), 11.0)
+    assert store.document('alice')['modules']['ai-fundamentals']['progress'] == 90
+
+def test_queued_writes_to_one_record_coalesce(store):
+    future = store.submit('alice', [
+        {'key': 'modules/ai-fundamentals', 'value': module(progress=30), 'ts': 2.0},
+        {'key': 'modules/ai-fundamentals', 'value': module(progress=10), 'ts': 1.0}
+    ])
+    assert future.result(timeout=5) == 1
+    assert store.document('alice')['modules']['ai-fundamentals']['progress'] == 30
+
+def test_deletion_is_a_change_but_leaves_the_document(store):
+    submit(store, 'alice', 'goals/goal-1', {'id': 'goal-1'}, 1.0)
+    revision = submit(store, 'alice', 'goals/goal-1', None, 2.0)
+    assert store.changes_since('alice', revision - 1) == {'goals/goal-1': None}
+    assert store.document('alice')['goals'] == []
+
+def test_snapshot_matches_revision_and_document(store):
+    submit(store, 'alice', 'modules/ai-fundamentals', module(), 1.0)
+    revision, document = store.snapshot('alice')
+    assert revision == store.revision('alice') == 1
+    assert document == store.document('alice')
+    # The snapshot's transaction is over; writes still go through
+    assert submit(store, 'alice', 'modules/mathematics', module(), 2.0) == 2
+
+def test_import_keeps_newer_records_unless_replacing(store):
+    submit(store, 'alice', 'modules/ai-fundamentals', module(progress=80), 10.0)
+    submit(store, 'alice', 'goals/goal-1', {'id': 'goal-1'}, 10.0)
+
+    older = {'modules/ai-fundamentals': json.dumps(module(progress=20))}
+    store.import_documents([('alice', older, 5.0)])
+    document = store.document('alice')
+    assert document['modules']['ai-fundamentals']['progress'] == 80
+    assert document['goals'] == [{'id': 'goal-1'}]
+
+    store.import_documents([('alice', older, 5.0)], replace=True)
+    document = store.document('alice')
+    assert document['modules']['ai-fundamentals']['progress'] == 20
+    assert document['goals'] == []
+
+def test_migrate_upgrades_version_one_documents():
+    document = {
+        'modules': {'ai-fundamentals': {'status': 'completed', 'progress': 100}},
+        'activities': [
+            {'type': 'module_completed', 'date': '2026-01-01T10:00:00Z', 'id': 'activity-1'},
+            {'type': 'module_started', 'date': '2026-01-01T09:00:00Z', 'id': 'activity-1'},
+            {'type': 'goal_added', 'date': '2026-01-02T09:00:00Z'}
+        ]
+    }
+    assert migrate(document) == 1
+    assert document['schemaVersion'] == DOCUMENT_VERSION
+    assert document['studyDays'] == {'2026-01-01': 2}
+    assert document['modules']['ai-fundamentals']['timeSpent'] == 0
+    ids = [activity['id'] for activity in document['activities']]
+    assert len(set(ids)) == 3
+    validate(document)
+
+def test_migrate_rejects_documents_from_newer_tools():
+    with pytest.raises(InvalidDocument):
+        migrate({'schemaVersion': DOCUMENT_VERSION + 1})
+
+def test_validate_rejects_duplicate_ids():
+    document = {'schemaVersion': DOCUMENT_VERSION, 'goals': [{'id': 'a'}, {'id': 'a'}]}
+    with pytest.raises(InvalidDocument):
+        validate(document)
+
+def test_api_sync_and_get(store):
+    api = ProgressAPI(store)
+
+    async def exchange():
+        loop = asyncio.get_running_loop()
+        body = json.dumps({'since': 0, 'changes': [
+            {'key': 'modules/ai-fundamentals', 'value': module(), 'ts': 1.0}]}).encode()
+        synced = await api.handle(loop, 'POST', '/api/progress/alice/sync', body)
+        fetched = await api.handle(loop, 'GET', '/api/progress/alice', b'')
+        invalid = await api.handle(loop, 'GET', '/api/progress/not%20valid', b'')
+        malformed = await api.handle(loop, 'POST', '/api/progress/alice/sync', b'[]')
+        return synced, fetched, invalid, malformed
+
+    synced, fetched, invalid, malformed = asyncio.run(exchange())
+    assert synced == (200, {'revision': 1, 'changes': {'modules/ai-fundamentals': module()}})
+    assert fetched[0] == 200
+    assert fetched[1]['revision'] == 1
+    assert fetched[1]['progress']['modules'] == {'ai-fundamentals': module()}
+    assert invalid[0] == 400
+    assert malformed[0] == 400
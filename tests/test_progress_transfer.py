@@ -0,0 +1,86 @@
+import sys
+import gzip
+import json
+import subprocess
+
+from conftest import ROOT
+from progress_store import DOCUMENT_VERSION, ProgressStore
+
+LEARNERS = {
+    'alice': {
+        'schemaVersion': DOCUMENT_VERSION,
+        'modules': {'ai-fundamentals': {'status': 'completed', 'progress': 100, 'timeSpent': 2.5,
+                                        'startDate': '2026-01-01', 'completedDate': '2026-01-03'}},
+        'studyDays': {'2026-01-01': 1, '2026-01-03': 2},
+        'goals': [{'id': 'goal-1', 'text': 'Finish phase 1', 'createdDate': '2026-01-01'}],
+        'activities': [{'id': 'activity-1', 'type': 'module_completed', 'date': '2026-01-03T10:00:00Z'}]
+    },
+    'bob': {
+        'schemaVersion': DOCUMENT_VERSION,
+        'modules': {},
+        'studyDays': {},
+        'goals': [],
+        'activities': []
+    }
+}
+
+def transfer(*args, status=0):
+    result = subprocess.run([sys.executable, 'progress_transfer.py', *args, '--workers', '1'],
+                            cwd=ROOT, capture_output=True, text=True, timeout=120)
+    assert result.returncode == status, result.stdout + result.stderr
+    return result
+
+def write_ndjson(path, lines):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for line in lines:
+            f.write(line + '\n')
+
+def read_ndjson(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def documents(db):
+    store = ProgressStore(db)
+    try:
+        return {learner: store.document(learner) for learner in store.learners()}
+    finally:
+        store.close()
+
+def test_import_export_round_trip(tmp_path):
+    source = tmp_path / 'learners.ndjson.gz'
+    write_ndjson(source, [json.dumps({'learner': learner, 'progress': document})
+                          for learner, document in LEARNERS.items()])
+
+    first_db = str(tmp_path / 'first.db')
+    transfer('import', str(source), '--db', first_db)
+    assert documents(first_db) == LEARNERS
+
+    exported = tmp_path / 'exported.ndjson.gz'
+    transfer('export', str(exported), '--db', first_db)
+    entries = read_ndjson(exported)
+    assert [entry['learner'] for entry in entries] == ['alice', 'bob']
+    assert {entry['learner']: entry['progress'] for entry in entries} == LEARNERS
+
+    second_db = str(tmp_path / 'second.db')
+    transfer('import', str(exported), '--db', second_db)
+    assert documents(second_db) == LEARNERS
+
+def test_import_migrates_old_documents_and_rejects_bad_lines(tmp_path):
+    source = tmp_path / 'old.ndjson.gz'
+    old = {'modules': {'ai-fundamentals': {'status': 'in-progress', 'progress': 40}},
+           'activities': [{'id': 'activity-1', 'type': 'module_started', 'date': '2026-02-01T09:00:00Z'}]}
+    write_ndjson(source, [
+        json.dumps({'learner': 'carol', 'progress': old}),
+        'not json',
+        json.dumps({'learner': 'bad id!', 'progress': {}})
+    ])
+    rejects = tmp_path / 'rejects.ndjson'
+    db = str(tmp_path / 'progress.db')
+    # Rejected lines make the exit status 1
+    transfer('import', str(source), '--db', db, '--rejects', str(rejects), status=1)
+
+    document = documents(db)['carol']
+    assert document['schemaVersion'] == DOCUMENT_VERSION
+    assert document['studyDays'] == {'2026-02-01': 1}
+    assert document['modules']['ai-fundamentals']['timeSpent'] == 0
+    assert len(rejects.read_text().splitlines()) == 2
@@ -0,0 +1,135 @@
+import os
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import serve
+from serve import BadRequest, StaticFileServer, make_etag, parse_range
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-9', (0, 9)),
+    ('bytes=95-', (95, 99)),
+    ('bytes=-10', (90, 99)),
+    ('bytes=50-500', (50, 99)),
+    ('bytes=0-1,5-6', None),
+    ('items=0-9', None),
+    ('bytes=abc', None),
+    ('bytes=-', None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+@pytest.mark.parametrize('header', ['bytes=100-', 'bytes=20-10'])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(BadRequest) as e:
+        parse_range(header, 100)
+    assert e.value.status == 416
+
+def test_not_modified():
+    server = StaticFileServer('.')
+    st = SimpleNamespace(st_size=10, st_mtime=1_000_000.5, st_mtime_ns=1_000_000_500_000_000)
+    etag = make_etag(st)
+    assert server.not_modified({'if-none-match': etag}, etag, st)
+    assert server.not_modified({'if-none-match': f'"other", W/{etag}'}, etag, st)
+    assert server.not_modified({'if-none-match': '*'}, etag, st)
+    assert not server.not_modified({'if-none-match': '"other"'}, etag, st)
+    # If-None-Match wins over If-Modified-Since
+    assert not server.not_modified({'if-none-match': '"other"',
+                                    'if-modified-since': 'Fri, 01 Jan 2100 00:00:00 GMT'}, etag, st)
+    assert server.not_modified({'if-modified-since': 'Fri, 01 Jan 2100 00:00:00 GMT'}, etag, st)
+    assert not server.not_modified({'if-modified-since': 'Thu, 01 Jan 1970 00:00:00 GMT'}, etag, st)
+    assert not server.not_modified({'if-modified-since': 'yesterday'}, etag, st)
+
+def test_etag_differs_per_encoding():
+    st = SimpleNamespace(st_size=10, st_mtime_ns=1)
+    assert make_etag(st) != make_etag(st, '-gzip')
+
+def read_request(data):
+    async def read():
+        reader = asyncio.StreamReader(limit=serve.MAX_HEADER_BYTES)
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await StaticFileServer('.').read_request(reader)
+    return asyncio.run(read())
+
+def test_read_request():
+    method, target, version, headers = read_request(
+        b'GET /index.html?x=1 HTTP/1.1\r\nHost: localhost\r\nIf-None-Match:  "abc" \r\n\r\n')
+    assert (method, target, version) == ('GET', '/index.html?x=1', 'HTTP/1.1')
+    assert headers == {'host': 'localhost', 'if-none-match': '"abc"'}
+
+def test_read_request_at_end_of_stream():
+    assert read_request(b'') is None
+
+@pytest.mark.parametrize('data, status', [
+    (b'GET /\r\n\r\n', 400),
+    (b'GET / HTTP/1.1\r\nno colon\r\n\r\n', 400),
+    (b'GET / HTTP/1.1\r\nHost: x', 400),
+    (b'GET / HTTP/1.1\r\nX: ' + b'a' * (serve.MAX_HEADER_BYTES + 1), 431),
+])
+def test_read_request_rejects(data, status):
+    with pytest.raises(BadRequest) as e:
+        read_request(data)
+    assert e.value.status == status
+
+@pytest.fixture
+def site(tmp_path):
+    for path in ('index.html', 'assets/js/app.js', 'notebooks/page.html', 'notebooks/hub_quiz.py',
+                 'serve.py', 'assets/progress.db', 'assets/.secret'):
+        os.makedirs(tmp_path / os.path.dirname(path), exist_ok=True)
+        (tmp_path / path).write_text(f'contents of {path}\n' * 20)
+    return tmp_path
+
+@pytest.mark.parametrize('target', ['/', '/index.html', '/assets/js/app.js',
+                                    '/notebooks/page.html', '/notebooks/../index.html'])
+def test_resolve_site_paths(site, target):
+    assert StaticFileServer(str(site)).resolve(target)
+
+@pytest.mark.parametrize('target', ['/serve.py', '/notebooks/hub_quiz.py', '/assets/progress.db',
+                                    '/assets/.secret', '/notebooks/'])
+def test_resolve_hides_other_paths(site, target):
+    assert StaticFileServer(str(site)).resolve(target) == ''
+
+def test_resolve_refuses_paths_outside_the_root(site):
+    assert StaticFileServer(str(site)).resolve('/../etc/passwd') is None
+
+def exchange(root, request):
+    """Send raw requests to a live server and return everything it answered"""
+    async def run():
+        handler = StaticFileServer(str(root), quiet=True)
+        server = await asyncio.start_server(handler.handle_connection, '127.0.0.1', 0,
+                                            limit=serve.MAX_HEADER_BYTES)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(request)
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+    return asyncio.run(run())
+
+def split_response(data):
+    head, _, body = data.partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = dict(line.split(': ', 1) for line in lines[1:])
+    return int(lines[0].split()[1]), {k.lower(): v for k, v in headers.items()}, body
+
+def test_range_and_revalidation(site):
+    path = site / 'index.html'
+    etag = make_etag(os.stat(path))
+
+    status, headers, body = split_response(exchange(
+        site, b'GET /index.html HTTP/1.1\r\nRange: bytes=0-9\r\nConnection: close\r\n\r\n'))
+    assert status == 206
+    assert headers['content-range'] == f'bytes 0-9/{os.path.getsize(path)}'
+    assert headers['etag'] == etag
+    assert body == path.read_bytes()[:10]
+
+    request = f'GET /index.html HTTP/1.1\r\nIf-None-Match: {etag}\r\nConnection: close\r\n\r\n'
+    status, headers, body = split_response(exchange(site, request.encode()))
+    assert status == 304
+    assert body == b''
+
+    status, _, _ = split_response(exchange(site, b'GET /serve.py HTTP/1.1\r\nConnection: close\r\n\r\n'))
+    assert status == 404
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+AI Learning Hub - Fleet Validation
+Validates every learner environment on a host at once
+
+Finds every virtual environment (a directory with a pyvenv.cfg) under the
+given roots, e.g. learners/*/ai_env or workspaces/*/ai_env, and runs
+validate_setup.py --json with each venv's own interpreter, with PATH
+pointing at the venv so the Jupyter check sees the venv's jupyter. Runs
+happen in a bounded pool of workers, each with a timeout. Every venv
+keeps its own probe cache, so unchanged environments answer in
+milliseconds.
+
+The results are aggregated into one JSON report with per-environment
+timings, plus a short summary on the terminal.
+
+Usage: python validate_fleet.py [ROOT ...] [--workers N] [--report fleet_report.json] [--deep]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from setup import get_venv_python, is_up_to_date
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+VALIDATOR = os.path.join(ROOT, 'validate_setup.py')
+
+DEFAULT_ROOTS = ['workspaces', 'learners']
+DEFAULT_REPORT = 'fleet_report.json'
+
+# Probe cache written inside each venv (see validate_setup.py --cache)
+CACHE_NAME = '.hub-environment.json'
+
+# Seconds one environment may take to validate
+DEFAULT_TIMEOUT = 60
+
+# How deep below a root venvs are looked for
+MAX_DEPTH = 4
+
+# Directories never searched for venvs
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__', '.ipynb_checkpoints', '.cache'}
+
+def find_venvs(roots, max_depth=MAX_DEPTH):
+    """Every directory below the roots that contains a pyvenv.cfg, sorted"""
+    venvs = []
+    pending = [(os.path.abspath(root), 0) for root in roots if os.path.isdir(root)]
+    while pending:
+        path, depth = pending.pop()
+        if os.path.exists(os.path.join(path, 'pyvenv.cfg')):
+            venvs.append(path)
+            continue  # nothing to find inside a venv
+        if depth >= max_depth:
+            continue
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            continue
+        pending.extend((entry.path, depth + 1) for entry in entries
+                       if entry.is_dir(follow_symlinks=False) and entry.name not in SKIP_DIRS)
+    return sorted(set(venvs))
+
+def venv_environment(venv):
+    """Process environment as if the venv were activated"""
+    env = dict(os.environ)
+    env['VIRTUAL_ENV'] = venv
+    env['PATH'] = os.pathsep.join([os.path.dirname(get_venv_python(venv)), env.get('PATH', '')])
+    env.pop('PYTHONHOME', None)
+    return env
+
+def validate_venv(venv, timeout=DEFAULT_TIMEOUT, deep=False, refresh=False):
+    """Run validate_setup.py --json inside one venv; returns one report entry"""
+    python = get_venv_python(venv)
+    entry = {'venv': venv, 'workspace': os.path.dirname(venv), 'python': python,
+             'provisioned': is_up_to_date(venv)}
+    command = [python, VALIDATOR, '--json', '--cache', os.path.join(venv, CACHE_NAME)]
+    if deep:
+        command += ['--deep', '--timeout', str(timeout)]
+    if refresh:
+        command.append('--refresh')
+
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=timeout,
+                                cwd=entry['workspace'], env=venv_environment(venv))
+    except FileNotFoundError:
+        return {**entry, 'status': 'error', 'error': f"no interpreter at {python}",
+                'elapsed_s': round(time.perf_counter() - start, 3)}
+    except subprocess.TimeoutExpired:
+        return {**entry, 'status': 'error', 'error': f"timed out after {timeout}s",
+                'elapsed_s': round(time.perf_counter() - start, 3)}
+    entry['elapsed_s'] = round(time.perf_counter() - start, 3)
+
+    try:
+        report = json.loads(result.stdout)
+    except ValueError:
+        lines = (result.stderr or result.stdout).strip().splitlines()
+        return {**entry, 'status': 'error', 'error': lines[-1] if lines else f"exit status {result.returncode}"}
+
+    return {
+        **entry,
+        'status': 'ok' if report.get('ok') else 'failed',
+        'cached': report.get('cached'),
+        'missing_packages': report.get('missing_packages', []),
+        'jupyter': report.get('jupyter'),
+        'packages': {package: probe.get('version') for package, probe in report.get('packages', {}).items()
+                     if probe.get('found')},
+        'imports': report.get('imports'),
+        'fingerprint': report.get('fingerprint'),
+        'checked_at': report.get('checked_at')
+    }
+
+def validate_fleet(venvs, workers=None, timeout=DEFAULT_TIMEOUT, deep=False, refresh=False):
+    """Validate venvs in a bounded thread pool; results keep the order of venvs"""
+    workers = workers or min(32, 2 * (os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(venvs)))) as executor:
+        return list(executor.map(lambda venv: validate_venv(venv, timeout, deep, refresh), venvs))
+
+def summarize(results, elapsed):
+    statuses = [result['status'] for result in results]
+    timings = sorted(result['elapsed_s'] for result in results)
+    return {
+        'environments': len(results),
+        'ok': statuses.count('ok'),
+        'failed': statuses.count('failed'),
+        'errors': statuses.count('error'),
+        'cached': sum(1 for result in results if result.get('cached')),
+        'not_provisioned': sum(1 for result in results if not result['provisioned']),
+        'elapsed_s': round(elapsed, 3),
+        'slowest_s': timings[-1] if timings else None,
+        'median_s': timings[len(timings) // 2] if timings else None
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Validate every learner environment under one or more roots")
+    parser.add_argument('roots', nargs='*', default=DEFAULT_ROOTS,
+                        help=f"directories to search for venvs (default: {' '.join(DEFAULT_ROOTS)})")
+    parser.add_argument('--workers', type=int,
+                        help="environments validated at the same time (default: 2x CPUs, at most 32)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f"seconds each environment may take (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument('--deep', action='store_true',
+                        help="also import every package in each environment")
+    parser.add_argument('--refresh', action='store_true',
+                        help="ignore each environment's cached probe results")
+    parser.add_argument('--report', default=DEFAULT_REPORT,
+                        help=f"JSON report to write (default: {DEFAULT_REPORT})")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    venvs = find_venvs(args.roots)
+    if not venvs:
+        print(f"❌ No virtual environments found under {', '.join(args.roots)}")
+        sys.exit(1)
+
+    print(f"🔍 Validating {len(venvs)} environment(s)...")
+    start = time.perf_counter()
+    results = validate_fleet(venvs, workers=args.workers, timeout=args.timeout,
+                             deep=args.deep, refresh=args.refresh)
+    summary = summarize(results, time.perf_counter() - start)
+
+    for result in results:
+        if result['status'] == 'ok':
+            continue
+        venv = os.path.relpath(result['venv'])
+        if result['status'] == 'error':
+            print(f"❌ {venv}: {result['error']}")
+        else:
+            problems = [f"missing {', '.join(result['missing_packages'])}"] if result['missing_packages'] else []
+            if result['jupyter'] != 'ok':
+                problems.append(f"jupyter {result['jupyter']}")
+            print(f"❌ {venv}: {'; '.join(problems)}")
+    for result in results:
+        if result['status'] == 'ok' and not result['provisioned']:
+            print(f"⚠️  {os.path.relpath(result['venv'])}: not provisioned from the current requirements.txt")
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({'generated_at': time.time(), 'roots': args.roots, 'summary': summary,
+                   'environments': results}, f, indent=2)
+
+    print(f"\n{'✅' if summary['ok'] == summary['environments'] else '❌'} "
+          f"{summary['ok']}/{summary['environments']} environments OK "
+          f"({summary['failed']} failed, {summary['errors']} errors, {summary['cached']} from cache) "
+          f"in {summary['elapsed_s']:.1f}s")
+    print(f"📄 Report: {args.report}")
+    if summary['ok'] != summary['environments']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
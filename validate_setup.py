@@ -2,14 +2,59 @@
 """
 AI Learning Hub - Environment Validation Script
 Tests that all components are working correctly
+
+Package and Jupyter probes are cached in .cache/environment.json under a
+fingerprint of the environment: interpreter path, modification time of
+its site-packages and a hash of requirements.txt. As long as none of
+these change, the results come from the cache in milliseconds; any
+change triggers a full re-probe. A Jupyter probe that timed out is never
+cached, so a slow first start is retried on the next run.
+--json prints the fingerprint and results for fleet monitoring.
 """
 
 import sys
 import os
+import json
+import site
+import time
+import hashlib
+import argparse
+import platform
+import sysconfig
 import subprocess
 import importlib
+import importlib.util
+import importlib.metadata
+import multiprocessing
 from pathlib import Path
 
+REQUIRED_PACKAGES = [
+    'numpy', 'pandas', 'matplotlib', 'plotly',
+    'ipywidgets', 'jupyter', 'jupyterlab'
+]
+
+# Probed and cached along with the required packages; the notebook's
+# Environment Test cell also reports these
+EXTRA_PACKAGES = ['IPython']
+
+# Distribution names that differ from the importable module name
+DISTRIBUTION_NAMES = {
+    'jupyter': 'jupyter_core',
+    'IPython': 'ipython'
+}
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(ROOT, '.cache', 'environment.json')
+
+# Environments (e.g. the venv and a system Python) remembered in the cache
+MAX_CACHED_ENVIRONMENTS = 8
+
+# Seconds a single deep import may take before it is reported as hanging
+DEFAULT_IMPORT_TIMEOUT = 30
+
+# Seconds `jupyter --version` may take
+JUPYTER_TIMEOUT = 10
+
 def check_python_version():
     """Check if Python version is adequate"""
     version = sys.version_info
@@ -37,49 +82,223 @@ def check_virtual_env():
         print("❌ Virtual environment not found")
         return False
 
-def check_packages():
-    """Check if required packages are installed"""
-    required_packages = [
-        'numpy', 'pandas', 'matplotlib', 'plotly', 
-        'ipywidgets', 'jupyter', 'jupyterlab'
-    ]
-    
+def probe_package(package):
+    """Find a package and its version without importing it"""
+    if importlib.util.find_spec(package) is None:
+        return False, None
+
+    try:
+        version = importlib.metadata.version(DISTRIBUTION_NAMES.get(package, package))
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+    return True, version
+
+def import_package(package):
+    """Import a package for real (runs inside a worker process)"""
+    start = time.perf_counter()
+    try:
+        importlib.import_module(package)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return time.perf_counter() - start
+
+def deep_import_packages(packages, timeout=DEFAULT_IMPORT_TIMEOUT):
+    """Import packages in parallel worker processes with a per-package timeout
+
+    Returns a dict mapping each package to its import time in seconds, or to
+    an error string if the import failed or did not finish within the timeout.
+    """
+    results = {}
+    # One process per package so a hanging import only blocks itself
+    pool = multiprocessing.Pool(processes=len(packages), maxtasksperchild=1)
+    try:
+        pending = {package: pool.apply_async(import_package, (package,))
+                   for package in packages}
+        deadline = time.monotonic() + timeout
+        for package, result in pending.items():
+            try:
+                results[package] = result.get(max(0, deadline - time.monotonic()))
+            except multiprocessing.TimeoutError:
+                results[package] = f"timed out after {timeout}s"
+    finally:
+        # terminate() also kills workers stuck in a hanging import
+        pool.terminate()
+        pool.join()
+    return results
+
+def probe_packages(packages):
+    """{package: {'found', 'version'}} for each package, without importing them"""
+    return {package: dict(zip(('found', 'version'), probe_package(package))) for package in packages}
+
+def check_packages(deep=False, timeout=DEFAULT_IMPORT_TIMEOUT, probes=None):
+    """Check if required packages are installed
+
+    By default packages are only located on disk, which is fast because
+    nothing gets imported; `probes` can hand in cached results of that.
+    With deep=True every package found is also imported in a separate
+    process to catch broken or hanging imports.
+    """
+    probes = probes or probe_packages(REQUIRED_PACKAGES)
     missing_packages = []
-    
-    for package in required_packages:
-        try:
-            importlib.import_module(package)
-            print(f"✅ {package}")
-        except ImportError:
+    found_packages = {}
+
+    for package in REQUIRED_PACKAGES:
+        if probes[package]['found']:
+            found_packages[package] = probes[package]['version']
+        else:
+            missing_packages.append(package)
+
+    import_results = {}
+    if deep and found_packages:
+        import_results = deep_import_packages(list(found_packages), timeout)
+
+    for package in REQUIRED_PACKAGES:
+        if package in missing_packages:
             print(f"❌ {package}")
+            continue
+
+        version = found_packages[package]
+        label = f"{package} {version}" if version else package
+        result = import_results.get(package)
+        if isinstance(result, str):
+            print(f"❌ {label} ({result})")
             missing_packages.append(package)
-    
+        elif result is not None:
+            print(f"✅ {label} (imported in {result:.2f}s)")
+        else:
+            print(f"✅ {label}")
+
     return len(missing_packages) == 0, missing_packages
 
-def check_jupyter():
-    """Check if Jupyter Lab can be started"""
+def probe_jupyter():
+    """Run `jupyter --version` with this interpreter, as setup.py starts it
+
+    Returns 'ok', 'broken', 'missing' or 'timeout'.
+    """
+    if importlib.util.find_spec('jupyter_core') is None:
+        return 'missing'
     try:
-        result = subprocess.run(['jupyter', '--version'], 
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            print("✅ Jupyter is available")
-            return True
-        else:
-            print("❌ Jupyter not working properly")
-            return False
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+        result = subprocess.run([sys.executable, '-m', 'jupyter', '--version'],
+                              capture_output=True, text=True, timeout=JUPYTER_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return 'timeout'
+    except FileNotFoundError:
+        return 'missing'
+    return 'ok' if result.returncode == 0 else 'broken'
+
+def check_jupyter(status=None):
+    """Check if Jupyter Lab can be started"""
+    status = status or probe_jupyter()
+    if status == 'ok':
+        print("✅ Jupyter is available")
+        return True
+    elif status == 'broken':
+        print("❌ Jupyter not working properly")
+        return False
+    elif status == 'timeout':
+        print(f"❌ Jupyter did not answer within {JUPYTER_TIMEOUT}s")
+        return False
+    else:
         print("❌ Jupyter not found")
         return False
 
+def modification_time(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def file_digest(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+    except OSError:
+        return None
+
+def environment_fingerprint():
+    """Everything the cached probes depend on
+
+    Installing, upgrading or removing a package changes the mtime of the
+    site-packages directories, so they stand in for the installed set.
+    """
+    return {
+        'interpreter': os.path.realpath(sys.executable),
+        'python': platform.python_version(),
+        'prefix': sys.prefix,
+        'site_packages_mtime': modification_time(sysconfig.get_paths()['purelib']),
+        'user_site_mtime': modification_time(site.getusersitepackages()) if site.ENABLE_USER_SITE else None,
+        'requirements': file_digest(os.path.join(ROOT, 'requirements.txt'))
+    }
+
+def fingerprint_key(fingerprint):
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def load_cache(path=CACHE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def save_cache(cache, path=CACHE_PATH):
+    # Keep only the most recently checked environments
+    newest = sorted(cache.items(), key=lambda item: item[1].get('checked_at', 0), reverse=True)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(newest[:MAX_CACHED_ENVIRONMENTS]), f, indent=2)
+    os.replace(tmp_path, path)
+
+def probe_environment(refresh=False, cache_path=CACHE_PATH):
+    """Package and Jupyter probes for this environment, cached by fingerprint
+
+    Returns (report, cached). The report holds the fingerprint, the time
+    of the probe and its results; with refresh=True the cache is ignored.
+    """
+    fingerprint = environment_fingerprint()
+    key = fingerprint_key(fingerprint)
+    cache = load_cache(cache_path)
+    if not refresh and key in cache:
+        return cache[key], True
+
+    report = {
+        'key': key,
+        'fingerprint': fingerprint,
+        'checked_at': time.time(),
+        'packages': probe_packages(REQUIRED_PACKAGES + EXTRA_PACKAGES),
+        'jupyter': probe_jupyter()
+    }
+    # A timeout says more about the machine's load than the environment
+    if report['jupyter'] == 'timeout':
+        return report, False
+    cache[key] = report
+    try:
+        save_cache(cache, cache_path)
+    except OSError:
+        pass  # read-only checkout: validate without caching
+    return report, False
+
 def check_files():
     """Check if required files exist"""
     required_files = [
         'index.html',
         'requirements.txt',
-        'notebooks/01_AI_Fundamentals.ipynb',
+        'modules.json',
         'assets/css/style.css',
-        'assets/js/app.js'
+        'assets/js/app.js',
+        'assets/js/modules.js'
     ]
+    # Every module page and notebook listed in modules.json
+    catalog_error = None
+    try:
+        from module_catalog import load_catalog
+        for module in load_catalog():
+            required_files.append(f"notebooks/{module['page']}")
+            if module.get('notebook'):
+                required_files.append(f"notebooks/{module['notebook']}")
+    except (OSError, ValueError) as e:
+        catalog_error = f"modules.json: {e}"
     
     missing_files = []
     
@@ -89,12 +308,50 @@ def check_files():
         else:
             print(f"❌ {file_path}")
             missing_files.append(file_path)
+    if catalog_error:
+        print(f"❌ {catalog_error}")
+        missing_files.append('modules.json')
     
     return len(missing_files) == 0, missing_files
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Validate the AI Learning Hub environment")
+    parser.add_argument('--deep', action='store_true',
+                        help="import every package in a worker process to catch broken or hanging imports")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_IMPORT_TIMEOUT,
+                        help=f"seconds each deep import may take (default: {DEFAULT_IMPORT_TIMEOUT})")
+    parser.add_argument('--refresh', action='store_true',
+                        help="ignore cached results and probe the environment again")
+    parser.add_argument('--json', action='store_true',
+                        help="print the environment fingerprint and probe results as JSON")
+    parser.add_argument('--cache', default=CACHE_PATH, metavar='FILE',
+                        help="where probe results are cached (default: .cache/environment.json)")
+    return parser.parse_args()
+
+def print_json(report, cached, deep=False, timeout=DEFAULT_IMPORT_TIMEOUT):
+    """Machine-readable report for fleet monitoring; exit status 1 when something is missing"""
+    missing = [package for package in REQUIRED_PACKAGES if not report['packages'][package]['found']]
+    result = {**report, 'cached': cached}
+    if deep:
+        found = [package for package in REQUIRED_PACKAGES if package not in missing]
+        result['imports'] = deep_import_packages(found, timeout) if found else {}
+        # A package that is installed but fails to import counts as missing
+        missing += [package for package, outcome in result['imports'].items() if isinstance(outcome, str)]
+    ok = not missing and report['jupyter'] == 'ok'
+    print(json.dumps({**result, 'missing_packages': missing, 'ok': ok}, indent=2))
+    sys.exit(0 if ok else 1)
+
 def main():
+    args = parse_args()
+    report, cached = probe_environment(refresh=args.refresh, cache_path=args.cache)
+    if args.json:
+        print_json(report, cached, deep=args.deep, timeout=args.timeout)
+
     print("🧠 AI Learning Hub - Environment Validation")
     print("=" * 50)
+    if cached:
+        checked = time.strftime('%Y-%m-%d %H:%M', time.localtime(report['checked_at']))
+        print(f"⚡ Environment unchanged since {checked}; using cached results (--refresh to re-probe)")
     
     all_good = True
     
@@ -110,13 +367,14 @@ def main():
     
     # Check packages
     print("\n📍 Required Packages:")
-    packages_ok, missing_packages = check_packages()
+    packages_ok, missing_packages = check_packages(deep=args.deep, timeout=args.timeout,
+                                                   probes=report['packages'])
     if not packages_ok:
         all_good = False
     
     # Check Jupyter
     print("\n📍 Jupyter Lab:")
-    if not check_jupyter():
+    if not check_jupyter(report['jupyter']):
         all_good = False
     
     # Check files
@@ -130,7 +388,7 @@ def main():
     if all_good:
         print("🎉 All checks passed! Your environment is ready.")
         print("\n🚀 Next steps:")
-        print("1. Start web server: python -m http.server 8000")
+        print("1. Start web server: python serve.py 8000")
         print("2. Start Jupyter Lab: jupyter lab --no-browser --port=8888")
         print("3. Open http://localhost:8000 in your browser")
         print("4. Begin with the AI Fundamentals notebook!")